@@ -0,0 +1,197 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class AnalysisCache:
+    # SQLite'ın sorgu başına parametre sınırının altında kalan parti boyutu
+    BATCH_SIZE = 500
+
+    # last_used bu süreden (sn) eskiyse güncellenir; sıcak kayıtlar tekrar yazılmaz
+    TOUCH_INTERVAL = 3600
+
+    def __init__(self, db_path, max_entries=1000000):
+        """
+        Mesaj analiz sonuçları için disk üzerinde, boyutu sınırlı önbellek.
+        Anahtar; mesaj metni, ileri bakış komşuları ve sözlük sürümünün özetidir.
+        En uzun süredir kullanılmayan kayıtlar max_entries aşılınca silinir.
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key BLOB PRIMARY KEY,
+                    answered TEXT,
+                    sentiment TEXT,
+                    category TEXT,
+                    intent TEXT,
+                    last_used INTEGER
+                ) WITHOUT ROWID
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_analysis_cache_last_used ON analysis_cache (last_used)")
+
+        self._size = self.conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        if self._size > self.max_entries:
+            self.evict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+    def get_many(self, keys):
+        """Anahtarlar için önbellekteki (yanıtlanmış_mı, sentiment, kategori, intent) değerleri"""
+        keys = list(keys)
+        found = {}
+        stale = []
+        now = int(time.time())
+
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            batch = keys[start:start + self.BATCH_SIZE]
+            placeholders = ', '.join('?' for _ in batch)
+            rows = self.conn.execute(
+                f"SELECT key, answered, sentiment, category, intent, last_used FROM analysis_cache "
+                f"WHERE key IN ({placeholders})", batch).fetchall()
+
+            for key, answered, sentiment, category, intent, last_used in rows:
+                found[key] = (answered, sentiment, category, intent)
+                if now - last_used > self.TOUCH_INTERVAL:
+                    stale.append((now, key))
+
+        if stale:
+            # Kullanılan kayıtları LRU sırasında öne al
+            with self.conn:
+                self.conn.executemany("UPDATE analysis_cache SET last_used = ? WHERE key = ?", stale)
+
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    def put_many(self, items):
+        """(anahtar, (yanıtlanmış_mı, sentiment, kategori, intent)) çiftlerini kaydet"""
+        now = int(time.time())
+        rows = [(key, *labels, now) for key, labels in items]
+        if not rows:
+            return
+
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO analysis_cache "
+                "(key, answered, sentiment, category, intent, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+            self._size += self.conn.total_changes - before
+
+        if self._size > self.max_entries:
+            self.evict()
+
+    def evict(self):
+        """Boyut sınırına inene kadar en eski kayıtları sil (%10 pay bırakarak)"""
+        target = int(self.max_entries * 0.9)
+        excess = self._size - target
+        if excess <= 0:
+            return
+
+        with self.conn:
+            self.conn.execute("""
+                DELETE FROM analysis_cache WHERE key IN (
+                    SELECT key FROM analysis_cache ORDER BY last_used LIMIT ?
+                )
+            """, (excess,))
+        self._size = self.conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+
+    def hit_rate(self):
+        """Bu oturumdaki isabet oranı"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        self.conn.close()
+
+
+class LabelCache:
+    def __init__(self, max_entries=100000):
+        """
+        Ham mesaj metni -> (sentiment, kategori, intent, soru mu, yanıt sayılır mı) bellek içi
+        LRU önbelleği. Şablon yanıtlar ve kopyalanan sorular bir kez normalize edilip taranır. Tek bir kilitle korunur;
+        aynı analiz sistemini kullanan iş parçacıkları arasında paylaşılabilir.
+        Etiketler sözlüklere bağlıdır: önbellek yalnızca aynı ayarlı analiz sistemleriyle kullanılmalıdır.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries en az 1 olmalı")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Kilit seçilemez (pickle); süreçlere yalnızca sınır aktarılır, her süreç boş başlar
+        return {'max_entries': self.max_entries}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get_many(self, texts):
+        """Önbellekteki metinlerin kayıtları {metin: (sentiment, kategori, intent, soru, yanıt)}"""
+        found = {}
+        with self._lock:
+            entries = self._entries
+            for text in texts:
+                labels = entries.get(text)
+                if labels is None:
+                    self.misses += 1
+                    continue
+                entries.move_to_end(text)
+                found[text] = labels
+                self.hits += 1
+        return found
+
+    def put_many(self, items):
+        """(metin, kayıt) çiftlerini ekle; en eski kayıtlar atılır"""
+        with self._lock:
+            entries = self._entries
+            for text, labels in items:
+                entries[text] = tuple(labels)
+                entries.move_to_end(text)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def hit_rate(self):
+        """Mesaj başına isabet oranı"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Kayıt sayısı, sınır, isabet/kayıp sayıları ve isabet oranı"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hit_rate(), 4)
+            }
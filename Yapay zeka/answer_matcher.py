@@ -0,0 +1,222 @@
+from bisect import bisect_right, insort
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+
+def parse_timestamp(value):
+    """
+    ISO 8601 zaman damgasını saniyeye çevir; geçersizse None.
+    Saat dilimi olmayan değerler yerel saattir (analiz sistemi ve veri üreteci
+    `datetime.now().isoformat()` yazar).
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+    if parsed.tzinfo is None:
+        parsed = parsed.astimezone()
+    return parsed.timestamp()
+
+
+class TimeWindowAnswerMatcher:
+    def __init__(self, analyzer, window=3600.0):
+        """
+        Soruları, aynı konuşmada karşı taraftan gelen ilk yanıtla zaman penceresi içinde eşleştirir.
+        Mesajlar conversation_id ve tarafa göre gruplanır; her grup (zaman, sıra) anahtarına göre
+        sıralanır ve soru başına ilk aday `bisect` ile O(log n) sürede bulunur.
+        Taraf user_type alanıdır (müşteri/destek). user_type olmayan mesajlarda taraf gönderendir;
+        bu durumda aynı konuşmadaki başka bir müşterinin mesajı da yanıt sayılabilir.
+        window: sorudan sonra yanıt için beklenen en uzun süre (saniye)
+        """
+        self.analyzer = analyzer
+        self.window = window
+
+    def _prepare(self, message):
+        """Mesajı, kaynak sözlüğü (gönderen, zaman damgası) olan hazırlanmış mesaja çevir"""
+        prepared = self.analyzer.prepare_message(message)
+        if prepared.source is None:
+            prepared = self.analyzer.prepare_message({'message': prepared.message})
+        return prepared
+
+    def _side(self, prepared):
+        """
+        Mesajın tarafı: user_type (müşteri/destek), yoksa gönderen
+        user_type olmayan veride her gönderen ayrı taraftır: başka bir müşteri de karşı taraf
+        sayılır. Müşteri mesajlarının yanıt sayılmaması için user_type alanı gereklidir.
+        """
+        return prepared.user_type if prepared.user_type is not None else prepared.sender
+
+    def _is_answer_text(self, prepared):
+        """Yanıt içeriği koşulu (`is_answer_to` ile aynı: yanıt belirtisi veya uzun mesaj)"""
+        return prepared.flags[1]
+
+    def build_index(self, messages, times):
+        """
+        {conversation_id: {taraf: [(zaman, sıra), ...]}} dizinini oluştur
+        messages: hazırlanmış mesajlar; times: mesaj başına saniye (geçersizse None).
+        Yalnızca yanıt sayılabilecek, zaman damgası geçerli mesajlar dizine eklenir.
+        """
+        index = {}
+        for position, prepared in enumerate(messages):
+            timestamp = times[position]
+            if timestamp is None or not prepared.message.strip() or not self._is_answer_text(prepared):
+                continue
+
+            conversation_id = str(prepared.source.get('conversation_id', ''))
+            index.setdefault(conversation_id, {}).setdefault(self._side(prepared), []).append(
+                (timestamp, position))
+
+        # Dışa aktarımlar çoğunlukla zaten zaman sıralıdır; değilse grup bir kez sıralanır
+        for sides in index.values():
+            for candidates in sides.values():
+                if any(candidates[i] > candidates[i + 1] for i in range(len(candidates) - 1)):
+                    candidates.sort()
+        return index
+
+    def first_answer(self, index, messages, position, timestamp):
+        """Sorudan sonra pencere içindeki ilk karşı taraf yanıtının sırası (yoksa None)"""
+        question = messages[position]
+        sides = index.get(str(question.source.get('conversation_id', '')), {})
+        own_side = self._side(question)
+        limit = timestamp + self.window
+
+        best = None
+        for side, candidates in sides.items():
+            if side == own_side:
+                continue
+            found = bisect_right(candidates, (timestamp, position))
+            if found < len(candidates) and candidates[found][0] <= limit:
+                if best is None or candidates[found] < best:
+                    best = candidates[found]
+
+        return best[1] if best is not None else None
+
+    def answered_labels(self, messages):
+        """
+        Her mesaj için 'Evet'/'Hayır' yanıtlanma etiketi
+        Zaman damgası olmayan sorular ileri bakış kuralıyla (`is_question_answered`) değerlendirilir.
+        Hazırlanmış mesajların belirtileri (ör. etiket önbelleğinden gelen) yeniden hesaplanmaz;
+        boş mesajlar normalize edilmez.
+        """
+        messages = [self._prepare(message) for message in messages]
+        times = [parse_timestamp(message.source.get('timestamp')) for message in messages]
+        index = self.build_index(messages, times)
+
+        labels = []
+        for position, message in enumerate(messages):
+            if not message.message.strip() or not self.analyzer.is_question(message):
+                labels.append('Hayır')
+            elif times[position] is None:
+                labels.append(self.analyzer.is_question_answered(messages, position))
+            elif self.first_answer(index, messages, position, times[position]) is not None:
+                labels.append('Evet')
+            else:
+                labels.append('Hayır')
+        return labels
+
+    def stream_labels(self, messages):
+        """
+        Mesaj akışını geliş sırasıyla (sıra, hazırlanmış mesaj, yanıtlanma etiketi) olarak üret
+        Bir soru, akışta görülen en yeni zaman damgası soru zamanı + window'u geçtiğinde (ya da
+        akış bittiğinde) etiketlenir; akışın zaman sıralı olduğu varsayılır, pencere dolduktan
+        sonra gelen geç mesajlar yanıt sayılmaz. Tamponda yalnızca son window saniyenin
+        mesajları ve yanıt adayları tutulur; adaylar `build_index` gibi konuşma ve tarafa göre
+        (zaman, sıra) sıralı tutulur ve soru başına `bisect` ile aranır. Zaman sıralı akışta
+        etiketler `answered_labels` ile aynıdır; zaman damgası olmayan sorular sonraki
+        answer_lookahead mesaja bakılarak etiketlenir.
+        """
+        analyzer = self.analyzer
+        lookahead = analyzer.answer_lookahead
+        # (sıra, hazırlanmış mesaj, zaman, soru mu)
+        buffer = deque()
+        # conversation_id -> {taraf: [sıralı (zaman, sıra) listesi, ilk geçerli eleman]}
+        candidates = {}
+        # Adayların geliş sırası (zaman, conversation_id, taraf); eski adaylar bu sırayla atılır
+        arrivals = deque()
+        latest = None
+        position = 0
+
+        def label(entry):
+            entry_position, prepared, timestamp, question = entry
+            if not question:
+                return 'Hayır'
+            if timestamp is None:
+                context = [item[1] for item in islice(buffer, lookahead + 1)]
+                return analyzer.is_question_answered(context, 0)
+
+            own_side = self._side(prepared)
+            limit = timestamp + self.window
+            sides = candidates.get(str(prepared.source.get('conversation_id', '')), {})
+            for side, (items, head) in sides.items():
+                if side == own_side:
+                    continue
+                found = bisect_right(items, (timestamp, entry_position), head)
+                if found < len(items) and items[found][0] <= limit:
+                    return 'Evet'
+            return 'Hayır'
+
+        def settled(entry):
+            if not entry[3]:
+                return True
+            if entry[2] is None:
+                return len(buffer) > lookahead
+            return latest > entry[2] + self.window
+
+        for message in messages:
+            prepared = self._prepare(message)
+            timestamp = parse_timestamp(prepared.source.get('timestamp'))
+            if timestamp is not None:
+                latest = timestamp if latest is None else max(latest, timestamp)
+                if prepared.message.strip() and self._is_answer_text(prepared):
+                    conversation_id = str(prepared.source.get('conversation_id', ''))
+                    side = self._side(prepared)
+                    items = candidates.setdefault(conversation_id, {}).setdefault(side, [[], 0])[0]
+                    # Zaman sıralı akışta ekleme sondadır
+                    insort(items, (timestamp, position))
+                    arrivals.append((timestamp, conversation_id, side))
+
+            buffer.append((position, prepared, timestamp, analyzer.is_question(prepared)))
+            position += 1
+
+            while buffer and settled(buffer[0]):
+                entry = buffer[0]
+                answered = label(entry)
+                buffer.popleft()
+                yield entry[0], entry[1], answered
+
+            # Bekleyen soruların zamanı en az latest - window'dur; daha eski adaylar gereksizdir
+            if latest is not None:
+                oldest = latest - self.window
+                while arrivals and arrivals[0][0] < oldest:
+                    _, conversation_id, side = arrivals.popleft()
+                    sides = candidates.get(conversation_id, {})
+                    group = sides.get(side)
+                    if group is None:
+                        # Sırasız akışta grup daha önce boşalmış olabilir
+                        continue
+                    items, head = group
+                    while head < len(items) and items[head][0] < oldest:
+                        head += 1
+                    if head == len(items):
+                        del sides[side]
+                        if not sides:
+                            del candidates[conversation_id]
+                        continue
+                    # Atılan baş kısım listenin yarısını geçince liste kısaltılır
+                    if head * 2 > len(items):
+                        del items[:head]
+                        head = 0
+                    group[1] = head
+
+        while buffer:
+            entry = buffer[0]
+            answered = label(entry)
+            buffer.popleft()
+            yield entry[0], entry[1], answered
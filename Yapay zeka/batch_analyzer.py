@@ -0,0 +1,209 @@
+import argparse
+import glob
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from analysis_cache import AnalysisCache
+from chat_analyzer import DugumBuketiChatAnalyzer
+from stream_reader import iter_messages
+
+# Her işçi sürecinde bir kez oluşturulan analiz sistemi ve sonuç önbelleği
+_worker_analyzer = None
+_worker_cache = None
+
+
+def _init_worker(cache_path=None, label_cache_size=None):
+    """
+    İşçi süreç başlatıcısı: sözlükler görev başına değil süreç başına bir kez derlenir
+    label_cache_size verilirse her işçinin kendi metin -> etiket LRU önbelleği olur.
+    """
+    global _worker_analyzer, _worker_cache
+    _worker_analyzer = DugumBuketiChatAnalyzer(label_cache=label_cache_size)
+
+    if _worker_cache is not None:
+        _worker_cache.close()
+    _worker_cache = AnalysisCache(cache_path) if cache_path else None
+
+
+def _get_analyzer():
+    """Sürecin analiz sistemini döndür (gerekirse oluştur)"""
+    if _worker_analyzer is None:
+        _init_worker()
+    return _worker_analyzer
+
+
+def split_conversations(data, default_id='unknown'):
+    """
+    Yüklenmiş JSON verisini (conversation_id, messages) çiftlerine ayır.
+
+    Desteklenen biçimler:
+    - {"conversation_id": ..., "messages": [...]}       (tek konuşma; mesajlarda conversation_id
+                                                         varsa mesaj alanına göre gruplanır)
+    - [{"conversation_id": ..., "messages": [...]}, ...] (konuşma listesi)
+    - {"<conversation_id>": {"messages": [...]} | [...]} (conversation_id anahtarlı)
+    - [{"conversation_id": ..., "message": ...}, ...]    (conversation_id alanlı düz mesajlar)
+    """
+    if isinstance(data, dict) and 'messages' in data:
+        conversation_id = str(data.get('conversation_id', default_id))
+        messages = data['messages']
+        # Mesajlar kendi conversation_id alanını taşıyorsa (ör. write_synthetic_data .json çıktısı)
+        # belge birden çok konuşma içerir; mesaj alanına göre gruplanır
+        if any(isinstance(message, dict) and 'conversation_id' in message for message in messages):
+            yield from group_messages(messages, conversation_id)
+        else:
+            yield conversation_id, messages
+        return
+
+    if isinstance(data, dict) and 'message' in data:
+        yield str(data.get('conversation_id', default_id)), [data]
+        return
+
+    if isinstance(data, dict):
+        for conversation_id, conversation in data.items():
+            if isinstance(conversation, dict):
+                conversation = conversation.get('messages', [conversation])
+            yield str(conversation_id), conversation
+        return
+
+    if isinstance(data, list) and data and all(
+            isinstance(item, dict) and 'messages' in item for item in data):
+        for index, conversation in enumerate(data):
+            conversation_id = conversation.get('conversation_id', f"{default_id}_{index}")
+            yield str(conversation_id), conversation['messages']
+        return
+
+    # Düz mesaj listesi: conversation_id alanına göre, ilk görülme sırasıyla grupla
+    yield from group_messages(data, default_id)
+
+
+def group_messages(messages, default_id='unknown'):
+    """Mesajları conversation_id alanına göre ilk görülme sırasını koruyarak grupla"""
+    groups = {}
+    for message in messages:
+        conversation_id = str(message.get('conversation_id', default_id))
+        groups.setdefault(conversation_id, []).append(message)
+    return list(groups.items())
+
+
+def load_conversations(path):
+    """Bir JSON veya NDJSON dosyasındaki konuşmaları yükle"""
+    default_id = os.path.splitext(os.path.basename(path))[0]
+
+    if path.endswith(('.ndjson', '.jsonl')):
+        return group_messages(iter_messages(path), default_id)
+
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        data = json.load(file)
+    return list(split_conversations(data, default_id))
+
+
+def resolve_files(source):
+    """Dizin, glob deseni veya tek dosya yolundan sıralı dosya listesi üret"""
+    if os.path.isdir(source):
+        patterns = [os.path.join(source, '*.json'), os.path.join(source, '*.ndjson'),
+                    os.path.join(source, '*.jsonl')]
+        files = [path for pattern in patterns for path in glob.glob(pattern)]
+    elif os.path.isfile(source):
+        files = [source]
+    else:
+        files = glob.glob(source)
+
+    return sorted(files)
+
+
+def _analyze_rows(conversation_id, messages):
+    """Tek konuşmayı conversation_id ile analiz et"""
+    analyzer = _get_analyzer()
+    return analyzer.analyze_conversation(messages, cache=_worker_cache,
+                                         conversation_id=conversation_id)
+
+
+def _analyze_file_task(path):
+    """İşçi görevi: dosyayı işçide yükleyip içindeki tüm konuşmaları analiz et"""
+    rows = []
+    for conversation_id, messages in load_conversations(path):
+        rows.extend(_analyze_rows(conversation_id, messages))
+    return rows
+
+
+def _analyze_conversation_task(task):
+    """İşçi görevi: tek bir (conversation_id, messages) parçasını analiz et"""
+    conversation_id, messages = task
+    return _analyze_rows(conversation_id, messages)
+
+
+def _run(function, tasks, workers, cache_path=None, label_cache_size=None):
+    """Görevleri sırayı koruyarak süreç havuzunda (veya tek çekirdekte) çalıştır"""
+    if workers == 1:
+        _init_worker(cache_path, label_cache_size)
+        return [function(task) for task in tasks]
+
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(cache_path, label_cache_size)) as executor:
+        # map, görev sırasını korur; birleştirme girdi sırasına göre deterministiktir
+        return list(executor.map(function, tasks, chunksize=chunksize))
+
+
+def analyze_conversations(conversations, workers=None, cache_path=None, label_cache_size=None):
+    """
+    (conversation_id, messages) çiftlerini konuşma bazında paylaştırarak analiz et
+    cache_path verilirse her işçi aynı disk önbelleğini kullanır.
+    label_cache_size: işçi başına bellek içi metin -> etiket önbelleğinin kayıt sınırı
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = list(conversations)
+
+    results = []
+    for rows in _run(_analyze_conversation_task, tasks, workers, cache_path, label_cache_size):
+        results.extend(rows)
+    return results
+
+
+def analyze_batch(source, workers=None, cache_path=None, label_cache_size=None):
+    """
+    Dizin, glob deseni veya tek dosyadaki konuşmaları çok çekirdekte analiz et.
+    Birden fazla dosya varsa dosyalar, tek dosya varsa konuşmalar işçilere dağıtılır.
+    """
+    workers = workers or os.cpu_count() or 1
+    files = resolve_files(source)
+
+    if not files:
+        raise FileNotFoundError(f"Analiz edilecek dosya bulunamadı: {source}")
+
+    if len(files) == 1:
+        return analyze_conversations(load_conversations(files[0]), workers, cache_path,
+                                     label_cache_size)
+
+    results = []
+    for rows in _run(_analyze_file_task, files, workers, cache_path, label_cache_size):
+        results.extend(rows)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konuşma dosyalarını çok çekirdekte analiz et")
+    parser.add_argument('source', help="Dizin, glob deseni veya conversation_id içeren tek dosya")
+    parser.add_argument('--workers', type=int, default=None, help="İşçi süreç sayısı")
+    parser.add_argument('--csv', default='dugum_buketi_toplu_analiz.csv', help="CSV çıktı dosyası")
+    parser.add_argument('--db', default=None, help="Sonuçların ekleneceği SQLite veritabanı")
+    parser.add_argument('--cache', default=None, help="Analiz sonuç önbelleği (SQLite dosyası)")
+    parser.add_argument('--label-cache', type=int, default=None,
+                        help="İşçi başına metin -> etiket LRU önbelleğinin kayıt sayısı")
+    args = parser.parse_args()
+
+    results = analyze_batch(args.source, args.workers, args.cache, args.label_cache)
+
+    analyzer = _get_analyzer()
+    if analyzer.label_cache is not None:
+        # Tek işçide önbellek bu süreçtedir; çok işçide istatistikler işçilerde kalır
+        print(f"Etiket önbelleği: {analyzer.label_cache.stats()}")
+    analyzer.save_to_csv(results, args.csv)
+    if args.db:
+        analyzer.save_to_sqlite(results, args.db)
+    print(f"Toplam analiz edilen mesaj: {len(results)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import pickle
+import threading
+import time
+
+from batch_analyzer import group_messages
+from chat_analyzer import DugumBuketiChatAnalyzer
+from instrumentation import Instrumentation
+from test_data_generator import iter_synthetic_messages
+
+
+def check_immutable(analyzer):
+    """Oluşturulmuş analiz sisteminin sözlükleri ve öznitelikleri değiştirilemez olmalı"""
+    attempts = (
+        lambda: setattr(analyzer, 'answer_lookahead', 5),
+        lambda: analyzer.category_keywords.__setitem__('Yeni', ('kelime',)),
+        lambda: analyzer.positive_words.append('yeni'),
+        lambda: delattr(analyzer, 'model')
+    )
+    for attempt in attempts:
+        try:
+            attempt()
+        except (AttributeError, TypeError):
+            continue
+        raise AssertionError("Analiz sistemi değiştirilebildi")
+
+    copy = pickle.loads(pickle.dumps(analyzer))
+    assert copy.dictionary_version == analyzer.dictionary_version
+
+
+def check_shared_threads(analyzer, conversations, expected, threads=8):
+    """Aynı örnek aynı anda çok sayıda iş parçacığından çağrıldığında sonuçlar değişmemeli"""
+    errors = []
+    barrier = threading.Barrier(threads)
+
+    def worker(offset):
+        barrier.wait()
+        for index in range(offset, len(conversations), threads):
+            if analyzer.analyze_conversation(conversations[index]) != expected[index]:
+                errors.append(index)
+
+    pool = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    assert not errors, f"Paylaşılan örnekte farklı sonuç: {errors[:5]}"
+
+
+def run_benchmark(message_count=50000, messages_per_conversation=50, workers=4, requests=200,
+                  seed=42):
+    conversations = [messages for _, messages in group_messages(iter_synthetic_messages(
+        message_count, max(1, message_count // messages_per_conversation), seed))]
+
+    start = time.perf_counter()
+    for _ in range(20):
+        DugumBuketiChatAnalyzer()
+    construction = (time.perf_counter() - start) / 20
+    print(f"Analiz sistemi oluşturma: {construction * 1000:.2f} ms")
+
+    reference = DugumBuketiChatAnalyzer()
+    start = time.perf_counter()
+    expected = [reference.analyze_conversation(messages) for messages in conversations]
+    sequential = time.perf_counter() - start
+    print(f"{len(conversations)} konuşma, {message_count:,} mesaj")
+    print(f"{'sıralı':<28} {message_count / sequential:>10,.0f} mesaj/sn")
+
+    # Etiket önbelleğinin iş parçacığı güvenliği ayrı örnekte denetlenir; ölçülen tüm
+    # çalıştırmalar sıralı referansla aynı (önbelleksiz) yapılandırmayı kullanır
+    with DugumBuketiChatAnalyzer(label_cache=100000) as cached:
+        check_immutable(cached)
+        check_shared_threads(cached, conversations, expected)
+
+    instrumentation = Instrumentation()
+    with DugumBuketiChatAnalyzer(instrumentation=instrumentation) as analyzer:
+
+        for executor in ('thread', 'process'):
+            # İlk çağrı havuzu açar; ikinci çağrı açık havuzu yeniden kullanır
+            for label in ('ilk çağrı', 'açık havuz'):
+                start = time.perf_counter()
+                results = analyzer.analyze_many(conversations, workers=workers, executor=executor)
+                elapsed = time.perf_counter() - start
+                assert results == expected, f"{executor} sonuçları sıralı analizden farklı"
+                print(f"{executor + ' (' + label + ')':<28} {message_count / elapsed:>10,.0f} mesaj/sn")
+
+        # Web arka ucu benzeri: istek başına tek konuşma, paylaşılan örnek ve yeni örnek
+        sample = conversations[:requests]
+        start = time.perf_counter()
+        for messages in sample:
+            DugumBuketiChatAnalyzer().analyze_conversation(messages)
+        per_request = time.perf_counter() - start
+        start = time.perf_counter()
+        for messages in sample:
+            analyzer.analyze_conversation(messages)
+        shared = time.perf_counter() - start
+        print(f"{len(sample)} istek: istek başına yeni örnek {per_request:.3f} sn, "
+              f"paylaşılan örnek {shared:.3f} sn")
+
+    calls = instrumentation.to_dict()['analyze_many']['calls']
+    assert calls == 4, "analyze_many aşama sayısı beklenenden farklı"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Paylaşılan analiz sistemi ve analyze_many ölçümü")
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--messages-per-conversation', type=int, default=50)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    run_benchmark(args.messages, args.messages_per_conversation, args.workers, args.requests)
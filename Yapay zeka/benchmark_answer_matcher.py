@@ -0,0 +1,102 @@
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from answer_matcher import parse_timestamp
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import SAMPLE_MESSAGES
+
+
+def build_stream(message_count, conversation_count, seed=42):
+    """Çok sayıda konuşmanın zaman sırasıyla iç içe geçtiği tek dışa aktarım akışı"""
+    rng = random.Random(seed)
+    senders = [('müşteri_1', 'customer'), ('müşteri_2', 'customer'), ('müşteri_3', 'customer'),
+               ('destek_1', 'support'), ('destek_2', 'support')]
+    current = datetime(2024, 1, 15, 9, 0, 0)
+
+    messages = []
+    for index in range(message_count):
+        current += timedelta(seconds=rng.randint(0, 3))
+        sender, user_type = rng.choice(senders)
+        messages.append({
+            'id': index + 1,
+            'conversation_id': f"konusma_{rng.randrange(conversation_count):05d}",
+            'timestamp': current.isoformat(),
+            'sender': sender,
+            'user_type': user_type,
+            'message': rng.choice(SAMPLE_MESSAGES)
+        })
+    return messages
+
+
+def scan_labels(analyzer, messages, window):
+    """Karşılaştırma için doğrudan tarama: her soru için pencere sonuna kadar ileri bak"""
+    times = [parse_timestamp(message.source.get('timestamp')) for message in messages]
+    matcher = analyzer.answer_matcher
+
+    labels = []
+    for position, question in enumerate(messages):
+        if not analyzer.is_question(question):
+            labels.append('Hayır')
+            continue
+
+        conversation_id = question.source.get('conversation_id', '')
+        side = matcher._side(question)
+        limit = times[position] + window
+        label = 'Hayır'
+        for reply_position in range(position + 1, len(messages)):
+            if times[reply_position] > limit:
+                break
+            reply = messages[reply_position]
+            if (reply.source.get('conversation_id', '') == conversation_id and
+                    matcher._side(reply) != side and matcher._is_answer_text(reply)):
+                label = 'Evet'
+                break
+        labels.append(label)
+    return labels
+
+
+def run_benchmark(sizes=(10000, 100000, 300000), conversation_count=2000, window=3600.0, seed=42):
+    analyzer = DugumBuketiChatAnalyzer(answer_window=window)
+    matcher = analyzer.answer_matcher
+
+    print(f"{conversation_count} iç içe konuşma, pencere: {window:.0f} sn")
+    print(f"{'mesaj':>8} {'dizinli µs/mesaj':>17} {'akış µs/mesaj':>14} {'tarama µs/mesaj':>16} "
+          f"{'hızlanma':>9}")
+
+    for size in sizes:
+        # Normalizasyon ve anahtar kelime taraması ölçüme dahil edilmez
+        messages = [analyzer.prepare_message(message)
+                    for message in build_stream(size, conversation_count, seed)]
+        for message in messages:
+            message.scores
+            message.tokens
+
+        start = time.perf_counter()
+        indexed = matcher.answered_labels(messages)
+        indexed_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamed = [label for _, _, label in matcher.stream_labels(messages)]
+        stream_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scanned = scan_labels(analyzer, messages, window)
+        scan_time = time.perf_counter() - start
+
+        assert indexed == scanned, "Dizinli eşleştirme doğrudan taramayla uyuşmuyor"
+        assert streamed == scanned, "Akış eşleştirmesi doğrudan taramayla uyuşmuyor"
+        print(f"{size:>8} {indexed_time / size * 1e6:>17.2f} {stream_time / size * 1e6:>14.2f} "
+              f"{scan_time / size * 1e6:>16.2f} "
+              f"{scan_time / indexed_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zaman pencereli yanıt eşleştirme ölçümü")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000])
+    parser.add_argument('--conversations', type=int, default=2000)
+    parser.add_argument('--window', type=float, default=3600.0, help="Yanıt penceresi (sn)")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.conversations, args.window)
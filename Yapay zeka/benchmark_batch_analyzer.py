@@ -0,0 +1,63 @@
+import argparse
+import os
+import time
+
+from batch_analyzer import analyze_conversations
+from test_data_generator import generate_sample_data
+
+
+def build_conversations(conversation_count, messages_per_conversation):
+    """generate_sample_data ile ölçeklenmiş, tekrarlanabilir konuşmalar üret"""
+    conversations = []
+    for index in range(conversation_count):
+        data = generate_sample_data(num_messages=messages_per_conversation,
+                                    conversation_id=f"dugum_buketi_{index:05d}",
+                                    output_file=None, seed=index)
+        conversations.append((data['conversation_id'], data['messages']))
+    return conversations
+
+
+def worker_counts(max_workers):
+    """1'den max_workers'a kadar ikinin kuvvetleri (ve max_workers)"""
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    counts.append(max_workers)
+    return counts
+
+
+def run_benchmark(conversation_count=400, messages_per_conversation=100, max_workers=None):
+    """1..N işçi için toplu analiz verimini ölç ve sonuçların aynı olduğunu doğrula"""
+    max_workers = max_workers or os.cpu_count() or 1
+    conversations = build_conversations(conversation_count, messages_per_conversation)
+    message_count = conversation_count * messages_per_conversation
+
+    print(f"{conversation_count} konuşma, {message_count} mesaj, CPU: {os.cpu_count()}")
+
+    baseline_time = None
+    baseline_results = None
+    for workers in worker_counts(max_workers):
+        start = time.perf_counter()
+        results = analyze_conversations(conversations, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        if baseline_results is None:
+            baseline_time, baseline_results = elapsed, results
+        else:
+            # Birleştirme deterministik olmalı
+            assert results == baseline_results, "İşçi sayısına göre sonuçlar değişti"
+
+        print(f"işçi={workers:>2}  {message_count / elapsed:>10,.0f} mesaj/sn  "
+              f"ölçeklenme: {baseline_time / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Toplu analiz ölçeklenme testi")
+    parser.add_argument('--conversations', type=int, default=400)
+    parser.add_argument('--messages', type=int, default=100)
+    parser.add_argument('--max-workers', type=int, default=None)
+    args = parser.parse_args()
+
+    run_benchmark(args.conversations, args.messages, args.max_workers)
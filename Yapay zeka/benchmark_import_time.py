@@ -0,0 +1,56 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+MODULES = ['chat_analyzer', 'main', 'batch_analyzer', 'visualizer']
+
+HEAVY_MODULES = ['pandas', 'numpy', 'nltk', 'textblob', 'sklearn', 'matplotlib', 'seaborn']
+
+# Alt süreçte çalışan ölçüm kodu: modülü içe aktarır, süreyi ve yüklenen ağır paketleri yazar
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+
+def measure(module, repeat):
+    """Modülü her seferinde yeni bir Python sürecinde (soğuk) içe aktar ve süreyi ölç"""
+    timings = []
+    heavy = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        heavy = result['heavy']
+    return statistics.median(timings), heavy
+
+
+def run_benchmark(repeat=5, output=None):
+    """Modüllerin soğuk başlatma maliyetini raporla"""
+    results = {}
+    for module in MODULES:
+        seconds, heavy = measure(module, repeat)
+        results[module] = {'median_ms': round(seconds * 1000, 1), 'heavy_imports': heavy}
+        print(f"{module:<16} {seconds * 1000:>8.1f} ms  ağır paketler: {', '.join(heavy) or '-'}")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="İçe aktarma (soğuk başlatma) süresi ölçümü")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    run_benchmark(args.repeat, args.output)
@@ -0,0 +1,107 @@
+import argparse
+import random
+import time
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import SAMPLE_MESSAGES
+
+# Alt dizgi ve kelime kökü eşleştirmesinin farklı sonuç verdiği örnekler
+TOKEN_EXAMPLES = [
+    "Kimlik fotokopisi gerekli mi",                # 'kim', 'foto' kelime içinde
+    "Yerli üretim kartal figürlü pasta",           # 'yer', 'kart'
+    "Fotoğraflarınız ne zaman gelir",
+    "Bir sorum var, paranız iade edilir mi",      # 'soru' ile 'sorun', ünlüden sonra iyelik
+    "Çiçekleri çok güzeldi, teşekkürler",
+    "IŞIKLI SALONLARINIZ HANGİ İLÇEDE",            # Türkçe büyük harfler
+    "Gelinliğin fiyatı değiştirebilir mi"
+]
+
+
+def legacy_scores(analyzer, text):
+    """Eski anahtar kelime döngüleri (karşılaştırma için)"""
+    category_scores = [sum(1 for keyword in keywords if keyword in text)
+                       for keywords in analyzer.category_keywords.values()]
+    intent_scores = [sum(1 for keyword in keywords if keyword in text)
+                     for keywords in analyzer.intent_keywords.values()]
+    positive_count = sum(1 for word in analyzer.positive_words if word in text)
+    negative_count = sum(1 for word in analyzer.negative_words if word in text)
+
+    return {
+        'kategori': category_scores,
+        'intent': intent_scores,
+        'sentiment': [positive_count, negative_count]
+    }
+
+
+def run_benchmark(message_count=100000, seed=42):
+    """Derlenmiş eşleştirici ile eski döngülerin verimini karşılaştır"""
+    analyzer = DugumBuketiChatAnalyzer()
+    matcher = analyzer.keyword_matcher
+
+    rng = random.Random(seed)
+    texts = [analyzer.preprocess_text(rng.choice(SAMPLE_MESSAGES))
+             for _ in range(message_count)]
+
+    # Sonuçların birebir aynı olduğunu doğrula
+    for text in set(texts):
+        legacy = legacy_scores(analyzer, text)
+        scores = matcher.count(text)
+        assert {group: scores[group] for group in legacy} == legacy, text
+
+    start = time.perf_counter()
+    for text in texts:
+        legacy_scores(analyzer, text)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for text in texts:
+        matcher.count(text)
+    matcher_time = time.perf_counter() - start
+
+    print(f"Mesaj sayısı: {message_count}")
+    print(f"Eski döngüler:          {message_count / legacy_time:,.0f} mesaj/sn")
+    print(f"Derlenmiş eşleştirici:  {message_count / matcher_time:,.0f} mesaj/sn")
+    print(f"Hızlanma: {legacy_time / matcher_time:.2f}x")
+
+    return legacy_time, matcher_time
+
+
+def run_token_benchmark(message_count=100000, seed=42):
+    """Kelime kökü dizinli eşleştiricinin verimi, kök önbelleği ve örnek farklar"""
+    substring = DugumBuketiChatAnalyzer()
+    token = DugumBuketiChatAnalyzer(matching='token')
+
+    rng = random.Random(seed)
+    messages = [rng.choice(SAMPLE_MESSAGES + TOKEN_EXAMPLES) for _ in range(message_count)]
+
+    timings = {}
+    for name, analyzer in (('alt dizgi', substring), ('kelime kökü', token)):
+        texts = [analyzer.preprocess_text(message) for message in messages]
+        start = time.perf_counter()
+        for text in texts:
+            analyzer.keyword_matcher.count(text)
+        timings[name] = time.perf_counter() - start
+        print(f"{name + ':':<23} {message_count / timings[name]:,.0f} mesaj/sn")
+
+    info = token.keyword_matcher.cache_info()
+    print(f"Kök önbelleği: {info.hits:,} isabet, {info.misses:,} kayıp, {info.currsize:,} kelime")
+
+    print(f"\n{'mesaj':<42} {'alt dizgi':<36} kelime kökü")
+    for message in TOKEN_EXAMPLES:
+        old = (substring.classify_category(message), substring.classify_intent(message))
+        new = (token.classify_category(message), token.classify_intent(message))
+        print(f"{message:<42} {' / '.join(old):<36} {' / '.join(new)}")
+
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Anahtar kelime eşleştirme ölçümü")
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--token', action='store_true', help="Kelime kökü modunu da ölç")
+    args = parser.parse_args()
+
+    run_benchmark(args.messages)
+    if args.token:
+        print()
+        run_token_benchmark(args.messages)
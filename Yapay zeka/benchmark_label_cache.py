@@ -0,0 +1,59 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from analysis_cache import LabelCache
+from batch_analyzer import group_messages
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import iter_synthetic_messages
+
+
+def analyze_all(analyzer, conversations):
+    return [analyzer.analyze_conversation(messages) for _, messages in conversations]
+
+
+def run_benchmark(message_count=100000, messages_per_conversation=50, backends=('keyword', 'lexicon'),
+                  cache_size=10000, threads=4, seed=42):
+    conversations = group_messages(iter_synthetic_messages(
+        message_count, max(1, message_count // messages_per_conversation), seed))
+
+    print(f"{message_count:,} mesaj, {len(conversations):,} konuşma")
+    print(f"{'arka uç':<10} {'önbelleksiz mesaj/sn':>21} {'önbellekli mesaj/sn':>20} {'isabet':>8}")
+
+    for backend in backends:
+        plain = DugumBuketiChatAnalyzer(sentiment_backend=backend)
+        start = time.perf_counter()
+        expected = analyze_all(plain, conversations)
+        plain_time = time.perf_counter() - start
+
+        cached = DugumBuketiChatAnalyzer(sentiment_backend=backend, label_cache=cache_size)
+        start = time.perf_counter()
+        actual = analyze_all(cached, conversations)
+        cached_time = time.perf_counter() - start
+
+        assert actual == expected, f"{backend}: önbellekli sonuçlar farklı"
+        stats = cached.label_cache.stats()
+        print(f"{backend:<10} {message_count / plain_time:>21,.0f} {message_count / cached_time:>20,.0f} "
+              f"{stats['hit_rate']:>7.1%}")
+
+    # Aynı analiz sistemi ve önbellek birden fazla iş parçacığında paylaşılır
+    shared = DugumBuketiChatAnalyzer(label_cache=LabelCache(cache_size))
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        threaded = list(executor.map(shared.analyze_conversation,
+                                     (messages for _, messages in conversations)))
+    assert threaded == analyze_all(DugumBuketiChatAnalyzer(), conversations), \
+        "Paylaşılan önbellekle iş parçacıklı sonuçlar farklı"
+    print(f"{threads} iş parçacığı, paylaşılan önbellek: {shared.label_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metin -> etiket LRU önbelleği ölçümü")
+    parser.add_argument('--messages', type=int, default=100000)
+    parser.add_argument('--messages-per-conversation', type=int, default=50)
+    parser.add_argument('--backends', nargs='+', default=['keyword', 'lexicon'])
+    parser.add_argument('--cache-size', type=int, default=10000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    run_benchmark(args.messages, args.messages_per_conversation, args.backends, args.cache_size,
+                  args.threads)
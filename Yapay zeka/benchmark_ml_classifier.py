@@ -0,0 +1,51 @@
+import os
+import random
+import tempfile
+import time
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from ml_classifier import KeywordBootstrappedClassifier
+from test_data_generator import SAMPLE_MESSAGES
+
+
+def build_texts(count, rng):
+    """Şablon mesajlardan küçük değişikliklerle metin üret"""
+    suffixes = ['', ' lütfen', ' acil', ' teşekkürler', ' bilgi verir misiniz']
+    return [rng.choice(SAMPLE_MESSAGES) + rng.choice(suffixes) for _ in range(count)]
+
+
+def run_benchmark(train_count=20000, test_count=100000, seed=42):
+    """Model ile anahtar kelime yolunun toplu verimini ve etiket uyumunu karşılaştır"""
+    rng = random.Random(seed)
+    keyword_analyzer = DugumBuketiChatAnalyzer()
+
+    classifier = KeywordBootstrappedClassifier.bootstrap(keyword_analyzer, build_texts(train_count, rng))
+
+    # Diske bir kez kaydedip yükle
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, 'model.pkl')
+        classifier.save(model_path)
+        model_analyzer = DugumBuketiChatAnalyzer(model=model_path)
+
+    texts = build_texts(test_count, rng)
+
+    start = time.perf_counter()
+    keyword_categories, keyword_intents = keyword_analyzer.classify_labels_batch(texts)
+    keyword_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    model_categories, model_intents = model_analyzer.classify_labels_batch(texts)
+    model_time = time.perf_counter() - start
+
+    category_agreement = sum(a == b for a, b in zip(keyword_categories, model_categories)) / test_count
+    intent_agreement = sum(a == b for a, b in zip(keyword_intents, model_intents)) / test_count
+
+    print(f"Eğitim: {train_count} mesaj, test: {test_count} mesaj")
+    print(f"Anahtar kelime yolu: {test_count / keyword_time:>12,.0f} mesaj/sn")
+    print(f"TF-IDF + NB modeli:  {test_count / model_time:>12,.0f} mesaj/sn")
+    print(f"Kategori uyumu: %{category_agreement * 100:.1f}")
+    print(f"Intent uyumu:   %{intent_agreement * 100:.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,84 @@
+import argparse
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+from batch_analyzer import load_conversations
+from chat_analyzer import DugumBuketiChatAnalyzer
+from normalized_store import NormalizedChatStore
+from test_data_generator import write_synthetic_data
+
+QUERY = ('SELECT conversation_id, message_id, timestamp, sender, message, "yanıtlanmış_mı", '
+         'sentiment, kategori, intent FROM chat_analysis ORDER BY conversation_id, message_id')
+
+
+def run_benchmark(message_count=200000, file_count=20, messages_per_conversation=50, page_size=500,
+                  seed=42):
+    analyzer = DugumBuketiChatAnalyzer()
+
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        paths = []
+        per_file = message_count // file_count
+        for index in range(file_count):
+            path = os.path.join(directory, f"export_{index:03d}.ndjson")
+            write_synthetic_data(path, per_file, max(1, per_file // messages_per_conversation),
+                                 seed + index)
+            paths.append(path)
+
+        # Düz tablo: dosya başına analiz ve save_to_sqlite
+        flat_db = os.path.join(directory, 'flat.db')
+        start = time.perf_counter()
+        for index, path in enumerate(paths):
+            rows = [row for conversation_id, messages in load_conversations(path)
+                    for row in analyzer.analyze_conversation(
+                        messages, conversation_id=f"{index}:{conversation_id}")]
+            analyzer.save_to_sqlite(rows, flat_db)
+        flat_time = time.perf_counter() - start
+
+        # Normalize şema: önce tüm dosyalar yüklenir, sonra bekleyenler sayfa sayfa analiz edilir
+        normalized_db = os.path.join(directory, 'normalized.db')
+        with NormalizedChatStore(normalized_db) as store:
+            start = time.perf_counter()
+            for index, path in enumerate(paths):
+                store.load_conversations(((f"{index}:{conversation_id}", messages)
+                                          for conversation_id, messages in load_conversations(path)),
+                                         source=path)
+            load_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            analyzed = analyzer.analyze_pending(store, page_size)
+            analyze_time = time.perf_counter() - start
+            assert store.pending_count() == 0
+
+        flat_conn, normalized_conn = sqlite3.connect(flat_db), sqlite3.connect(normalized_db)
+        assert flat_conn.execute(QUERY).fetchall() == normalized_conn.execute(QUERY).fetchall(), \
+            "Normalize şemanın chat_analysis görünümü düz tabloyla aynı değil"
+        flat_conn.close()
+        normalized_conn.close()
+
+        for path in (flat_db, normalized_db):
+            with sqlite3.connect(path) as conn:
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        flat_size = os.path.getsize(flat_db)
+        normalized_size = os.path.getsize(normalized_db)
+
+    print(f"{message_count:,} mesaj, {file_count} dosya")
+    print(f"Düz tablo (analiz + yazma):      {message_count / flat_time:>10,.0f} mesaj/sn, "
+          f"{flat_size / 1e6:.1f} MB")
+    print(f"Normalize yükleme:               {message_count / load_time:>10,.0f} mesaj/sn")
+    print(f"Normalize bekleyenleri analiz:   {analyzed / analyze_time:>10,.0f} mesaj/sn, "
+          f"{normalized_size / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize SQLite deposu yükleme/analiz ölçümü")
+    parser.add_argument('--messages', type=int, default=200000)
+    parser.add_argument('--files', type=int, default=20)
+    parser.add_argument('--messages-per-conversation', type=int, default=50)
+    parser.add_argument('--page-size', type=int, default=500)
+    args = parser.parse_args()
+
+    run_benchmark(args.messages, args.files, args.messages_per_conversation, args.page_size)
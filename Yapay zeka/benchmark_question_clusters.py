@@ -0,0 +1,97 @@
+import argparse
+import random
+import sqlite3
+import time
+from collections import Counter
+
+from question_clusters import QuestionClusterer, save_clusters
+from test_data_generator import CUSTOMER_QUESTIONS
+
+FILLERS = ['merhaba', 'acaba', 'lütfen', 'iyi günler', 'bir de', 'şimdiden teşekkürler', 'rica etsem']
+
+
+def perturb(rng, text):
+    """Aynı sorunun yazım farkları: dolgu kelimeleri, harf hataları, büyük/küçük harf, sayılar"""
+    words = text.split()
+    if rng.random() < 0.5:
+        words.insert(0, rng.choice(FILLERS).capitalize() + ',')
+    if rng.random() < 0.5:
+        words.append(rng.choice(FILLERS))
+    for _ in range(rng.randint(0, 2)):
+        index = rng.randrange(len(words))
+        word = words[index]
+        if len(word) > 3:
+            position = rng.randrange(1, len(word) - 1)
+            words[index] = word[:position] + word[position + 1:]
+    text = ' '.join(words)
+    text = text.replace('50.000', f"{rng.randint(10, 99)}.000")
+    if rng.random() < 0.3:
+        text = text.lower()
+    return text + rng.choice(['?', '??', '', ' ?'])
+
+
+def make_entries(count, seed):
+    """(mesaj, kategori, intent, satır sayısı) girdileri ve mesaj -> şablon eşlemesi"""
+    rng = random.Random(seed)
+    counts = Counter()
+    templates = {}
+    for _ in range(count):
+        template = rng.randrange(len(CUSTOMER_QUESTIONS))
+        text = perturb(rng, CUSTOMER_QUESTIONS[template])
+        counts[text] += 1
+        templates.setdefault(text, template)
+    return [(text, 'Diğer', 'Diğer', total) for text, total in counts.items()], templates
+
+
+def score(clusters, assignments, entries, templates):
+    """Saflık: kümenin çoğunluk şablonundan gelen satır oranı; bütünlük: şablonun en büyük kümedeki oranı"""
+    counts = {text: total for text, _, _, total in entries}
+    by_cluster = {}
+    by_template = {}
+    for text, cluster_id in assignments.items():
+        by_cluster.setdefault(cluster_id, Counter())[templates[text]] += counts[text]
+        by_template.setdefault(templates[text], Counter())[cluster_id] += counts[text]
+
+    total = sum(counts[text] for text in assignments)
+    purity = sum(counter.most_common(1)[0][1] for counter in by_cluster.values()) / total
+    completeness = sum(counter.most_common(1)[0][1] for counter in by_template.values()) / total
+    return purity, completeness
+
+
+def run_benchmark(sizes=(10000, 100000), threshold=0.6, seed=42):
+    # Şablonların bir kısmı yalnızca '?' ile soru sayılır ('?' normalize edilirken silinir);
+    # kümeleme kalitesi için tüm şablonlar kümelenir
+    clusterer = QuestionClusterer(questions_only=False, threshold=threshold)
+    print(f"{'satır':>9} {'farklı':>8} {'soru':>8} {'küme':>6} {'saflık':>7} {'bütünlük':>9} "
+          f"{'süre sn':>8} {'satır/sn':>10}")
+
+    for size in sizes:
+        entries, templates = make_entries(size, seed)
+        start = time.perf_counter()
+        clusters, assignments = clusterer.cluster(entries)
+        elapsed = time.perf_counter() - start
+
+        purity, completeness = score(clusters, assignments, entries, templates)
+        rows = sum(cluster['message_count'] for cluster in clusters)
+        assert rows == sum(total for text, _, _, total in entries if text in assignments)
+        print(f"{size:>9} {len(entries):>8} {rows:>8} {len(clusters):>6} {purity:>7.3f} "
+              f"{completeness:>9.3f} {elapsed:>8.2f} {size / elapsed:>10,.0f}")
+
+        if size == sizes[0]:
+            conn = sqlite3.connect(':memory:')
+            save_clusters(conn, clusters, assignments, entries)
+            stored = conn.execute("SELECT SUM(message_count) FROM unanswered_question_clusters").fetchone()[0]
+            members = conn.execute(
+                "SELECT SUM(message_count) FROM unanswered_question_cluster_messages").fetchone()[0]
+            assert stored == members == rows, "Kaydedilen küme sayıları farklı"
+            conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yanıtlanmamış soru kümeleme ölçümü")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--threshold', type=float, default=0.6)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.threshold, args.seed)
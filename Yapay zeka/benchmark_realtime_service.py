@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import random
+import resource
+import time
+
+from realtime_service import UnansweredQuestionService
+from test_data_generator import generate_sample_data
+
+
+def percentile(sorted_values, ratio):
+    """Sıralı listeden yüzdelik değer"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * ratio))
+    return sorted_values[index]
+
+
+def build_events(conversation_count, messages_per_conversation, seed=42):
+    """Konuşmaları rastgele iç içe geçirerek canlı olay akışı üret"""
+    rng = random.Random(seed)
+    queues = []
+    for index in range(conversation_count):
+        data = generate_sample_data(num_messages=messages_per_conversation,
+                                    conversation_id=f"canli_{index:05d}",
+                                    output_file=None, seed=seed + index)
+        queues.append([{'conversation_id': data['conversation_id'], **message}
+                       for message in reversed(data['messages'])])
+
+    events = []
+    while queues:
+        position = rng.randrange(len(queues))
+        events.append(queues[position].pop())
+        if not queues[position]:
+            queues[position] = queues[-1]
+            queues.pop()
+    return events
+
+
+async def replay(events, service, rate, received):
+    """Olayları hedef hızda (olay/sn) kuyruğa koy; rate=None ise beklemeden"""
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    runner = asyncio.create_task(service.run(queue))
+    start = loop.time()
+    peak_pending = 0
+
+    for position, event in enumerate(events):
+        if rate:
+            delay = start + position / rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        elif position % 1000 == 0:
+            await asyncio.sleep(0)
+
+        event = dict(event, received_at=loop.time())
+        received[(event['conversation_id'], event['id'])] = event['received_at']
+        queue.put_nowait(event)
+
+        if position % 1000 == 0:
+            peak_pending = max(peak_pending, service.stats()['takipteki_kayıt'])
+
+    queue.put_nowait(None)
+    await runner
+    return peak_pending
+
+
+async def collect_alerts(service):
+    """Uyarı kuyruğunu sona kadar oku"""
+    alerts = []
+    while True:
+        alert = await service.alerts.get()
+        if alert is None:
+            return alerts
+        alerts.append(alert)
+
+
+async def run_replay(events, deadline, rate, max_pending):
+    service = UnansweredQuestionService(deadline=deadline, max_pending=max_pending)
+    received = {}
+    collector = asyncio.create_task(collect_alerts(service))
+
+    start = time.perf_counter()
+    peak_pending = await replay(events, service, rate, received)
+    alerts = await collector
+    elapsed = time.perf_counter() - start
+    return service, alerts, received, peak_pending, elapsed
+
+
+def check_behaviour():
+    """Yanıt, süre dolumu ve aynı göndericinin mesajı için beklenen uyarılar"""
+    async def scenario():
+        service = UnansweredQuestionService(deadline=0.05)
+        queue = asyncio.Queue()
+        runner = asyncio.create_task(service.run(queue))
+
+        for event in [
+            {'conversation_id': 'a', 'id': 1, 'sender': 'müşteri_1', 'user_type': 'customer',
+             'message': 'Gelinlik ölçüsü nasıl alınıyor?'},
+            {'conversation_id': 'b', 'id': 1, 'sender': 'müşteri_2', 'user_type': 'customer',
+             'message': 'Hangi tarihler müsait?'},
+            {'conversation_id': 'b', 'id': 2, 'sender': 'müşteri_2', 'user_type': 'customer',
+             'message': 'Evet, cevap bekliyorum'},
+            {'conversation_id': 'a', 'id': 2, 'sender': 'destek_1', 'user_type': 'support',
+             'message': 'Elbette, fiyat listemizi gönderiyorum'},
+        ]:
+            queue.put_nowait(event)
+        queue.put_nowait(None)
+
+        await runner
+        return await collect_alerts(service)
+
+    alerts = {(alert['conversation_id'], alert['status']) for alert in asyncio.run(scenario())}
+    assert alerts == {('a', 'answered'), ('b', 'unanswered')}, alerts
+
+    # Tüketilmeyen uyarı kuyruğu sınırlıdır; taşan uyarılar sayılır
+    async def overflow():
+        service = UnansweredQuestionService(deadline=0.0, max_alerts=2)
+        for index in range(5):
+            service.process({'conversation_id': str(index), 'id': 1, 'sender': 'müşteri',
+                             'user_type': 'customer', 'message': 'Hangi tarihler müsait?'})
+        service.expire()
+        return service
+
+    service = asyncio.run(overflow())
+    assert (service.alerts.qsize(), service.dropped_alerts) == (2, 3), service.stats()
+
+
+def run_benchmark(conversation_count=5000, messages_per_conversation=20, deadline=0.5,
+                  rate=None, max_pending=100000, seed=42):
+    check_behaviour()
+    print("Davranış kontrolü geçti")
+
+    events = build_events(conversation_count, messages_per_conversation, seed)
+    print(f"{conversation_count} eşzamanlı konuşma, {len(events)} olay, süre: {deadline} sn, "
+          f"hız: {rate or 'sınırsız'} olay/sn")
+
+    service, alerts, received, peak_pending, elapsed = asyncio.run(
+        run_replay(events, deadline, rate, max_pending))
+
+    # Yanıt gelişinden 'answered' uyarısına ve son tarihten 'unanswered' uyarısına gecikme
+    answer_latencies = sorted(
+        (alert['emitted_at'] - received[(alert['conversation_id'], alert['reply_id'])]) * 1000
+        for alert in alerts if alert['status'] == 'answered')
+    deadline_lags = sorted((alert['emitted_at'] - alert['deadline']) * 1000
+                           for alert in alerts
+                           if alert['status'] == 'unanswered' and alert['reason'] == 'deadline')
+
+    print(f"Verim: {len(events) / elapsed:,.0f} olay/sn ({elapsed:.2f} sn, son tarih beklemesi dahil)")
+    print(f"Yanıtlanan: {service.answered}, yanıtlanmayan: {service.unanswered}, "
+          f"en fazla bekleyen kayıt: {peak_pending}, düşen uyarı: {service.dropped_alerts}")
+    print(f"Yanıt gecikmesi    p50: {percentile(answer_latencies, 0.5):.2f} ms  "
+          f"p99: {percentile(answer_latencies, 0.99):.2f} ms")
+    print(f"Süre dolum gecikmesi p50: {percentile(deadline_lags, 0.5):.2f} ms  "
+          f"p99: {percentile(deadline_lags, 0.99):.2f} ms")
+    print(f"En yüksek bellek (RSS): {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerçek zamanlı servis gecikme ölçümü")
+    parser.add_argument('--conversations', type=int, default=5000)
+    parser.add_argument('--messages', type=int, default=20, help="Konuşma başına mesaj")
+    parser.add_argument('--deadline', type=float, default=0.5, help="Yanıt süresi (sn)")
+    parser.add_argument('--rate', type=float, default=None, help="Olay/sn (varsayılan: sınırsız)")
+    parser.add_argument('--max-pending', type=int, default=100000)
+    args = parser.parse_args()
+
+    run_benchmark(args.conversations, args.messages, args.deadline, args.rate, args.max_pending)
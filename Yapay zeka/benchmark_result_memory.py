@@ -0,0 +1,139 @@
+import argparse
+import gc
+import os
+import sqlite3
+import tempfile
+import time
+import tracemalloc
+
+from batch_analyzer import group_messages
+from chat_analyzer import DugumBuketiChatAnalyzer, LABEL_COLUMNS
+from result_table import AnalysisResultTable
+from sqlite_store import ChatAnalysisStore
+from test_data_generator import iter_synthetic_messages
+
+
+def traced(function):
+    """Fonksiyonun sonucu, kalıcı bellek artışı ve en yüksek ek bellek (bayt)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def analyze(analyzer, conversations):
+    """Etiketleri bir kez hesapla: (mesaj, metin, sıra, etiketler, conversation_id) listesi"""
+    entries = []
+    for conversation_id, messages in conversations:
+        for row, (position, message) in zip(
+                analyzer.analyze_conversation(messages),
+                ((i, m) for i, m in enumerate(messages) if m.get('message', '').strip())):
+            labels = tuple(row[column] for column in LABEL_COLUMNS)
+            entries.append((message, row['message'], position, labels, conversation_id))
+    return entries
+
+
+def build_dicts(analyzer, entries):
+    rows = []
+    for message, text, position, labels, conversation_id in entries:
+        rows.append(analyzer._result_row(message, text, position, labels, conversation_id))
+    return rows
+
+
+def build_table(analyzer, entries):
+    table = analyzer.new_result_table()
+    for message, text, position, labels, conversation_id in entries:
+        table.append(message, text, position, labels, conversation_id)
+    return table
+
+
+def check_equivalence(analyzer, conversations, rows, table):
+    """Tablo, sözlük listesiyle aynı satırları, DataFrame'i, raporu ve veritabanını üretmeli"""
+    import pandas as pd
+
+    assert len(table) == len(rows)
+    assert all(record.to_dict() == row for record, row in zip(table, rows)), "Satırlar farklı"
+
+    # analyze_conversation(table=...) aynı tabloyu üretmeli
+    direct = analyzer.new_result_table()
+    for conversation_id, messages in conversations:
+        analyzer.analyze_conversation(messages, table=direct, conversation_id=conversation_id)
+    assert [record.to_dict() for record in direct] == rows, "analyze_conversation tablosu farklı"
+
+    expected = pd.DataFrame(rows)
+    actual = table.to_dataframe()
+    pd.testing.assert_frame_equal(actual.astype(object), expected.astype(object))
+    assert analyzer.generate_report(table) == analyzer.generate_report(rows), "Rapor farklı"
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for name, data in (('dicts.db', rows), ('table.db', table)):
+            path = os.path.join(directory, name)
+            with ChatAnalysisStore(path) as store:
+                if isinstance(data, AnalysisResultTable):
+                    store.write_table(data)
+                else:
+                    store.write(data)
+            paths.append(path)
+
+        dumps = []
+        for path in paths:
+            conn = sqlite3.connect(path)
+            dumps.append(conn.execute(
+                "SELECT * FROM chat_analysis ORDER BY conversation_id, message_id").fetchall())
+            conn.close()
+        assert dumps[0] == dumps[1], "Veritabanı satırları farklı"
+
+        parquet = os.path.join(directory, 'table.parquet')
+        import pyarrow.parquet as pq
+        pq.write_table(table.to_arrow(LABEL_COLUMNS), parquet)
+        assert pd.read_parquet(parquet)['kategori'].astype(object).tolist() == expected['kategori'].tolist()
+
+
+def run_benchmark(sizes=(100000, 500000), messages_per_conversation=50, seed=42):
+    import pandas as pd
+
+    analyzer = DugumBuketiChatAnalyzer()
+    print("Mesaj verisi (metin, zaman damgası) iki yapıda da kaynak nesnelere başvurudur; "
+          "ölçülen, sonuç yapısının kendi maliyetidir.")
+    print(f"{'mesaj':>8} {'yapı':<8} {'bellek MB':>10} {'bayt/satır':>11} {'kurma sn':>9} "
+          f"{'DataFrame tepe MB':>18} {'DataFrame MB':>13}")
+
+    for size in sizes:
+        conversations = group_messages(iter_synthetic_messages(
+            size, max(1, size // messages_per_conversation), seed))
+        entries = analyze(analyzer, conversations)
+
+        measured = {}
+        for name, build in (('sözlük', build_dicts), ('tablo', build_table)):
+            result, current, _, elapsed = traced(lambda: build(analyzer, entries))
+            if isinstance(result, AnalysisResultTable):
+                to_frame = result.to_dataframe
+            else:
+                to_frame = lambda: pd.DataFrame(result)  # noqa: E731
+            frame, _, frame_peak, _ = traced(to_frame)
+            frame_size = frame.memory_usage(deep=True).sum()
+            measured[name] = result
+            print(f"{len(result):>8} {name:<8} {current / 1e6:>10.1f} {current / len(result):>11.1f} "
+                  f"{elapsed:>9.2f} {frame_peak / 1e6:>18.1f} {frame_size / 1e6:>13.1f}")
+            del frame
+
+        if size == sizes[0]:
+            check_equivalence(analyzer, conversations, measured['sözlük'], measured['tablo'])
+        del measured, entries
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sonuç tablosu ve sözlük listesi bellek ölçümü")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 500000])
+    parser.add_argument('--messages-per-conversation', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.messages_per_conversation, args.seed)
@@ -0,0 +1,118 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from report_engine import REPORT_COLUMNS
+from rolling_metrics import RollingMetrics
+from test_data_generator import iter_synthetic_messages
+
+
+def make_rows(message_count, conversations, seed, jitter=50):
+    """Zaman sıralı analiz satırları; jitter satırlık bloklar karıştırılarak geç gelen mesajlar taklit edilir"""
+    analyzer = DugumBuketiChatAnalyzer()
+    rows = list(analyzer.analyze_stream(iter_synthetic_messages(message_count, conversations, seed)))
+    rng = random.Random(seed)
+    for start in range(0, len(rows), jitter):
+        block = rows[start:start + jitter]
+        rng.shuffle(block)
+        rows[start:start + jitter] = block
+    return rows
+
+
+def brute_force(metrics, counted, seconds):
+    """Penceredeki sayılmış satırlardan sayaçları baştan hesapla"""
+    window = metrics.windows[seconds]
+    total = 0
+    counts = {column: Counter() for column in REPORT_COLUMNS}
+    for index, row in counted:
+        if index >= window.start:
+            total += 1
+            for column in REPORT_COLUMNS:
+                counts[column][row[column]] += 1
+    return total, counts
+
+
+def check(metrics, counted):
+    for seconds, window in metrics.windows.items():
+        total, counts = brute_force(metrics, counted, seconds)
+        assert window.total == total, f"{seconds} sn penceresinin toplamı farklı"
+        assert window.counts == counts, f"{seconds} sn penceresinin sayaçları farklı"
+
+
+def run_benchmark(message_count=200000, conversations=4000, windows=(3600, 86400), bucket=60,
+                  checkpoints=20, seed=42):
+    from answer_matcher import parse_timestamp
+
+    rows = make_rows(message_count, conversations, seed)
+    span = (parse_timestamp(rows[-1]['timestamp']) - parse_timestamp(rows[0]['timestamp'])) / 3600
+    print(f"{len(rows):,} satır, {span:.1f} saatlik akış, pencereler {list(windows)} sn, kova {bucket} sn")
+
+    # Doğruluk: ara noktalarda pencere sayaçları baştan hesaplanan sayaçlarla aynı olmalı
+    metrics = RollingMetrics(windows, bucket)
+    counted = []
+    step = max(1, len(rows) // checkpoints)
+    with tempfile.TemporaryDirectory() as directory:
+        state_path = os.path.join(directory, 'durum.json')
+        restored = None
+        for position, row in enumerate(rows, 1):
+            if metrics.add_row(row):
+                counted.append((int(parse_timestamp(row['timestamp']) // bucket), row))
+            if restored is not None:
+                restored.add_row(row)
+            if position % step == 0:
+                check(metrics, counted)
+            if position == len(rows) // 2:
+                metrics.save(state_path)
+                restored = RollingMetrics(windows, bucket, state_path=state_path)
+                assert restored.reports() == metrics.reports(), "Yüklenen durum farklı"
+        check(metrics, counted)
+        assert restored.reports() == metrics.reports(), "Yeniden başlatılan toplayıcı farklı sonuç verdi"
+        state_size = os.path.getsize(metrics.save(state_path))
+
+        # En uzun pencereden eski mesaj sayılmaz; ilerletme tüm pencereleri boşaltır
+        old = dict(rows[-1], timestamp=rows[0]['timestamp'])
+        if span * 3600 > max(windows) + bucket:
+            assert not metrics.add_row(old) and metrics.late == 1
+        latest = max(parse_timestamp(row['timestamp']) for row in rows)
+        metrics.advance(latest + max(windows) + bucket)
+        assert all(window.total == 0 and not any(window.counts.values())
+                   for window in metrics.windows.values()), "Süresi dolan kovalar çıkarılmadı"
+
+    # Hız: artımlı güncelleme ve her güncellemede baştan hesaplama
+    metrics = RollingMetrics(windows, bucket)
+    start = time.perf_counter()
+    for row in rows:
+        metrics.add_row(row)
+    incremental = time.perf_counter() - start
+
+    analyzer = DugumBuketiChatAnalyzer()
+    sample = rows[:len(rows) // checkpoints]
+    analyzer.generate_report(sample)
+    start = time.perf_counter()
+    for _ in range(5):
+        analyzer.generate_report(sample)
+    full_scan = (time.perf_counter() - start) / 5
+
+    print(f"Artımlı güncelleme: {len(rows) / incremental:,.0f} mesaj/sn "
+          f"({incremental / len(rows) * 1e6:.2f} µs/mesaj), geç: {metrics.late}")
+    print(f"generate_report ile {len(sample):,} satırı baştan sayma: {full_scan * 1000:.1f} ms/rapor")
+    print(f"Durum dosyası: {state_size / 1024:.1f} KB")
+    for seconds, report in metrics.reports(top=3).items():
+        print(f"  {seconds:>6} sn: {report['toplam_mesaj']:>7} mesaj, yanıtlanmamış oranı "
+              f"{report['yanıtlanmamış_oranı']:.3f}, en çok kategori {report['en_çok_kategori']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kayan pencereli metrik toplayıcı ölçümü")
+    parser.add_argument('--messages', type=int, default=200000)
+    parser.add_argument('--conversations', type=int, default=4000)
+    parser.add_argument('--windows', type=int, nargs='+', default=[3600, 86400])
+    parser.add_argument('--bucket', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    run_benchmark(args.messages, args.conversations, args.windows, args.bucket, seed=args.seed)
@@ -0,0 +1,49 @@
+import random
+import time
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from sentiment_backends import SENTIMENT_BACKENDS
+from test_data_generator import SAMPLE_MESSAGES
+
+
+def percentile(sorted_values, ratio):
+    """Sıralı listeden yüzdelik değer"""
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * ratio))
+    return sorted_values[index]
+
+
+def run_benchmark(message_count=20000, seed=42):
+    """Her duygu analizi arka ucu için mesaj başına gecikme ve toplu verimi ölç"""
+    rng = random.Random(seed)
+    texts = [rng.choice(SAMPLE_MESSAGES) for _ in range(message_count)]
+
+    print(f"Mesaj sayısı: {message_count}")
+    print(f"{'arka uç':<10} {'ort µs':>9} {'p50 µs':>9} {'p99 µs':>9} {'toplu mesaj/sn':>16}")
+
+    for name in SENTIMENT_BACKENDS:
+        analyzer = DugumBuketiChatAnalyzer(sentiment_backend=name)
+        backend = analyzer.sentiment_backend
+        prepared = [analyzer.prepare_message(text) for text in texts]
+        for message in prepared:
+            message.scores  # Anahtar kelime taraması ölçüme dahil edilmez
+
+        # Mesaj başına gecikme
+        latencies = []
+        for message in prepared:
+            start = time.perf_counter()
+            backend.score(message)
+            latencies.append((time.perf_counter() - start) * 1e6)
+        latencies.sort()
+
+        # Toplu verim
+        start = time.perf_counter()
+        backend.score_batch(prepared)
+        batch_time = time.perf_counter() - start
+
+        print(f"{name:<10} {sum(latencies) / len(latencies):>9.1f} "
+              f"{percentile(latencies, 0.5):>9.1f} {percentile(latencies, 0.99):>9.1f} "
+              f"{message_count / batch_time:>16,.0f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,227 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+
+STAGES = ['generate', 'analyze_conversation', 'analyze_stream', 'save_csv', 'save_parquet',
+          'save_sqlite', 'report', 'report_sql']
+
+
+def percentile(sorted_values, ratio):
+    """Sıralı listeden yüzdelik değer"""
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * ratio))
+    return sorted_values[index]
+
+
+def peak_rss_mb():
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (MB)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def stage_result(seconds, messages, latencies_ms=None):
+    """Aşama ölçümünü sözlüğe çevir; gecikmeler ms cinsinden, sıralı"""
+    result = {
+        'seconds': round(seconds, 4),
+        'messages': messages,
+        'messages_per_second': round(messages / seconds, 1) if seconds > 0 else None,
+        'peak_rss_mb': peak_rss_mb()
+    }
+    if latencies_ms is not None:
+        result['p50_ms'] = round(percentile(latencies_ms, 0.5) or 0.0, 4)
+        result['p99_ms'] = round(percentile(latencies_ms, 0.99) or 0.0, 4)
+    return result
+
+
+def run_size(size, conversations, seed, output_format, stages, workdir):
+    """
+    Tek boyut için ölçümler (ayrı süreçte çalışır, böylece en yüksek RSS boyuta özeldir)
+    p50/p99 gecikmeleri yalnızca analyze_stream için (her mesaj ayrı) ölçülür; analyze_conversation
+    konuşmayı toplu analiz ettiğinden mesaj başına gecikmesi yoktur, yalnızca verimi raporlanır.
+    Konuşmalar iki biçimde de mesajların conversation_id alanına göre gruplanır, böylece json ve
+    ndjson aynı iş yükünü ölçer. Kaydetme ve rapor tek çağrıdır.
+    """
+    from batch_analyzer import load_conversations
+    from chat_analyzer import DugumBuketiChatAnalyzer
+    from report_engine import SQLiteReportEngine
+    from stream_reader import iter_messages
+    from test_data_generator import write_synthetic_data
+
+    os.chdir(workdir)
+    analyzer = DugumBuketiChatAnalyzer()
+    path = os.path.join(workdir, f"synthetic_{size}.{output_format}")
+    measured = {}
+    quiet = contextlib.redirect_stdout(io.StringIO())
+
+    with quiet:
+        start = time.perf_counter()
+        write_synthetic_data(path, size, conversations, seed)
+        if 'generate' in stages:
+            measured['generate'] = stage_result(time.perf_counter() - start, size)
+
+    results = None
+    if stages & {'analyze_conversation', 'save_csv', 'save_parquet', 'save_sqlite', 'report',
+                 'report_sql'}:
+        results = []
+        start = time.perf_counter()
+        for conversation_id, messages in load_conversations(path):
+            results.extend(analyzer.analyze_conversation(messages, conversation_id=conversation_id))
+        if 'analyze_conversation' in stages:
+            measured['analyze_conversation'] = stage_result(time.perf_counter() - start, len(results))
+
+    if 'analyze_stream' in stages:
+        latencies = []
+        start = time.perf_counter()
+        rows = analyzer.analyze_stream(iter_messages(path))
+        while True:
+            message_start = time.perf_counter()
+            try:
+                next(rows)
+            except StopIteration:
+                break
+            latencies.append((time.perf_counter() - message_start) * 1000)
+        latencies.sort()
+        measured['analyze_stream'] = stage_result(time.perf_counter() - start, len(latencies), latencies)
+        latencies = None
+
+    # Kaydetme aşamaları soğuk içe aktarmayı içermez (bkz. benchmark_import_time.py)
+    if results is not None:
+        import pandas  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+
+    savers = (
+        ('save_csv', lambda: analyzer.save_to_csv(results, f"synthetic_{size}_analiz.csv")),
+        ('save_parquet', lambda: analyzer.save_to_parquet(results, f"synthetic_{size}_analiz.parquet")),
+        ('save_sqlite', lambda: analyzer.save_to_sqlite(results, f"synthetic_{size}_analiz.db")),
+        ('report', lambda: analyzer.generate_report(results))
+    )
+    for name, function in savers:
+        if name in stages or (name == 'save_sqlite' and 'report_sql' in stages):
+            with quiet:
+                start = time.perf_counter()
+                function()
+                elapsed = time.perf_counter() - start
+            if name in stages:
+                measured[name] = stage_result(elapsed, len(results))
+
+    if 'report_sql' in stages:
+        start = time.perf_counter()
+        SQLiteReportEngine(os.path.join(workdir, f"synthetic_{size}_analiz.db")).generate_report()
+        measured['report_sql'] = stage_result(time.perf_counter() - start, len(results))
+
+    return {
+        'size': size,
+        'conversations': conversations,
+        'format': output_format,
+        'stages': measured,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def git_revision():
+    """Çalışma dizininin git sürümü (yoksa None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, tolerance):
+    """Önceki sonuç dosyasına göre mesaj/sn düşüşlerini bul"""
+    with open(baseline_path, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    previous = {(entry['size'], stage): values['messages_per_second']
+                for entry in baseline['results'] for stage, values in entry['stages'].items()}
+
+    regressions = []
+    for entry in results:
+        for stage, values in entry['stages'].items():
+            old = previous.get((entry['size'], stage))
+            new = values['messages_per_second']
+            if old and new and new < old * (1 - tolerance):
+                regressions.append((entry['size'], stage, old, new))
+    return regressions
+
+
+def run_suite(sizes, messages_per_conversation=50, seed=42, output_format='ndjson', stages=None,
+              output='benchmark_results.json', baseline=None, tolerance=0.1, workdir=None):
+    stages = set(stages or STAGES)
+    results = []
+
+    with tempfile.TemporaryDirectory(dir=workdir) as directory:
+        for size in sizes:
+            conversations = max(1, size // messages_per_conversation)
+            # Her boyut yeni bir süreçte: RSS ölçümü önceki boyutlardan etkilenmez
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                entry = executor.submit(run_size, size, conversations, seed, output_format,
+                                        stages, directory).result()
+            results.append(entry)
+
+            print(f"\n{size:,} mesaj, {conversations:,} konuşma (en yüksek RSS: {entry['peak_rss_mb']} MB)")
+            print(f"  {'aşama':<22} {'süre (sn)':>10} {'mesaj/sn':>12} {'p50 ms':>9} {'p99 ms':>9}")
+            for name, values in entry['stages'].items():
+                p50 = f"{values['p50_ms']:.3f}" if 'p50_ms' in values else '-'
+                p99 = f"{values['p99_ms']:.3f}" if 'p99_ms' in values else '-'
+                print(f"  {name:<22} {values['seconds']:>10.3f} "
+                      f"{values['messages_per_second'] or 0:>12,.0f} {p50:>9} {p99:>9}")
+
+    report = {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'format': output_format
+        },
+        'results': results
+    }
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        print(f"\nSonuçlar kaydedildi: {output}")
+
+    if baseline:
+        regressions = compare(results, baseline, tolerance)
+        for size, stage, old, new in regressions:
+            print(f"GERİLEME: {size:,} mesaj / {stage}: {old:,.0f} -> {new:,.0f} mesaj/sn")
+        if not regressions:
+            print(f"Gerileme yok (tolerans: %{tolerance * 100:.0f})")
+        return report, regressions
+
+    return report, []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sentetik yükle uçtan uca performans ölçümü")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Mesaj sayıları (ör. 1000 10000 ... 10000000)")
+    parser.add_argument('--messages-per-conversation', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--format', choices=['ndjson', 'json'], default='ndjson')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=None,
+                        help="Ölçülecek aşamalar (çok büyük boyutlar için ör. generate analyze_stream)")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON sonuç dosyası")
+    parser.add_argument('--baseline', default=None, help="Karşılaştırılacak önceki sonuç dosyası")
+    parser.add_argument('--tolerance', type=float, default=0.1, help="İzin verilen düşüş oranı")
+    parser.add_argument('--workdir', default=None, help="Geçici dosyalar için dizin")
+    args = parser.parse_args()
+
+    _, regressions = run_suite(args.sizes, args.messages_per_conversation, args.seed, args.format,
+                               args.stages, args.output, args.baseline, args.tolerance, args.workdir)
+    sys.exit(1 if regressions else 0)
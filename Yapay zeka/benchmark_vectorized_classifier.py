@@ -0,0 +1,60 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import SAMPLE_MESSAGES
+
+
+def make_texts(message_count, unique, seed):
+    """Örnek mesajlardan test sütunu: unique=True ise her mesaj farklı metindir"""
+    rng = random.Random(seed)
+    texts = [rng.choice(SAMPLE_MESSAGES) for _ in range(message_count)]
+    if unique:
+        texts = [f"{text} #{index}" for index, text in enumerate(texts)]
+    return texts
+
+
+def time_scalar(analyzer, texts):
+    """Tek mesajlık yöntemlerle sınıflandırma süresi"""
+    start = time.perf_counter()
+    for text in texts:
+        prepared = analyzer.prepare_message(text)
+        analyzer.analyze_sentiment(prepared)
+        analyzer.classify_category(prepared)
+        analyzer.classify_intent(prepared)
+    return time.perf_counter() - start
+
+
+def time_vectorized(analyzer, texts):
+    """classify_series ile sınıflandırma süresi"""
+    series = pd.Series(texts, dtype=object)
+    start = time.perf_counter()
+    analyzer.classify_series(series)
+    return time.perf_counter() - start
+
+
+def run_benchmark(message_count=200000, seed=42):
+    analyzer = DugumBuketiChatAnalyzer()
+
+    # Doğruluk kontrolü: test_vectorized_classifier.py (pytest)
+    print(f"Mesaj sayısı: {message_count}")
+    print(f"{'veri':<18} {'tekil mesaj/sn':>16} {'toplu mesaj/sn':>16} {'hızlanma':>9}")
+
+    for name, unique in (('tekrarlı metinler', False), ('tekil metinler', True)):
+        texts = make_texts(message_count, unique, seed)
+        scalar_time = time_scalar(analyzer, texts)
+        vectorized_time = time_vectorized(analyzer, texts)
+        print(f"{name:<18} {message_count / scalar_time:>16,.0f} "
+              f"{message_count / vectorized_time:>16,.0f} {scalar_time / vectorized_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Toplu (vektörel) sınıflandırma ölçümü")
+    parser.add_argument('--messages', type=int, default=200000, help="Ölçülen mesaj sayısı")
+    parser.add_argument('--seed', type=int, default=42, help="Rastgele tohum")
+    args = parser.parse_args()
+
+    run_benchmark(args.messages, args.seed)
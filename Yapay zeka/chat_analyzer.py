@@ -1,19 +1,164 @@
-import pandas as pd
 import json
 import re
-import sqlite3
 from datetime import datetime
-import nltk
-from textblob import TextBlob
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.pipeline import Pipeline
-import pickle
 import os
+import csv
+import hashlib
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from itertools import islice
+from keyword_matcher import KeywordMatcher
+from sqlite_store import ChatAnalysisStore
+from report_engine import SQLiteReportEngine, ReportAccumulator
+from result_table import AnalysisResultTable
+from sentiment_backends import create_sentiment_backend
+from instrumentation import NullInstrumentation
+from turkish_text import TURKISH_LOWER
+from analysis_cache import LabelCache
+
+# Tekrarlanan etiket sütunları (sözlük kodlamalı saklanır)
+LABEL_COLUMNS = ('yanıtlanmış_mı', 'sentiment', 'kategori', 'intent')
+
+# Anahtar kelime eşleştirme modları
+MATCHING_MODES = ('substring', 'token')
+
+# analyze_many yürütücü türleri
+EXECUTOR_MODES = ('thread', 'process')
+
+# Süreç havuzu işçilerinde bir kez aktarılan analiz sistemi
+_pool_analyzer = None
+
+def _init_pool_worker(analyzer):
+    """Süreç havuzu başlatıcısı: analiz sistemi görev başına değil süreç başına bir kez aktarılır"""
+    global _pool_analyzer
+    _pool_analyzer = analyzer
+
+def _analyze_pool_task(json_data):
+    """Süreç havuzu görevi: tek konuşmayı işçinin analiz sistemiyle analiz et"""
+    return _pool_analyzer.analyze_conversation(json_data)
+
+def _freeze(value):
+    """Sözlükleri salt okunur görünüme, listeleri demete çevir (iç içe)"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+def _thaw(value):
+    """`_freeze` işleminin tersi (salt okunur görünümler seçilemez/pickle edilemez)"""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+class PreparedMessage:
+    """
+    Normalize edilmiş metni, kelime listesini, anahtar kelime skorlarını ve soru/yanıt
+    belirtilerini ilk erişimde hesaplayıp saklayan mesaj
+    text verilmezse normalize gerektiğinde normalize(message) ile yapılır; etiket önbelleğinde
+    bulunan mesajlar hiç normalize edilmez ve taranmaz.
+    """
+    __slots__ = ('message', 'source', 'sender', 'user_type',
+                 '_text', '_normalize', '_matcher', '_tokens', '_scores', '_flags')
+    
+    def __init__(self, message, text, matcher, source=None, normalize=None):
+        self.message = message
+        self.source = source
+        self.sender = source.get('sender') if source is not None else None
+        self.user_type = source.get('user_type') if source is not None else None
+        self._text = text
+        self._normalize = normalize
+        self._matcher = matcher
+        self._tokens = None
+        self._scores = None
+        self._flags = None
+    
+    @property
+    def text(self):
+        """Normalize edilmiş metin"""
+        if self._text is None:
+            self._text = self._normalize(self.message)
+        return self._text
+    
+    @property
+    def tokens(self):
+        """Normalize edilmiş metnin kelimeleri"""
+        if self._tokens is None:
+            self._tokens = self.text.split()
+        return self._tokens
+    
+    @property
+    def scores(self):
+        """Tüm sözlükler için tek geçişte hesaplanan isabet sayıları"""
+        if self._scores is None:
+            self._scores = self._matcher.count(self.text)
+        return self._scores
+    
+    @property
+    def flags(self):
+        """(soru belirtisi var mı, yanıt sayılabilir mi: yanıt belirtisi veya 5'ten uzun mesaj)"""
+        if self._flags is None:
+            scores = self.scores
+            self._flags = (scores['soru'][0] > 0, scores['yanıt'][0] > 0 or len(self.tokens) > 5)
+        return self._flags
+    
+    @flags.setter
+    def flags(self, value):
+        self._flags = tuple(value)
+
+class PreparedConversation:
+    """Mesajları ilk erişimde hazırlayıp saklayan dizi (önbellekte bulunan mesajlar hiç normalize edilmez)"""
+    __slots__ = ('_analyzer', '_messages', '_prepared')
+    
+    def __init__(self, analyzer, messages):
+        self._analyzer = analyzer
+        self._messages = messages
+        self._prepared = [None] * len(messages)
+    
+    def __len__(self):
+        return len(self._messages)
+    
+    def __getitem__(self, index):
+        prepared = self._prepared[index]
+        if prepared is None:
+            prepared = self._analyzer.prepare_message(self._messages[index])
+            self._prepared[index] = prepared
+        return prepared
 
 class DugumBuketiChatAnalyzer:
-    def __init__(self):
-        """DüğünBuketi sohbet analiz sistemi"""
+    # Oluşturulduktan sonra salt okunur hale getirilen sözlük ve listeler
+    FROZEN_ATTRIBUTES = ('categories', 'intents', 'category_keywords', 'intent_keywords',
+                         'positive_words', 'negative_words', 'question_indicators',
+                         'answer_indicators')
+    
+    def __init__(self, sentiment_backend='keyword', model=None, answer_window=None,
+                 instrumentation=None, matching='substring', label_cache=None):
+        """
+        DüğünBuketi sohbet analiz sistemi
+        sentiment_backend: 'keyword' (varsayılan), 'lexicon', 'textblob' veya hazır arka uç nesnesi
+        model: kategori/intent için eğitilmiş model dosyası veya KeywordBootstrappedClassifier;
+               verilmezse anahtar kelime sınıflandırıcısı kullanılır
+        answer_window: saniye verilirse `analyze_conversation` soruları zaman damgalarına göre,
+                       aynı konuşmada karşı taraftan bu süre içinde gelen ilk yanıtla eşleştirir;
+                       verilmezse sonraki answer_lookahead mesaja bakılır
+        instrumentation: aşama süreleri için Instrumentation; verilmezse ölçüm kapalıdır
+        matching: 'substring' (varsayılan, alt dizgi eşleştirme) veya 'token' (Türkçe küçük harf,
+                  kelime kökü ve ters dizin; bkz. turkish_text.TokenKeywordMatcher)
+        label_cache: LabelCache veya en fazla kayıt sayısı; verilirse aynı normalize metnin
+                     (sentiment, kategori, intent) etiketleri bir kez hesaplanır
+        
+        Oluşturulduktan sonra analiz sistemi değiştirilemez: sözlükler salt okunurdur ve
+        öznitelik ataması AttributeError verir. Tek bir örnek birden çok iş parçacığından
+        aynı anda kullanılabilir (bkz. `analyze_many`).
+        """
+        if matching not in MATCHING_MODES:
+            raise ValueError(f"Bilinmeyen eşleştirme modu: {matching} "
+                             f"(seçenekler: {', '.join(MATCHING_MODES)})")
+        
         self.categories = [
             'Düğün mekanı', 'Gelinlik', 'Fotoğrafçı', 'Müzik/DJ', 
             'Çiçek/Dekorasyon', 'Davetiye', 'Pasta/Catering', 
@@ -66,12 +211,127 @@ class DugumBuketiChatAnalyzer:
             'pahalı', 'kalitesiz', 'geç', 'yavaş', 'eksik'
         ]
         
+        # Soru ve yanıt belirtileri
+        self.question_indicators = ['?', 'nasıl', 'ne zaman', 'nerede', 'hangi', 'kaç', 'kim']
+        
+        self.answer_indicators = [
+            'evet', 'hayır', 'tabii', 'elbette', 'maalesef', 
+            'şöyle', 'şu şekilde', 'bilgi', 'cevap'
+        ]
+        
+        # Yanıt aranan sonraki mesaj sayısı
+        self.answer_lookahead = 2
+        
+        # Zaman pencereli yanıt eşleştirme (konuşma ve taraf dizinli)
+        self.answer_window = answer_window
+        if answer_window is not None:
+            from answer_matcher import TimeWindowAnswerMatcher
+            self.answer_matcher = TimeWindowAnswerMatcher(self, answer_window)
+        else:
+            self.answer_matcher = None
+        
+        # Tüm sözlükleri tek geçişte tarayan eşleştirici (alt dizgi deseni veya kelime kökü dizini)
+        self.matching = matching
+        keyword_groups = {
+            'kategori': self.category_keywords,
+            'intent': self.intent_keywords,
+            'sentiment': {
+                'Pozitif': self.positive_words,
+                'Negatif': self.negative_words
+            },
+            'soru': {'Soru': self.question_indicators},
+            'yanıt': {'Yanıt': self.answer_indicators}
+        }
+        if matching == 'token':
+            from turkish_text import TokenKeywordMatcher
+            self.keyword_matcher = TokenKeywordMatcher(keyword_groups)
+        else:
+            self.keyword_matcher = KeywordMatcher(keyword_groups)
+        
+        # Duygu analizi arka ucu bir kez seçilir
+        self.sentiment_backend = create_sentiment_backend(sentiment_backend, self)
+        
+        # Kategori/intent modeli (scikit-learn yalnızca model kullanılırsa yüklenir)
+        # Model farklı sözlüklerle eğitildiyse uyarı verilir
+        if isinstance(model, str):
+            from ml_classifier import KeywordBootstrappedClassifier
+            model = KeywordBootstrappedClassifier.load(model, self)
+        elif model is not None:
+            model.check_dictionaries(self)
+        self.model = model
+        
+        # Normalize metin -> etiket üçlüsü LRU önbelleği (varsayılan: kapalı)
+        if isinstance(label_cache, int):
+            label_cache = LabelCache(label_cache)
+        self.label_cache = label_cache
+        
+        # Aşama süreleri (varsayılan: kapalı, ek yük yok)
+        self.instrumentation = instrumentation or NullInstrumentation()
+        
+        # Sözlüklerden türetilen sürüm; önbellek anahtarlarına eklenir
+        self.dictionary_version = self._dictionary_version()
+        
+        # analyze_many için (tür, işçi sayısı) başına bir kez açılıp yeniden kullanılan havuzlar
+        self._executors = {}
+        self._executor_lock = threading.Lock()
+        
+        self._freeze()
+    
+    def _freeze(self):
+        """Sözlükleri salt okunur yap ve sonraki öznitelik atamalarını engelle"""
+        for name in self.FROZEN_ATTRIBUTES:
+            object.__setattr__(self, name, _freeze(getattr(self, name)))
+        object.__setattr__(self, '_frozen', True)
+    
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"Analiz sistemi oluşturulduktan sonra değiştirilemez: {name}; "
+                                 f"farklı ayarlar için yeni bir örnek oluşturun")
+        object.__setattr__(self, name, value)
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"Analiz sistemi oluşturulduktan sonra değiştirilemez: {name}")
+    
+    def __getstate__(self):
+        # Havuzlar ve kilit süreçlere aktarılmaz; işçi kopyası kendi havuzlarını açar
+        state = self.__dict__.copy()
+        state['_executors'] = {}
+        del state['_executor_lock']
+        for name in self.FROZEN_ATTRIBUTES:
+            state[name] = _thaw(state[name])
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__dict__['_executor_lock'] = threading.Lock()
+        self._freeze()
+    
+    def _dictionary_version(self):
+        """Sonucu etkileyen sözlük ve ayarların özeti"""
+        config = {
+            'category_keywords': self.category_keywords,
+            'intent_keywords': self.intent_keywords,
+            'positive_words': self.positive_words,
+            'negative_words': self.negative_words,
+            'question_indicators': self.question_indicators,
+            'answer_indicators': self.answer_indicators,
+            'answer_lookahead': self.answer_lookahead,
+            'answer_window': self.answer_window,
+            'matching': self.matching,
+            'sentiment_backend': self.sentiment_backend.name,
+            'model': self.model.fingerprint if self.model is not None else None
+        }
+        encoded = json.dumps(config, ensure_ascii=False, sort_keys=True, default=dict).encode('utf-8')
+        return hashlib.sha1(encoded).hexdigest()
+    
     def preprocess_text(self, text):
         """Metni temizle ve normalize et"""
         if not isinstance(text, str):
             return ""
         
-        # Küçük harfe çevir
+        # Küçük harfe çevir (kelime modunda Türkçe I/İ kurallarıyla)
+        if self.matching == 'token':
+            text = text.translate(TURKISH_LOWER)
         text = text.lower()
         
         # Türkçe karakterleri koru
@@ -82,161 +342,696 @@ class DugumBuketiChatAnalyzer:
         
         return text
     
-    def analyze_sentiment(self, text):
-        """Duygu analizi yap"""
-        text = self.preprocess_text(text)
+    def prepare_message(self, message):
+        """Mesajı bir kez normalize edip tüm sınıflandırıcılar için hazırla"""
+        if isinstance(message, PreparedMessage):
+            return message
         
-        # Anahtar kelime bazlı analiz
-        positive_count = sum(1 for word in self.positive_words if word in text)
-        negative_count = sum(1 for word in self.negative_words if word in text)
+        if isinstance(message, dict):
+            return PreparedMessage(message.get('message', ''), None, self.keyword_matcher,
+                                   source=message, normalize=self.preprocess_text)
         
-        if positive_count > negative_count:
-            return 'Pozitif'
-        elif negative_count > positive_count:
-            return 'Negatif'
-        else:
-            # TextBlob ile ek analiz
-            try:
-                blob = TextBlob(text)
-                polarity = blob.sentiment.polarity
-                if polarity > 0.1:
-                    return 'Pozitif'
-                elif polarity < -0.1:
-                    return 'Negatif'
-                else:
-                    return 'Nötr'
-            except:
-                return 'Nötr'
+        return PreparedMessage(message, None, self.keyword_matcher, normalize=self.preprocess_text)
+    
+    def keyword_scores(self, text):
+        """Kategori, intent ve duygu için etiket başına anahtar kelime sayıları"""
+        return self.prepare_message(text).scores
+    
+    def analyze_sentiment(self, text):
+        """Duygu analizi yap"""
+        if self.label_cache is not None:
+            return self.text_labels([text])[0][0]
+        return self.sentiment_backend.score(self.prepare_message(text))
+    
+    def analyze_sentiment_batch(self, texts):
+        """Birden fazla mesajın duygusunu arka ucun toplu yoluyla analiz et"""
+        return self.sentiment_backend.score_batch([self.prepare_message(text) for text in texts])
     
     def classify_category(self, text):
         """Kategori sınıflandırması"""
-        text = self.preprocess_text(text)
+        if self.label_cache is not None:
+            return self.text_labels([text])[0][1]
+        if self.model is not None:
+            return self.classify_labels_batch([text])[0][0]
         
-        category_scores = {}
-        for category, keywords in self.category_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            if score > 0:
-                category_scores[category] = score
-        
-        if category_scores:
-            return max(category_scores, key=category_scores.get)
-        else:
-            return 'Diğer'
+        scores = self.keyword_scores(text)
+        return self.keyword_matcher.best_label('kategori', scores['kategori'])
     
     def classify_intent(self, text):
         """Amaç (intent) sınıflandırması"""
-        text = self.preprocess_text(text)
+        if self.label_cache is not None:
+            return self.text_labels([text])[0][2]
+        if self.model is not None:
+            return self.classify_labels_batch([text])[1][0]
         
-        intent_scores = {}
-        for intent, keywords in self.intent_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            if score > 0:
-                intent_scores[intent] = score
+        scores = self.keyword_scores(text)
+        return self.keyword_matcher.best_label('intent', scores['intent'])
+    
+    def classify_labels_batch(self, texts):
+        """Mesaj listesinin kategori ve intent etiketleri; modelde parça başına tek `predict`"""
+        prepared = [self.prepare_message(text) for text in texts]
         
-        if intent_scores:
-            return max(intent_scores, key=intent_scores.get)
-        else:
-            return 'Diğer'
+        if self.model is not None:
+            return self.model.predict_batch([message.text for message in prepared])
+        
+        scores = [message.scores for message in prepared]
+        categories = [self.keyword_matcher.best_label('kategori', score['kategori']) for score in scores]
+        intents = [self.keyword_matcher.best_label('intent', score['intent']) for score in scores]
+        return categories, intents
     
-    def is_question_answered(self, conversation_history, current_message_index):
-        """Sorunun yanıtlanıp yanıtlanmadığını kontrol et"""
-        current_msg = conversation_history[current_message_index]
+    @staticmethod
+    def _label_key(message):
+        """Etiket önbelleği anahtarı: ham mesaj metni (metin değilse normalize hali, yani '')"""
+        return message.message if isinstance(message.message, str) else message.text
+    
+    def cached_flags(self, messages):
+        """
+        Belirtileri henüz hesaplanmamış hazırlanmış mesajların soru/yanıt belirtilerini etiket
+        önbelleğinden al; bulunan mesajlar normalize edilmez. Bulunan mesaj sayısını döndürür.
+        """
+        if self.label_cache is None:
+            return 0
+        
+        missing = [message for message in messages if message._flags is None]
+        if not missing:
+            return 0
+        
+        with self.instrumentation.stage('label_cache', len(missing)):
+            keys = [self._label_key(message) for message in missing]
+            found = self.label_cache.get_many(keys)
+            for key, message in zip(keys, missing):
+                entry = found.get(key)
+                if entry is not None:
+                    message.flags = entry[3:]
+        return len(found)
+    
+    def text_labels(self, texts):
+        """
+        Mesajların (sentiment, kategori, intent) üçlüleri
+        label_cache varsa önbellek normalize etmeden önce ham metinle aranır: bulunan mesajlar
+        normalize edilmez ve taranmaz, soru/yanıt belirtileri de önbellekten alınır. Partideki
+        aynı metinler bir kez analiz edilir; sonuçlar önbelleğe eklenir.
+        """
+        prepared = [self.prepare_message(text) for text in texts]
+        stage = self.instrumentation.stage
+        
+        found = {}
+        missing = prepared
+        if self.label_cache is not None:
+            with stage('label_cache', len(prepared)):
+                keys = [self._label_key(message) for message in prepared]
+                found = self.label_cache.get_many(keys)
+                unique = {}
+                for key, message in zip(keys, prepared):
+                    if key not in found:
+                        unique.setdefault(key, message)
+                missing = list(unique.values())
+        
+        with stage('preprocess', len(missing)):
+            for message in missing:
+                message.text
+        
+        # Soru tespiti için her mesaj zaten taranır; tarama burada topluca yapılır
+        with stage('keyword_scan', len(missing)):
+            for message in missing:
+                message.flags
+        
+        with stage('sentiment', len(missing)):
+            sentiments = self.sentiment_backend.score_batch(missing)
+        with stage('classification', len(missing)):
+            categories, intents = self.classify_labels_batch(missing)
+        computed = list(zip(sentiments, categories, intents))
+        
+        if self.label_cache is None:
+            return computed
+        
+        new_entries = {self._label_key(message): labels + message.flags
+                       for message, labels in zip(missing, computed)}
+        self.label_cache.put_many(new_entries.items())
+        found.update(new_entries)
+        
+        results = []
+        for key, message in zip(keys, prepared):
+            entry = found[key]
+            if message._flags is None:
+                message.flags = entry[3:]
+            results.append(entry[:3])
+        return results
+    
+    def preprocess_series(self, texts):
+        """`preprocess_text` işleminin pandas `str` yöntemleriyle toplu karşılığı"""
+        import pandas as pd
+        
+        # object türü Python'un lower/re davranışını korur (pyarrow dizgileri 'İ'yi farklı küçültür)
+        texts = pd.Series(texts, dtype=object)
+        texts = texts.where(texts.map(lambda value: isinstance(value, str)), '')
+        if self.matching == 'token':
+            texts = texts.str.translate(TURKISH_LOWER)
+        
+        # Türkçe harfler zaten \w kapsamında: noktalama temizliği ve boşluk birleştirme,
+        # kelime dışı karakter dizilerini tek boşluğa indiren tek bir geçiştir
+        return texts.str.lower().str.replace(r'\W+', ' ', regex=True).str.strip()
+    
+    def classify_series(self, texts, chunk_size=100000):
+        """
+        Mesaj metni sütununu (Series, dizi veya liste) toplu olarak sınıflandır
+        Her farklı metin bir kez normalize edilir ve taranır; anahtar kelime isabetleri
+        metin x kelime matrisinde toplanır, etiketler NumPy argmax ile seçilir.
+        Sonuç, girdinin indeksine sahip sentiment/kategori/intent DataFrame'idir.
+        """
+        import numpy as np
+        import pandas as pd
         
-        # Soru işaretleri ve soru kelimeleri kontrol et
-        question_indicators = ['?', 'nasıl', 'ne zaman', 'nerede', 'hangi', 'kaç', 'kim']
+        index = texts.index if isinstance(texts, pd.Series) else None
+        codes, uniques = pd.factorize(pd.Series(texts, dtype=object), use_na_sentinel=False)
         
-        text = self.preprocess_text(current_msg.get('message', ''))
-        is_question = any(indicator in text for indicator in question_indicators)
+        sentiments = []
+        categories = []
+        intents = []
+        for start in range(0, len(uniques), chunk_size):
+            originals = pd.Series(uniques[start:start + chunk_size], dtype=object)
+            normalized = self.preprocess_series(originals).tolist()
+            counts = self.keyword_matcher.count_matrix(normalized)
+            
+            if hasattr(self.sentiment_backend, 'score_counts'):
+                sentiments.extend(self.sentiment_backend.score_counts(counts['sentiment'], normalized))
+            else:
+                sentiments.extend(self.sentiment_backend.score_batch([
+                    PreparedMessage(original, text, self.keyword_matcher)
+                    for original, text in zip(originals, normalized)
+                ]))
+            
+            if self.model is not None:
+                chunk_categories, chunk_intents = self.model.predict_batch(normalized)
+            else:
+                chunk_categories = self.keyword_matcher.best_labels('kategori', counts['kategori'])
+                chunk_intents = self.keyword_matcher.best_labels('intent', counts['intent'])
+            categories.extend(chunk_categories)
+            intents.extend(chunk_intents)
+        
+        # Farklı metinlerin etiketleri tüm satırlara kodlar üzerinden yayılır
+        return pd.DataFrame({
+            'sentiment': np.array(sentiments, dtype=object)[codes],
+            'kategori': np.array(categories, dtype=object)[codes],
+            'intent': np.array(intents, dtype=object)[codes]
+        }, index=index)
+    
+    def is_question(self, message):
+        """Mesaj soru belirtisi içeriyor mu"""
+        return self.prepare_message(message).flags[0]
+    
+    def is_answer_to(self, question, reply):
+        """Yanıt mesajı, sorunun yanıtı sayılır mı"""
+        question = self.prepare_message(question)
+        reply = self.prepare_message(reply)
+        
+        # Farklı kişiden gelen mesaj mı kontrol et
+        if (reply.sender == question.sender and
+                reply.user_type == question.user_type):
+            return False
+        
+        # Yanıt belirten kelimeler veya mesaj uzunluğu (detaylı yanıt)
+        return reply.flags[1]
+    
+    def is_question_answered(self, conversation_history, current_message_index):
+        """Sorunun yanıtlanıp yanıtlanmadığını kontrol et"""
+        current_msg = self.prepare_message(conversation_history[current_message_index])
         
-        if not is_question:
+        if not self.is_question(current_msg):
             return 'Hayır'  # Soru değilse yanıtlanma durumu önemli değil
         
         # Sonraki mesajlarda yanıt arayalım
-        for i in range(current_message_index + 1, min(current_message_index + 3, len(conversation_history))):
-            next_msg = conversation_history[i]
-            
-            # Farklı kişiden gelen mesaj mı kontrol et
-            if (next_msg.get('sender') != current_msg.get('sender') or 
-                next_msg.get('user_type') != current_msg.get('user_type')):
-                
-                next_text = self.preprocess_text(next_msg.get('message', ''))
-                
-                # Yanıt belirten kelimeler
-                answer_indicators = [
-                    'evet', 'hayır', 'tabii', 'elbette', 'maalesef', 
-                    'şöyle', 'şu şekilde', 'bilgi', 'cevap'
-                ]
-                
-                if any(indicator in next_text for indicator in answer_indicators):
-                    return 'Evet'
-                
-                # Mesaj uzunluğu kontrolü (detaylı yanıt)
-                if len(next_text.split()) > 5:
-                    return 'Evet'
+        last_index = min(current_message_index + self.answer_lookahead + 1, len(conversation_history))
+        for i in range(current_message_index + 1, last_index):
+            if self.is_answer_to(current_msg, conversation_history[i]):
+                return 'Evet'
         
         return 'Hayır'
     
-    def analyze_conversation(self, json_data):
-        """JSON formatındaki konuşmayı analiz et"""
+    def _result_row(self, message, message_text, position, labels, conversation_id=None):
+        """
+        Analiz sonucundan çıktı satırını oluştur
+        conversation_id: verilirse mesajın kendi conversation_id alanı yerine kullanılır
+        """
+        answered, sentiment, category, intent = labels
+        row = {
+            'message_id': message.get('id', position),
+            'timestamp': message.get('timestamp', datetime.now().isoformat()),
+            'sender': message.get('sender', 'unknown'),
+            'message': message_text,
+            'yanıtlanmış_mı': answered,
+            'sentiment': sentiment,
+            'kategori': category,
+            'intent': intent
+        }
+        
+        # Birden çok konuşma içeren dışa aktarımlarda message_id konuşma başına yeniden başlar;
+        # mesajın kendi conversation_id'si satırla birlikte taşınır (SQLite anahtarının parçası)
+        if conversation_id is None:
+            conversation_id = message.get('conversation_id')
+        if conversation_id is not None:
+            return {'conversation_id': conversation_id, **row}
+        return row
+    
+    def analyze_labels(self, messages, index, sentiment=None, category=None, intent=None,
+                       answered=None):
+        """
+        Mesaj için (yanıtlanmış_mı, sentiment, kategori, intent) etiketleri
+        sentiment/category/intent/answered: toplu olarak önceden hesaplanmışsa yeniden hesaplanmaz
+        """
+        prepared = self.prepare_message(messages[index])
+        # Önbellek soru tespitinden önce aranır: bulunan mesaj taranmaz
+        if self.label_cache is not None and None in (sentiment, category, intent):
+            cached = self.text_labels([prepared])[0]
+            sentiment = cached[0] if sentiment is None else sentiment
+            category = cached[1] if category is None else category
+            intent = cached[2] if intent is None else intent
+        if answered is None:
+            answered = self.is_question_answered(messages, index)
+        if sentiment is None:
+            sentiment = self.analyze_sentiment(prepared)
+        if category is None:
+            category = self.classify_category(prepared)
+        if intent is None:
+            intent = self.classify_intent(prepared)
+        
+        return (
+            answered,
+            sentiment,
+            category,
+            intent
+        )
+    
+    def analyze_message(self, messages, index, position=None):
+        """Mesaj listesindeki tek bir mesajı tüm sınıflandırıcılarla analiz et"""
+        prepared = self.prepare_message(messages[index])
+        message = prepared.source if prepared.source is not None else {}
+        
+        # position: mesajın konuşmadaki sırası (id yoksa message_id olarak kullanılır)
+        if position is None:
+            position = index
+        
+        return self._result_row(message, prepared.message, position,
+                                self.analyze_labels(messages, index))
+    
+    def cache_key(self, messages, index):
+        """Mesaj, ileri bakış komşuları ve sözlük sürümünden önbellek anahtarı üret"""
+        digest = hashlib.blake2b(self.dictionary_version.encode('utf-8'), digest_size=16)
+        
+        for message in messages[index:index + self.answer_lookahead + 1]:
+            if not isinstance(message, dict):
+                message = {'message': message}
+            for field in ('message', 'sender', 'user_type'):
+                digest.update(b'\x1f' + str(message.get(field)).encode('utf-8'))
+            digest.update(b'\x1e')
+        
+        return digest.digest()
+    
+    def analyze_conversation(self, json_data, cache=None, table=None, conversation_id=None):
+        """
+        JSON formatındaki konuşmayı analiz et
+        cache: AnalysisCache verilirse daha önce analiz edilmiş mesajlar atlanır.
+        table: AnalysisResultTable verilirse satırlar sözlük yerine tabloya eklenir ve tablo
+               döndürülür (bkz. `new_result_table`).
+        conversation_id: satırların konuşma kimliği; verilmezse mesajın kendi conversation_id
+                         alanı, o da yoksa JSON'daki conversation_id
+        """
         results = []
+        stage = self.instrumentation.stage
         
         if isinstance(json_data, str):
-            conversation = json.loads(json_data)
+            with stage('json_parse'):
+                conversation = json.loads(json_data)
         else:
             conversation = json_data
         
         # Konuşma geçmişi listesi olarak al
+        # Satırların kimliği: verilen conversation_id, yoksa mesajın kendi alanı,
+        # o da yoksa belgenin conversation_id'si
+        explicit_conversation_id = conversation_id is not None
         if isinstance(conversation, dict) and 'messages' in conversation:
             messages = conversation['messages']
+            if conversation_id is None:
+                conversation_id = conversation.get('conversation_id')
         elif isinstance(conversation, list):
             messages = conversation
         else:
             messages = [conversation]
         
-        for i, message in enumerate(messages):
-            message_text = message.get('message', '')
-            
-            if not message_text.strip():
-                continue
+        # Her mesaj en fazla bir kez, yalnızca gerektiğinde normalize edilir
+        prepared_messages = PreparedConversation(self, messages)
+        indexes = [i for i, message in enumerate(messages) if message.get('message', '').strip()]
+        
+        if cache is None:
+            keys = {}
+            cached = {}
+            pending = indexes
+        else:
+            with stage('cache_lookup', len(indexes)):
+                keys = {i: self.cache_key(messages, i) for i in indexes}
+                cached = cache.get_many(set(keys.values()))
+                pending = [i for i in indexes if keys[i] not in cached]
+        
+        # Duygu, kategori ve intent önbellekte olmayan mesajlar için tek partide hesaplanır;
+        # normalize ve tarama yalnızca etiket önbelleğinde bulunmayan metinler için yapılır
+        pending_messages = [prepared_messages[i] for i in pending]
+        pending_labels = dict(zip(pending, self.text_labels(pending_messages)))
+        sentiments = {i: labels[0] for i, labels in pending_labels.items()}
+        categories = {i: labels[1] for i, labels in pending_labels.items()}
+        intents = {i: labels[2] for i, labels in pending_labels.items()}
+        new_entries = {}
+        
+        with stage('answer_matching', len(indexes)):
+            # Zaman pencereli eşleştirmede yanıt durumu tüm konuşmaya bağlıdır; önbellekten alınmaz.
+            # Sonuç önbelleğinden gelen mesajların belirtileri etiket önbelleğinden okunur
+            if self.answer_matcher is not None:
+                self.cached_flags([prepared_messages[i] for i in indexes if i not in pending_labels])
+                answered = self.answer_matcher.answered_labels(prepared_messages)
+            else:
+                answered = None
             
-            analysis = {
-                'message_id': message.get('id', i),
-                'timestamp': message.get('timestamp', datetime.now().isoformat()),
-                'sender': message.get('sender', 'unknown'),
-                'message': message_text,
-                'yanıtlanmış_mı': self.is_question_answered(messages, i),
-                'sentiment': self.analyze_sentiment(message_text),
-                'kategori': self.classify_category(message_text),
-                'intent': self.classify_intent(message_text)
-            }
+            for i in indexes:
+                labels = cached.get(keys.get(i))
+                if labels is None:
+                    labels = self.analyze_labels(prepared_messages, i, sentiments[i],
+                                                 categories[i], intents[i],
+                                                 answered[i] if answered is not None else None)
+                    if cache is not None:
+                        new_entries[keys[i]] = labels
+                elif answered is not None:
+                    labels = (answered[i], *labels[1:])
+                
+                row_conversation_id = (conversation_id if explicit_conversation_id else
+                                       messages[i].get('conversation_id', conversation_id))
+                if table is not None:
+                    table.append(messages[i], messages[i].get('message', ''), i, labels,
+                                 row_conversation_id)
+                else:
+                    results.append(self._result_row(messages[i], messages[i].get('message', ''),
+                                                    i, labels, row_conversation_id))
+        
+        if cache is not None:
+            with stage('cache_store', len(new_entries)):
+                cache.put_many(new_entries.items())
+        return table if table is not None else results
+    
+    def _executor(self, executor, workers):
+        """(tür, işçi sayısı) için havuzu döndür; ilk çağrıda açılır, sonraki çağrılarda paylaşılır"""
+        with self._executor_lock:
+            pool = self._executors.get((executor, workers))
+            if pool is None:
+                if executor == 'process':
+                    from concurrent.futures import ProcessPoolExecutor
+                    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker,
+                                               initargs=(self,))
+                else:
+                    from concurrent.futures import ThreadPoolExecutor
+                    pool = ThreadPoolExecutor(max_workers=workers,
+                                              thread_name_prefix='dugum-buketi-analiz')
+                self._executors[(executor, workers)] = pool
+            return pool
+    
+    def analyze_many(self, conversations, workers=None, executor='thread'):
+        """
+        Birden çok konuşmayı havuzda analiz et; sonuçlar girdi sırasıyla liste olarak döner
+        conversations: `analyze_conversation`'ın kabul ettiği konuşmalar (mesaj listesi,
+                       {'messages': [...]} sözlüğü veya JSON metni)
+        workers: işçi sayısı (varsayılan: çekirdek sayısı); 1 ise havuz açılmaz
+        executor: 'thread' (paylaşılan örnek, ek süreç yok) veya 'process' (analiz sistemi
+                  her işçi sürecine bir kez aktarılır; etiket önbelleği ve aşama süreleri
+                  süreç başınadır)
+        Havuzlar çağrılar arasında yeniden kullanılır; `close` ile kapatılır.
+        """
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Bilinmeyen yürütücü: {executor} "
+                             f"(seçenekler: {', '.join(EXECUTOR_MODES)})")
+        
+        conversations = list(conversations)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(conversations) <= 1:
+            return [self.analyze_conversation(conversation) for conversation in conversations]
+        
+        pool = self._executor(executor, workers)
+        with self.instrumentation.stage('analyze_many', len(conversations)):
+            if executor == 'process':
+                # map, görev sırasını korur; parçalar işçiler arasında dengelenir
+                chunksize = max(1, len(conversations) // (workers * 4))
+                return list(pool.map(_analyze_pool_task, conversations, chunksize=chunksize))
+            return list(pool.map(self.analyze_conversation, conversations))
+    
+    def close(self):
+        """`analyze_many` havuzlarını kapat"""
+        with self._executor_lock:
+            pools = list(self._executors.values())
+            self._executors.clear()
+        for pool in pools:
+            pool.shutdown()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def new_result_table(self):
+        """Kategori ve intent kodları bu analiz sisteminin listelerine eşlenen boş sonuç tablosu"""
+        return AnalysisResultTable.for_analyzer(self)
+    
+    def analyze_stream(self, messages):
+        """
+        Mesaj akışını sınırlı bir ileri bakış penceresiyle analiz et ve satırları üret
+        answer_window verilmişse yanıt durumu zaman pencereli eşleştirmeyle belirlenir; sorular
+        yanıt penceresi dolana kadar tamponda bekler (bkz. `TimeWindowAnswerMatcher.stream_labels`)
+        Ölçüm açıksa satır üretme süresi (okuma dahil, yazma hariç) 'analyze_stream' aşamasıdır.
+        """
+        return self.instrumentation.iterate('analyze_stream', self._analyze_stream(messages))
+    
+    def _analyze_stream(self, messages):
+        if self.answer_matcher is not None:
+            for position, prepared, answered in self.answer_matcher.stream_labels(messages):
+                if prepared.message.strip():
+                    yield self._result_row(prepared.source, prepared.message, position,
+                                           self.analyze_labels([prepared], 0, answered=answered))
+            return
+        
+        window = deque()
+        position = 0
+        
+        for message in messages:
+            window.append(self.prepare_message(message))
             
-            results.append(analysis)
+            # Pencerenin başındaki mesajın tüm yanıt adayları geldi
+            if len(window) > self.answer_lookahead:
+                if window[0].message.strip():
+                    yield self.analyze_message(window, 0, position)
+                window.popleft()
+                position += 1
         
-        return results
+        while window:
+            if window[0].message.strip():
+                yield self.analyze_message(window, 0, position)
+            window.popleft()
+            position += 1
     
     def save_to_csv(self, results, filename='dugum_buketi_analiz.csv'):
         """Sonuçları CSV dosyasına kaydet"""
-        df = pd.DataFrame(results)
+        stage = self.instrumentation.stage
+        
+        with stage('dataframe_build') as build:
+            import pandas as pd
+            if isinstance(results, AnalysisResultTable):
+                df = results.to_dataframe()
+            else:
+                df = pd.DataFrame(results)
+            build.items = len(df)
+        
+        filepath = os.path.join(os.getcwd(), filename)
+        with stage('csv_write', len(df)):
+            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        print(f"Sonuçlar CSV dosyasına kaydedildi: {filepath}")
+        return filepath
+    
+    def save_stream_to_csv(self, rows, filename='dugum_buketi_analiz.csv'):
+        """Analiz satırlarını geldikçe CSV dosyasına yaz (tüm sonuçları bellekte tutmadan)"""
         filepath = os.path.join(os.getcwd(), filename)
-        df.to_csv(filepath, index=False, encoding='utf-8-sig')
+        
+        # Akışta analiz ve yazma iç içedir; yalnızca yazma süresi ölçülür (analiz: 'analyze_stream')
+        seconds = 0.0
+        count = 0
+        with open(filepath, 'w', newline='', encoding='utf-8-sig') as file:
+            writer = None
+            for row in rows:
+                start = time.perf_counter()
+                if writer is None:
+                    writer = csv.DictWriter(file, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                count += 1
+                seconds += time.perf_counter() - start
+        self.instrumentation.record('csv_stream', seconds, count)
+        
         print(f"Sonuçlar CSV dosyasına kaydedildi: {filepath}")
         return filepath
     
-    def save_to_sqlite(self, results, db_name='dugum_buketi_analiz.db'):
-        """Sonuçları SQLite veritabanına kaydet"""
+    def save_to_parquet(self, results, filename='dugum_buketi_analiz.parquet', row_group_size=100000):
+        """
+        Sonuçları sütunlu Parquet dosyasına yaz
+        Etiket sütunları sözlük kodlamalı (kategorik), diğer sütunlar (message_id dahil) metin
+        olarak saklanır; satırlar row_group_size'lık gruplar halinde yazıldığından akış
+        halindeki sonuçlar da bellekte biriktirilmez.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        filepath = os.path.join(os.getcwd(), filename)
+        if isinstance(results, AnalysisResultTable):
+            # Kodlar doğrudan Arrow sözlük indekslerine dönüşür; satır satır dönüştürme yok
+            with self.instrumentation.stage('parquet_write', len(results)):
+                pq.write_table(results.to_arrow(LABEL_COLUMNS), filepath,
+                               row_group_size=row_group_size, compression='zstd')
+            print(f"Sonuçlar Parquet dosyasına kaydedildi: {filepath}")
+            return filepath
+        
+        rows = iter(results)
+        writer = None
+        written = 0
+        
+        # Satırlar akıştan geliyorsa üretim süresi ölçülmez; yalnızca dönüştürme ve yazma
+        seconds = 0.0
+        try:
+            while True:
+                batch = list(islice(rows, row_group_size))
+                if not batch:
+                    break
+                start = time.perf_counter()
+                
+                if writer is None:
+                    columns = list(batch[0])
+                    schema = pa.schema([
+                        (column, pa.dictionary(pa.int32(), pa.string())
+                         if column in LABEL_COLUMNS else pa.string())
+                        for column in columns
+                    ])
+                    writer = pq.ParquetWriter(filepath, schema, compression='zstd')
+                
+                arrays = []
+                for column in columns:
+                    values = [row.get(column) for row in batch]
+                    values = [None if value is None else str(value) for value in values]
+                    array = pa.array(values, type=pa.string())
+                    if column in LABEL_COLUMNS:
+                        array = array.dictionary_encode()
+                    arrays.append(array)
+                
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema),
+                                   row_group_size=row_group_size)
+                written += len(batch)
+                seconds += time.perf_counter() - start
+        finally:
+            if writer is not None:
+                start = time.perf_counter()
+                writer.close()
+                seconds += time.perf_counter() - start
+            self.instrumentation.record('parquet_write', seconds, written)
+        
+        if writer is None:
+            # Boş sonuç: yalnızca şemayı içeren dosya
+            pq.write_table(pa.table({column: pa.array([], type=pa.string())
+                                     for column in LABEL_COLUMNS}), filepath)
+        
+        print(f"Sonuçlar Parquet dosyasına kaydedildi: {filepath}")
+        return filepath
+    
+    def save_to_sqlite(self, results, db_name=None, conversation_id=None, normalized=False):
+        """
+        Sonuçları SQLite veritabanına ekle
+        Var olan (conversation_id, message_id) satırları tekrar yazılmaz; yalnızca yeni
+        veya etiketi değişen mesajlar işlem başına toplu olarak kaydedilir.
+        normalized: True ise konuşma/mesaj/etiket tablolarından oluşan normalize şemaya
+                    (NormalizedChatStore) yazılır; varsayılan dosya düz tablonunkinden ayrıdır.
+                    İki şema aynı dosyada bulunamaz (ValueError)
+        """
+        if db_name is None:
+            db_name = 'dugum_buketi_normalize.db' if normalized else 'dugum_buketi_analiz.db'
         filepath = os.path.join(os.getcwd(), db_name)
-        conn = sqlite3.connect(filepath)
         
-        df = pd.DataFrame(results)
-        df.to_sql('chat_analysis', conn, if_exists='replace', index=False)
+        items = len(results) if hasattr(results, '__len__') else 0
+        if normalized:
+            from normalized_store import NormalizedChatStore
+            
+            with self.instrumentation.stage('sqlite_write', items), NormalizedChatStore(filepath) as store:
+                changed = store.write_results(results, conversation_id=conversation_id)
+            print(f"Sonuçlar SQLite veritabanına kaydedildi: {filepath} ({changed} satır)")
+            return filepath
+        
+        with self.instrumentation.stage('sqlite_write', items), ChatAnalysisStore(filepath) as store:
+            if isinstance(results, AnalysisResultTable):
+                changed = store.write_table(results, conversation_id=conversation_id)
+            else:
+                changed = store.write(results, conversation_id=conversation_id)
         
-        conn.close()
-        print(f"Sonuçlar SQLite veritabanına kaydedildi: {filepath}")
+        print(f"Sonuçlar SQLite veritabanına kaydedildi: {filepath} ({changed} yeni/güncellenen satır)")
         return filepath
     
+    def analyze_pending(self, store, page_size=500, cache=None):
+        """
+        NormalizedChatStore'daki analiz bekleyen konuşmaları sayfa sayfa analiz edip sonuçları
+        aynı veritabanına yaz; yazılan satır sayısını döndürür.
+        Bellekte aynı anda yalnızca bir sayfa (page_size konuşma) tutulur.
+        """
+        written = 0
+        for page in store.iter_pending(page_size):
+            table = self.new_result_table()
+            for conversation_id, messages in page:
+                self.analyze_conversation(messages, cache=cache, table=table,
+                                          conversation_id=conversation_id)
+            with self.instrumentation.stage('sqlite_write', len(table)):
+                written += store.write_results(table)
+        return written
+    
+    def cluster_unanswered_questions(self, db_name='dugum_buketi_analiz.db', **options):
+        """
+        Veritabanındaki yanıtlanmamış soruları MinHash/LSH ile benzerliğe göre kümele;
+        küme özetleri aynı veritabanının unanswered_question_clusters tablosuna yazılır.
+        options: QuestionClusterer/MinHashLSH ayarları (threshold, num_perm, bands, ...)
+        """
+        from question_clusters import QuestionClusterer
+        
+        filepath = os.path.join(os.getcwd(), db_name)
+        with self.instrumentation.stage('question_clustering'):
+            clusters = QuestionClusterer(self, **options).cluster_database(filepath)
+        print(f"Yanıtlanmamış sorular {len(clusters)} kümede toplandı: {filepath}")
+        return clusters
+    
     def generate_report(self, results):
-        """Analiz raporu oluştur"""
-        df = pd.DataFrame(results)
+        """
+        Analiz raporu oluştur
+        results: sonuç listesi, AnalysisResultTable, DataFrame, Parquet dosya yolu (yalnızca etiket sütunları okunur)
+                 veya SQLite veritabanı yolu (sayımlar GROUP BY sorgularıyla yapılır)
+        """
+        with self.instrumentation.stage('report') as report_stage:
+            report = self._build_report(results)
+            report_stage.items = report['toplam_mesaj']
+        return report
+    
+    def _build_report(self, results):
+        """generate_report için sayımları hesapla"""
+        if isinstance(results, str) and results.endswith('.db'):
+            return SQLiteReportEngine(results).generate_report()
+        
+        if isinstance(results, AnalysisResultTable):
+            accumulator = ReportAccumulator()
+            accumulator.add_table(results)
+            return accumulator.generate_report()
+        
+        import pandas as pd
+        
+        if isinstance(results, str) and results.endswith('.parquet'):
+            df = pd.read_parquet(results, columns=list(LABEL_COLUMNS))
+        elif isinstance(results, pd.DataFrame):
+            df = results
+        else:
+            df = pd.DataFrame(results)
         
         report = {
             'toplam_mesaj': len(df),
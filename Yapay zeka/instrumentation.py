@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+
+
+class _Stage:
+    """Tek aşama ölçümü; `items` çıkışta bilinen mesaj sayısıyla güncellenebilir"""
+    __slots__ = ('_owner', '_name', '_start', 'items')
+
+    def __init__(self, owner, name, items):
+        self._owner = owner
+        self._name = name
+        self.items = items
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._owner.record(self._name, time.perf_counter() - self._start, self.items)
+        return False
+
+
+class _NullStage:
+    """Kapalı moddaki paylaşılan aşama: hiçbir şey ölçmez"""
+    __slots__ = ('items',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+class NullInstrumentation:
+    """Varsayılan, kapalı ölçüm katmanı (aşama başına tek yöntem çağrısı)"""
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name, items=0):
+        return self._stage
+
+    def record(self, name, seconds, items=0):
+        pass
+
+    def iterate(self, name, iterable):
+        return iterable
+
+
+class Instrumentation:
+    # Prometheus metrik adlarının öneki
+    PREFIX = 'dugum_buketi'
+
+    enabled = True
+
+    def __init__(self):
+        """
+        Analiz hattının aşamaları için süre, çağrı ve mesaj sayısı toplayıcısı
+        Kullanım: `with instrumentation.stage('preprocess', items=len(messages)): ...`
+        """
+        # aşama adı -> [toplam süre (sn), çağrı sayısı, mesaj sayısı]
+        self.stages = {}
+        # Aynı analiz sistemini kullanan iş parçacıkları aynı sayaçları günceller
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        return {'stages': self.stages}
+
+    def __setstate__(self, state):
+        self.stages = state['stages']
+        self._lock = threading.Lock()
+
+    def stage(self, name, items=0):
+        """Aşamayı ölçen bağlam yöneticisi"""
+        return _Stage(self, name, items)
+
+    def record(self, name, seconds, items=0):
+        """Ölçülmüş bir süreyi aşamaya ekle"""
+        with self._lock:
+            totals = self.stages.get(name)
+            if totals is None:
+                totals = self.stages[name] = [0.0, 0, 0]
+            totals[0] += seconds
+            totals[1] += 1
+            totals[2] += items or 0
+
+    def iterate(self, name, iterable):
+        """
+        Yineleyicinin öğe üretirken geçirdiği süreyi aşama olarak ölç
+        Tüketicinin öğeler arasındaki süresi dahil edilmez; yineleyici bitince veya
+        kapatılınca üretilen öğe sayısıyla tek çağrı olarak kaydedilir.
+        """
+        iterator = iter(iterable)
+        seconds = 0.0
+        items = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    seconds += time.perf_counter() - start
+                    return
+                seconds += time.perf_counter() - start
+                items += 1
+                yield item
+        finally:
+            self.record(name, seconds, items)
+
+    def snapshot(self):
+        """Sayaçların tutarlı bir kopyası {aşama: (süre, çağrı, mesaj)}"""
+        with self._lock:
+            return {name: tuple(totals) for name, totals in self.stages.items()}
+
+    def reset(self):
+        with self._lock:
+            self.stages.clear()
+
+    def to_dict(self):
+        """Aşama başına süre, çağrı, mesaj ve mesaj/sn (en uzun süren aşama önce)"""
+        report = {}
+        for name, (seconds, calls, items) in sorted(self.snapshot().items(), key=lambda item: -item[1][0]):
+            report[name] = {
+                'seconds': round(seconds, 6),
+                'calls': calls,
+                'messages': items,
+                'messages_per_second': round(items / seconds, 1) if seconds > 0 and items else None
+            }
+        return report
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def to_prometheus(self):
+        """Prometheus metin biçimi (aşama etiketli sayaçlar)"""
+        metrics = (
+            ('stage_seconds_total', 'Aşamada geçen toplam süre (sn)', 0),
+            ('stage_calls_total', 'Aşama çağrı sayısı', 1),
+            ('stage_messages_total', 'Aşamada işlenen mesaj sayısı', 2)
+        )
+
+        stages = self.snapshot()
+        lines = []
+        for metric, description, field in metrics:
+            name = f"{self.PREFIX}_{metric}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} counter")
+            for stage, totals in sorted(stages.items()):
+                stage = stage.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{name}{{stage="{stage}"}} {totals[field]}')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, path):
+        """Ölçümleri dosyaya yaz: .prom/.txt uzantısı Prometheus, diğerleri JSON"""
+        content = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        print(f"Aşama ölçümleri kaydedildi: {path}")
+        return path
+
+    def print_summary(self):
+        """Aşama tablosunu yazdır"""
+        print(f"{'aşama':<22} {'süre (sn)':>10} {'çağrı':>7} {'mesaj':>9} {'mesaj/sn':>12}")
+        for name, values in self.to_dict().items():
+            rate = f"{values['messages_per_second']:,.0f}" if values['messages_per_second'] else '-'
+            print(f"{name:<22} {values['seconds']:>10.4f} {values['calls']:>7} "
+                  f"{values['messages']:>9} {rate:>12}")
@@ -0,0 +1,184 @@
+import re
+
+
+class KeywordMatcher:
+    def __init__(self, groups):
+        """
+        groups: {grup_adı: {etiket: [anahtar kelimeler]}}
+
+        Tüm anahtar kelimeler tek bir derlenmiş düzenli ifadede birleştirilir;
+        metin üzerinden tek geçişte her grup için etiket başına isabet sayısı
+        çıkarılır. Sayım, eski `keyword in text` döngüleriyle birebir aynıdır:
+        her anahtar kelime metinde geçiyorsa bir kez sayılır.
+        """
+        self.labels = {}
+        self._keyword_labels = {}
+        self._label_weights = None
+
+        for group, label_keywords in groups.items():
+            labels = tuple(label_keywords)
+            self.labels[group] = labels
+            for label_index, label in enumerate(labels):
+                for keyword in label_keywords[label]:
+                    self._keyword_labels.setdefault(keyword, []).append((group, label_index))
+
+        keywords = [keyword for keyword in self._keyword_labels if keyword]
+        # Boş anahtar kelime (`'' in text`) her metinde eşleşir
+        self._always = {''} if '' in self._keyword_labels else set()
+
+        # Aynı konumda başlayan kısa anahtar kelimeler, en uzun eşleşmenin önekidir
+        self._prefixes = {
+            keyword: tuple(other for other in keywords if keyword.startswith(other))
+            for keyword in keywords
+        }
+
+        if keywords:
+            # Her konumda en uzun anahtar kelimeyi bulan, örtüşmelere izin veren desen
+            self._pattern = re.compile('(?=(' + self._trie_pattern(keywords) + '))')
+        else:
+            self._pattern = None
+
+    @staticmethod
+    def _trie_pattern(keywords):
+        """Anahtar kelimelerden ortak önekleri paylaşan bir desen üret"""
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[''] = True
+
+        def build(node):
+            branches = [re.escape(char) + build(child)
+                        for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+            if '' in node:
+                # Burada biten bir kelime var; daha uzun devamı açgözlü olarak önce denenir
+                body = '(?:' + body + ')?'
+            return body
+
+        return build(trie)
+
+    def iter_matches(self, text):
+        """Her başlangıç konumundaki en uzun anahtar kelimeyi (konum, kelime) olarak üret"""
+        if self._pattern is None:
+            return
+        for match in self._pattern.finditer(text):
+            yield match.start(), match.group(1)
+
+    def find_keywords(self, text):
+        """Metinde geçen farklı anahtar kelimelerin kümesini döndür"""
+        found = set(self._always)
+        if self._pattern is None or not text:
+            return found
+
+        prefixes = self._prefixes
+        for longest in set(self._pattern.findall(text)):
+            found.update(prefixes[longest])
+        return found
+
+    def count(self, text):
+        """Her grup için etiket sırasına göre isabet sayılarını döndür"""
+        scores = {group: [0] * len(labels) for group, labels in self.labels.items()}
+
+        keyword_labels = self._keyword_labels
+        for keyword in self.find_keywords(text):
+            for group, label_index in keyword_labels[keyword]:
+                scores[group][label_index] += 1
+
+        return scores
+
+    def best_label(self, group, counts, default='Diğer'):
+        """En yüksek skorlu etiketi seç; eşitlikte sözlükteki ilk etiket kazanır"""
+        best_index = None
+        best_score = 0
+        for label_index, score in enumerate(counts):
+            if score > best_score:
+                best_index = label_index
+                best_score = score
+
+        if best_index is None:
+            return default
+        return self.labels[group][best_index]
+
+    def _weights(self):
+        """Anahtar kelime sütunları, önek kapanışı ve grup başına kelime x etiket ağırlıkları"""
+        if self._label_weights is None:
+            import numpy as np
+
+            keywords = tuple(self._keyword_labels)
+            columns = {keyword: column for column, keyword in enumerate(keywords)}
+
+            # Her en uzun eşleşme için sayılan önek sütunları (düz dizi + başlangıçlar)
+            prefix_columns = [[columns[prefix] for prefix in self._prefixes.get(keyword, ())]
+                              for keyword in keywords]
+            prefix_counts = np.array([len(prefix) for prefix in prefix_columns], dtype=np.int64)
+            prefix_flat = np.array([column for prefix in prefix_columns for column in prefix],
+                                   dtype=np.int64)
+            prefix_starts = np.cumsum(prefix_counts) - prefix_counts
+
+            weights = {group: np.zeros((len(keywords), len(labels)), dtype=np.float32)
+                       for group, labels in self.labels.items()}
+            for keyword, targets in self._keyword_labels.items():
+                for group, label_index in targets:
+                    weights[group][columns[keyword], label_index] += 1
+
+            self._label_weights = (columns, prefix_counts, prefix_flat, prefix_starts, weights)
+        return self._label_weights
+
+    def hit_matrix(self, texts):
+        """
+        Metin x anahtar kelime isabet matrisi (bool). Her metin için en uzun eşleşmeler
+        `str.findall` ile bir kez çıkarılır; önekler ve sayımlar NumPy'da genişletilir.
+        texts: normalize edilmiş metinler (liste veya object türünde pandas Series)
+        """
+        import numpy as np
+        import pandas as pd
+
+        columns, prefix_counts, prefix_flat, prefix_starts, _ = self._weights()
+        texts = pd.Series(texts, dtype=object).reset_index(drop=True)
+        hits = np.zeros((len(texts), len(columns)), dtype=bool)
+
+        if '' in columns:
+            hits[:, columns['']] = True
+
+        if self._pattern is None or texts.empty:
+            return hits
+
+        found = texts.str.findall(self._pattern).explode().dropna()
+        if found.empty:
+            return hits
+
+        rows = found.index.to_numpy()
+        longest = found.map(columns).to_numpy(dtype=np.int64)
+
+        # Her (metin, en uzun kelime) çifti, kelimenin tüm öneklerine genişletilir
+        counts = prefix_counts[longest]
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        prefixes = prefix_flat[np.repeat(prefix_starts[longest], counts) + offsets]
+        hits[np.repeat(rows, counts), prefixes] = True
+        return hits
+
+    def count_matrix(self, texts):
+        """`count` işleminin toplu karşılığı: {grup: metin x etiket isabet sayısı matrisi}"""
+        import numpy as np
+
+        hits = self.hit_matrix(texts)
+        weights = self._weights()[4]
+        return {group: (hits @ weight).astype(np.int64) for group, weight in weights.items()}
+
+    def best_labels(self, group, counts, default='Diğer'):
+        """`best_label` işleminin NumPy karşılığı: satır başına argmax (eşitlikte ilk etiket)"""
+        import numpy as np
+
+        labels = np.array(self.labels[group] + (default,), dtype=object)
+        if counts.shape[0] == 0:
+            return labels[:0]
+        if counts.shape[1] == 0:
+            return np.full(counts.shape[0], default, dtype=object)
+
+        best = counts.argmax(axis=1)
+        best[counts.max(axis=1) <= 0] = len(labels) - 1
+        return labels[best]
@@ -1,10 +1,32 @@
 from chat_analyzer import DugumBuketiChatAnalyzer
+from stream_reader import iter_messages
+from analysis_cache import AnalysisCache
+from report_engine import ReportAccumulator
+from instrumentation import Instrumentation
+import argparse
 import json
-import pandas as pd
+import os
+import threading
 
-def main():
+# Satır başına bir JSON kaydı içeren dosyalar (iter_messages ile okunur)
+NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+
+# analyze_custom_json çağrıları arasında paylaşılan, değiştirilemez analiz sistemi
+_shared_analyzer = None
+_shared_analyzer_lock = threading.Lock()
+
+def get_shared_analyzer():
+    """Varsayılan ayarlı analiz sistemini bir kez oluşturup döndür (iş parçacıkları arasında güvenli)"""
+    global _shared_analyzer
+    if _shared_analyzer is None:
+        with _shared_analyzer_lock:
+            if _shared_analyzer is None:
+                _shared_analyzer = DugumBuketiChatAnalyzer()
+    return _shared_analyzer
+
+def main(instrumentation=None):
     # Analiz sistemi oluştur
-    analyzer = DugumBuketiChatAnalyzer()
+    analyzer = DugumBuketiChatAnalyzer(instrumentation=instrumentation)
     
     # Örnek JSON verisi (gerçek veri yerine)
     sample_data = {
@@ -82,20 +104,39 @@ def main():
     
     return results, csv_file, db_file
 
-def analyze_custom_json(json_file_path):
-    """Kendi JSON dosyanızı analiz etmek için"""
-    analyzer = DugumBuketiChatAnalyzer()
+def analyze_custom_json(json_file_path, cache_path=None, instrumentation=None):
+    """
+    Kendi JSON/NDJSON dosyanızı analiz etmek için
+    .ndjson/.jsonl dosyaları satır satır okunur; mesajlar kendi conversation_id alanını taşır.
+    cache_path verilirse önceki çalıştırmalarda analiz edilen mesajlar tekrar analiz edilmez.
+    instrumentation: aşama süreleri için Instrumentation (isteğe bağlı); verilmezse
+                     paylaşılan analiz sistemi kullanılır, sözlükler her çağrıda yeniden derlenmez
+    """
+    if instrumentation is not None:
+        analyzer = DugumBuketiChatAnalyzer(instrumentation=instrumentation)
+    else:
+        analyzer = get_shared_analyzer()
     
     try:
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        with analyzer.instrumentation.stage('json_load') as load:
+            if json_file_path.endswith(NDJSON_EXTENSIONS):
+                data = list(iter_messages(json_file_path))
+                load.items = len(data)
+            else:
+                with open(json_file_path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
         
-        results = analyzer.analyze_conversation(data)
+        if cache_path:
+            with AnalysisCache(cache_path) as cache:
+                results = analyzer.analyze_conversation(data, cache=cache)
+        else:
+            results = analyzer.analyze_conversation(data)
         
         # Dosya adından çıktı adları oluştur
-        base_name = json_file_path.replace('.json', '')
+        base_name = os.path.splitext(json_file_path)[0]
         csv_file = analyzer.save_to_csv(results, f"{base_name}_analiz.csv")
-        db_file = analyzer.save_to_sqlite(results, f"{base_name}_analiz.db")
+        conversation_id = data.get('conversation_id') if isinstance(data, dict) else None
+        db_file = analyzer.save_to_sqlite(results, f"{base_name}_analiz.db", conversation_id)
         
         report = analyzer.generate_report(results)
         print("Analiz tamamlandı!")
@@ -108,13 +149,100 @@ def analyze_custom_json(json_file_path):
         print(f"Hata: {e}")
         return None, None
 
+def count_rows(rows, accumulator):
+    """Satırları değiştirmeden geçir, rapor sayaçlarını güncelle"""
+    for row in rows:
+        accumulator.add_row(row)
+        yield row
+
+def analyze_json_stream(json_file_path, output_format='csv', instrumentation=None):
+    """
+    Büyük JSON/NDJSON dosyalarını bellek kullanımı sabit kalacak şekilde analiz et
+    output_format: 'csv' veya 'parquet'
+    """
+    analyzer = DugumBuketiChatAnalyzer(instrumentation=instrumentation)
+    accumulator = ReportAccumulator()
+    
+    try:
+        rows = analyzer.analyze_stream(iter_messages(json_file_path))
+        
+        base_name = os.path.splitext(json_file_path)[0]
+        if output_format == 'parquet':
+            output_file = analyzer.save_to_parquet(count_rows(rows, accumulator), f"{base_name}_analiz.parquet")
+        else:
+            output_file = analyzer.save_stream_to_csv(count_rows(rows, accumulator), f"{base_name}_analiz.csv")
+        
+        report = accumulator.generate_report()
+        print("Analiz tamamlandı!")
+        print(f"{output_format.upper()}: {output_file}")
+        
+        return output_file, report
+        
+    except Exception as e:
+        print(f"Hata: {e}")
+        return None, None
+
+def run_profiled(function, *args, profile_path='dugum_buketi.prof', **kwargs):
+    """
+    Fonksiyonu cProfile altında çalıştır ve istatistikleri kaydet
+    .prof dosyası snakeviz, flameprof veya gprof2dot ile alev grafiğine çevrilebilir.
+    """
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args, **kwargs)
+    finally:
+        profiler.dump_stats(profile_path)
+        print(f"\nProfil kaydedildi: {profile_path}")
+        pstats.Stats(profile_path).sort_stats('cumulative').print_stats(15)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="DüğünBuketi sohbet analizi")
+    parser.add_argument('input', nargs='?', default=None,
+                        help="Analiz edilecek JSON/NDJSON dosyası (verilmezse örnek veri kullanılır)")
+    parser.add_argument('--stream', action='store_true', help="Büyük dosyalar için akış modu")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv', help="Akış modu çıktısı")
+    parser.add_argument('--cache', default=None, help="Analiz sonuç önbelleği (SQLite dosyası)")
+    parser.add_argument('--metrics', default=None,
+                        help="Aşama sürelerini kaydet (.json veya Prometheus için .prom)")
+    parser.add_argument('--profile', default=None,
+                        help="cProfile çıktısı (.prof); snakeviz/flameprof ile açılabilir")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    # Örnek analiz çalıştır
-    results, csv_file, db_file = main()
+    args = parse_args()
+    instrumentation = Instrumentation() if args.metrics else None
+    
+    if args.input is None:
+        function, function_args = main, ()
+    elif args.stream:
+        function, function_args = analyze_json_stream, (args.input, args.format)
+    else:
+        function, function_args = analyze_custom_json, (args.input, args.cache)
+    
+    if args.profile:
+        output = run_profiled(function, *function_args, profile_path=args.profile,
+                              instrumentation=instrumentation)
+    else:
+        output = function(*function_args, instrumentation=instrumentation)
     
-    print(f"\n✅ Analiz tamamlandı!")
-    print(f"📁 CSV dosyası: {csv_file}")
-    print(f"🗄️ SQLite dosyası: {db_file}")
+    if args.input is None:
+        # Örnek analiz çalıştır
+        results, csv_file, db_file = output
+        
+        print(f"\n✅ Analiz tamamlandı!")
+        print(f"📁 CSV dosyası: {csv_file}")
+        print(f"🗄️ SQLite dosyası: {db_file}")
+    
+    if instrumentation is not None:
+        print()
+        instrumentation.print_summary()
+        instrumentation.save(args.metrics)
     
     # Kendi JSON dosyanızı analiz etmek için:
-    # results, report = analyze_custom_json("your_chat_data.json")
\ No newline at end of file
+    # python main.py your_chat_data.json --cache analiz_cache.db
+    
+    # Büyük (çok GB'lık) JSON/NDJSON dışa aktarımları için akış modu:
+    # python main.py your_chat_data.ndjson --stream --format parquet
@@ -0,0 +1,148 @@
+import argparse
+import hashlib
+import json
+import pickle
+from itertools import islice
+
+from stream_reader import iter_messages
+
+
+def build_pipeline():
+    """TF-IDF + MultinomialNB sınıflandırma hattı"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.pipeline import Pipeline
+
+    return Pipeline([
+        ('tfidf', TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=1)),
+        ('nb', MultinomialNB(alpha=0.1))
+    ])
+
+
+def label_dictionary_version(analyzer):
+    """Eğitim etiketlerini ve model girdisini belirleyen sözlüklerin (kategori, intent) ve normalizasyonun özeti"""
+    config = {
+        'category_keywords': analyzer.category_keywords,
+        'intent_keywords': analyzer.intent_keywords,
+        'matching': analyzer.matching
+    }
+    encoded = json.dumps(config, ensure_ascii=False, sort_keys=True, default=dict).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def model_fingerprint(category_model, intent_model, dictionary_version):
+    """Önbellek anahtarları için model özeti (eğitimde ve yüklemede aynı girdilerden)"""
+    return hashlib.sha1(pickle.dumps((category_model, intent_model, dictionary_version))).hexdigest()
+
+
+class KeywordBootstrappedClassifier:
+    def __init__(self, category_model=None, intent_model=None, dictionary_version=None):
+        """
+        Etiketlerini anahtar kelime sınıflandırıcısından alan TF-IDF + MultinomialNB modeli.
+        Girdiler `preprocess_text` ile normalize edilmiş metinlerdir.
+        dictionary_version: eğitimde kullanılan sözlüklerin özeti (`label_dictionary_version`)
+        """
+        self.category_model = category_model
+        self.intent_model = intent_model
+        self.dictionary_version = dictionary_version
+        self.fingerprint = model_fingerprint(category_model, intent_model, dictionary_version)
+
+    @classmethod
+    def bootstrap(cls, analyzer, texts):
+        """Ham metinleri anahtar kelime sınıflandırıcısıyla etiketleyip modeli eğit"""
+        prepared = [analyzer.prepare_message(text) for text in texts]
+        normalized = [message.text for message in prepared]
+
+        # Etiketler her zaman anahtar kelime sınıflandırıcısından gelir
+        matcher = analyzer.keyword_matcher
+        categories = [matcher.best_label('kategori', message.scores['kategori']) for message in prepared]
+        intents = [matcher.best_label('intent', message.scores['intent']) for message in prepared]
+
+        category_model, intent_model = build_pipeline(), build_pipeline()
+        category_model.fit(normalized, categories)
+        intent_model.fit(normalized, intents)
+        return cls(category_model, intent_model, label_dictionary_version(analyzer))
+
+    def check_dictionaries(self, analyzer):
+        """
+        Model analiz sisteminin güncel sözlükleriyle eğitilmiş mi; değilse uyarı ver.
+        Eşleşiyorsa True döndürür.
+        """
+        current = label_dictionary_version(analyzer)
+        if self.dictionary_version == current:
+            return True
+        print(f"Uyarı: model farklı sözlüklerle eğitilmiş (model: {self.dictionary_version}, "
+              f"güncel: {current}); modeli yeniden eğitin")
+        return False
+
+    def save(self, path):
+        """Modeli diske kaydet"""
+        with open(path, 'wb') as file:
+            pickle.dump({
+                'category_model': self.category_model,
+                'intent_model': self.intent_model,
+                'dictionary_version': self.dictionary_version
+            }, file)
+        print(f"Model kaydedildi: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path, analyzer=None):
+        """
+        Kaydedilmiş modeli yükle (yalnızca güvenilir dosyalar için)
+        analyzer: verilirse modelin sözlük sürümü analiz sisteminin sözlükleriyle karşılaştırılır
+        """
+        with open(path, 'rb') as file:
+            data = pickle.load(file)
+
+        classifier = cls(data['category_model'], data['intent_model'], data.get('dictionary_version'))
+        if analyzer is not None:
+            classifier.check_dictionaries(analyzer)
+        return classifier
+
+    def predict_batch(self, normalized_texts, chunk_size=10000):
+        """Normalize metinleri parça başına tek `predict` çağrısıyla sınıflandır"""
+        texts = iter(normalized_texts)
+        categories = []
+        intents = []
+
+        while True:
+            chunk = list(islice(texts, chunk_size))
+            if not chunk:
+                break
+            categories.extend(self.category_model.predict(chunk).tolist())
+            intents.extend(self.intent_model.predict(chunk).tolist())
+
+        return categories, intents
+
+
+def train_from_files(paths, model_path, limit=None):
+    """JSON/NDJSON dosyalarındaki mesajlarla modeli eğit ve kaydet"""
+    from chat_analyzer import DugumBuketiChatAnalyzer
+
+    analyzer = DugumBuketiChatAnalyzer()
+    texts = []
+    for path in paths:
+        if limit and len(texts) >= limit:
+            break
+        for message in iter_messages(path):
+            text = message.get('message', '')
+            if text.strip():
+                texts.append(text)
+            if limit and len(texts) >= limit:
+                break
+
+    classifier = KeywordBootstrappedClassifier.bootstrap(analyzer, texts)
+    classifier.save(model_path)
+    print(f"Eğitimde kullanılan mesaj: {len(texts)}")
+    return classifier
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Anahtar kelime etiketleriyle TF-IDF + NB modeli eğit")
+    parser.add_argument('paths', nargs='+', help="Eğitim için JSON/NDJSON dosyaları")
+    parser.add_argument('--model', default='dugum_buketi_model.pkl', help="Model dosyası")
+    parser.add_argument('--limit', type=int, default=None, help="En fazla mesaj sayısı")
+    args = parser.parse_args()
+
+    train_from_files(args.paths, args.model, args.limit)
@@ -0,0 +1,380 @@
+import argparse
+import sqlite3
+from datetime import datetime
+from itertools import islice
+
+# Etiket türü -> tablo adı
+LABEL_TABLES = {
+    'sentiment': 'sentiment_labels',
+    'kategori': 'category_labels',
+    'intent': 'intent_labels'
+}
+
+ANSWERED_CODES = {'Evet': 1, 'Hayır': 0}
+
+# Analiz bekleyen mesaj koşulu (kısmi indeksle aynı ifade)
+PENDING_CONDITION = "analyzed_at IS NULL AND length(trim(message)) > 0"
+
+
+class NormalizedChatStore:
+    def __init__(self, db_path):
+        """
+        Konuşmalar, gönderenler, mesajlar ve tamsayı anahtarlı etiket tablolarından oluşan
+        normalize SQLite deposu. Ham dışa aktarımlar `load_conversations` ile yüklenir,
+        analiz edilmemiş mesajlar `iter_pending` ile sayfa sayfa okunur ve sonuçlar
+        `write_results` ile aynı satırlara yazılır. `chat_analysis` görünümü düz tabloyla
+        aynı sütunları verdiğinden SQLiteReportEngine ve görselleştirici değişmeden çalışır.
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+
+        # Toplu yükleme için ayarlar
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+
+        self._ensure_schema()
+        self._load_ids()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _ensure_schema(self):
+        kind = self.conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = 'chat_analysis'").fetchone()
+        if kind is not None and kind[0] != 'view':
+            # Düz tablo varken görünüm oluşturulamaz; raporlar eski tabloyu okumaya devam ederdi
+            self.conn.close()
+            raise ValueError(f"{self.db_path}: 'chat_analysis' bir görünüm değil ({kind[0]}); düz "
+                             "ChatAnalysisStore şeması, normalize depo için başka bir dosya seçin")
+
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS conversations (
+                    id INTEGER PRIMARY KEY,
+                    external_id TEXT NOT NULL UNIQUE,
+                    source TEXT,
+                    loaded_at TEXT
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS senders (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    user_type TEXT NOT NULL DEFAULT '',
+                    UNIQUE (name, user_type)
+                )
+            """)
+            for table in LABEL_TABLES.values():
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        id INTEGER PRIMARY KEY,
+                        name TEXT NOT NULL UNIQUE
+                    )
+                """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY,
+                    conversation_id INTEGER NOT NULL REFERENCES conversations (id),
+                    message_id NOT NULL,
+                    position INTEGER,
+                    timestamp TEXT,
+                    sender_id INTEGER REFERENCES senders (id),
+                    message TEXT NOT NULL DEFAULT '',
+                    answered INTEGER,
+                    sentiment_id INTEGER REFERENCES sentiment_labels (id),
+                    category_id INTEGER REFERENCES category_labels (id),
+                    intent_id INTEGER REFERENCES intent_labels (id),
+                    analyzed_at TEXT,
+                    UNIQUE (conversation_id, message_id)
+                )
+            """)
+            self.conn.execute(f"""
+                CREATE INDEX IF NOT EXISTS ix_messages_pending ON messages (conversation_id)
+                WHERE {PENDING_CONDITION}
+            """)
+            for column in ('answered', 'category_id', 'intent_id', 'timestamp'):
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS ix_messages_{column} ON messages ({column})")
+
+            # Düz `chat_analysis` tablosuyla aynı sütunlar (yalnızca analiz edilmiş mesajlar)
+            self.conn.execute("""
+                CREATE VIEW IF NOT EXISTS chat_analysis AS
+                SELECT c.external_id AS conversation_id, m.message_id, m.timestamp,
+                       s.name AS sender, m.message,
+                       CASE m.answered WHEN 1 THEN 'Evet' WHEN 0 THEN 'Hayır' END AS "yanıtlanmış_mı",
+                       sl.name AS sentiment, cl.name AS kategori, il.name AS intent
+                FROM messages m
+                JOIN conversations c ON c.id = m.conversation_id
+                LEFT JOIN senders s ON s.id = m.sender_id
+                LEFT JOIN sentiment_labels sl ON sl.id = m.sentiment_id
+                LEFT JOIN category_labels cl ON cl.id = m.category_id
+                LEFT JOIN intent_labels il ON il.id = m.intent_id
+                WHERE m.analyzed_at IS NOT NULL
+            """)
+
+    def _load_ids(self):
+        """Dış anahtar -> tamsayı kimlik önbellekleri (her satırda tekrar sorgulanmaz)"""
+        self._conversation_ids = dict(self.conn.execute("SELECT external_id, id FROM conversations"))
+        self._sender_ids = {}
+        self._sender_names = {}
+        for sender_id, name, user_type in self.conn.execute(
+                "SELECT id, name, user_type FROM senders ORDER BY id"):
+            self._remember_sender(sender_id, name, user_type)
+        self._label_ids = {
+            kind: dict(self.conn.execute(f"SELECT name, id FROM {table}"))
+            for kind, table in LABEL_TABLES.items()
+        }
+
+    def _write_batches(self, sql, rows, batch_size):
+        """
+        Satırları partiler halinde, her parti tek işlemde yaz; eklenen/güncellenen mesaj sayısını döndür.
+        Kimlik eklemeleri de partinin işlemine dahildir; işlem geri alınırsa önbellekler
+        veritabanından yeniden yüklenir.
+        """
+        written = 0
+        rows = iter(rows)
+        try:
+            while True:
+                with self.conn:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    written += self.conn.executemany(sql, batch).rowcount
+        except Exception:
+            self._load_ids()
+            raise
+        return written
+
+    def _conversation_id(self, external_id, source=None):
+        """Konuşmanın tamsayı kimliği (yoksa eklenir)"""
+        external_id = '' if external_id is None else str(external_id)
+        conversation_id = self._conversation_ids.get(external_id)
+        if conversation_id is None:
+            conversation_id = self.conn.execute(
+                "INSERT INTO conversations (external_id, source, loaded_at) VALUES (?, ?, ?)",
+                (external_id, source, datetime.now().isoformat(timespec='seconds'))).lastrowid
+            self._conversation_ids[external_id] = conversation_id
+        return conversation_id
+
+    def _remember_sender(self, sender_id, name, user_type):
+        """Gönderen kimliğini önbelleğe al; ada göre aramada user_type'ı bilinen ilk kayıt seçilir"""
+        self._sender_ids[(name, user_type)] = sender_id
+        known = self._sender_names.get(name)
+        if known is None or (user_type and not known[1]):
+            self._sender_names[name] = (sender_id, user_type)
+
+    def _sender_id(self, name, user_type=None):
+        """Gönderenin tamsayı kimliği (yoksa eklenir)"""
+        if name is None:
+            return None
+        key = (str(name), '' if user_type is None else str(user_type))
+        sender_id = self._sender_ids.get(key)
+        if sender_id is not None:
+            return sender_id
+
+        # Sonuçlardan user_type'sız eklenmiş gönderen, user_type öğrenilince aynı kayıtla sürer
+        known = self._sender_names.get(key[0])
+        if key[1] and known is not None and not known[1]:
+            sender_id = known[0]
+            self.conn.execute("UPDATE senders SET user_type = ? WHERE id = ?", (key[1], sender_id))
+            del self._sender_ids[(key[0], '')]
+            del self._sender_names[key[0]]
+        else:
+            sender_id = self.conn.execute(
+                "INSERT INTO senders (name, user_type) VALUES (?, ?)", key).lastrowid
+        self._remember_sender(sender_id, *key)
+        return sender_id
+
+    def _sender_id_by_name(self, name):
+        """
+        Sonuç satırındaki gönderenin kimliği: satırlarda user_type yoktur, bu yüzden aynı adla
+        kayıtlı gönderen (user_type'ı bilinen önce) kullanılır; yoksa user_type'sız eklenir
+        """
+        if name is None:
+            return None
+        known = self._sender_names.get(str(name))
+        if known is not None:
+            return known[0]
+        return self._sender_id(name)
+
+    def label_id(self, kind, name):
+        """Etiketin tamsayı kimliği (yoksa eklenir)"""
+        if name is None:
+            return None
+        ids = self._label_ids[kind]
+        label_id = ids.get(name)
+        if label_id is None:
+            label_id = self.conn.execute(
+                f"INSERT INTO {LABEL_TABLES[kind]} (name) VALUES (?)", (name,)).lastrowid
+            ids[name] = label_id
+        return label_id
+
+    def register_labels(self, analyzer):
+        """Kategori ve intent tablolarını analiz sisteminin liste sırasıyla doldur"""
+        with self.conn:
+            for name in ('Pozitif', 'Negatif', 'Nötr'):
+                self.label_id('sentiment', name)
+            for name in analyzer.categories:
+                self.label_id('kategori', name)
+            for name in analyzer.intents:
+                self.label_id('intent', name)
+
+    def load_conversations(self, conversations, source=None, batch_size=10000):
+        """
+        (conversation_id, messages) çiftlerini analiz edilmemiş mesajlar olarak yükle.
+        Mesajlar batch_size'lık partiler halinde, her parti tek işlemde eklenir; var olan
+        (konuşma, message_id) satırlarına dokunulmaz. Eklenen mesaj sayısını döndürür.
+        """
+        def rows():
+            for external_id, messages in conversations:
+                conversation_id = self._conversation_id(external_id, source)
+                for position, message in enumerate(messages):
+                    if not isinstance(message, dict):
+                        message = {'message': message}
+                    text = message.get('message', '')
+                    yield (
+                        conversation_id,
+                        message.get('id', position),
+                        position,
+                        message.get('timestamp'),
+                        self._sender_id(message.get('sender'), message.get('user_type')),
+                        text if isinstance(text, str) else ''
+                    )
+
+        return self._write_batches(
+            "INSERT OR IGNORE INTO messages "
+            "(conversation_id, message_id, position, timestamp, sender_id, message) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows(), batch_size)
+
+    def load_files(self, paths, batch_size=10000):
+        """JSON/NDJSON dışa aktarım dosyalarını (conversation_id'ye göre gruplanarak) yükle"""
+        from batch_analyzer import load_conversations
+
+        loaded = 0
+        for path in paths:
+            loaded += self.load_conversations(load_conversations(path), source=path,
+                                              batch_size=batch_size)
+        return loaded
+
+    def write_results(self, results, conversation_id=None, batch_size=10000):
+        """
+        Analiz sonuçlarını (satır sözlükleri veya AnalysisResultTable) mesajlara yaz.
+        Yüklenmemiş mesajlar eklenir; var olanların yalnızca etiketleri güncellenir.
+        Yazılan satır sayısını döndürür.
+        """
+        if hasattr(results, 'iter_db_rows'):
+            params = results.iter_db_rows(conversation_id)
+        else:
+            params = ((row.get('conversation_id', conversation_id), row.get('message_id'),
+                       row.get('timestamp'), row.get('sender'), row.get('message'),
+                       row.get('yanıtlanmış_mı'), row.get('sentiment'), row.get('kategori'),
+                       row.get('intent')) for row in results)
+
+        analyzed_at = datetime.now().isoformat(timespec='seconds')
+
+        def rows():
+            for (external_id, message_id, timestamp, sender, message,
+                 answered, sentiment, category, intent) in params:
+                yield (
+                    self._conversation_id(external_id),
+                    message_id,
+                    timestamp,
+                    self._sender_id_by_name(sender),
+                    message if isinstance(message, str) else '',
+                    ANSWERED_CODES.get(answered),
+                    self.label_id('sentiment', sentiment),
+                    self.label_id('kategori', category),
+                    self.label_id('intent', intent),
+                    analyzed_at
+                )
+
+        return self._write_batches("""
+            INSERT INTO messages (conversation_id, message_id, timestamp, sender_id, message,
+                                  answered, sentiment_id, category_id, intent_id, analyzed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (conversation_id, message_id) DO UPDATE SET
+                answered = excluded.answered,
+                sentiment_id = excluded.sentiment_id,
+                category_id = excluded.category_id,
+                intent_id = excluded.intent_id,
+                analyzed_at = excluded.analyzed_at
+        """, rows(), batch_size)
+
+    def pending_count(self):
+        """Analiz bekleyen mesaj sayısı"""
+        return self.conn.execute(f"SELECT COUNT(*) FROM messages WHERE {PENDING_CONDITION}").fetchone()[0]
+
+    def iter_pending(self, page_size=500):
+        """
+        Analiz bekleyen mesajı olan konuşmaları sayfa sayfa üret: [(conversation_id, messages), ...]
+        Yanıt tespiti için konuşmanın tüm mesajları (analiz edilmişler dahil) sırasıyla döner.
+        Sayfalar konuşma kimliğine göre ilerler (OFFSET yok); sayfa işlenirken yazılan
+        sonuçlar sonraki sayfaları etkilemez.
+        """
+        last_id = 0
+        while True:
+            page = self.conn.execute(f"""
+                SELECT id, external_id FROM conversations c
+                WHERE id > ? AND EXISTS (
+                    SELECT 1 FROM messages WHERE conversation_id = c.id AND {PENDING_CONDITION}
+                )
+                ORDER BY id LIMIT ?
+            """, (last_id, page_size)).fetchall()
+            if not page:
+                return
+
+            ids = [conversation_id for conversation_id, _ in page]
+            placeholders = ', '.join('?' for _ in ids)
+            messages = {conversation_id: [] for conversation_id in ids}
+            for conversation_id, message_id, timestamp, sender, user_type, text in self.conn.execute(f"""
+                SELECT m.conversation_id, m.message_id, m.timestamp, s.name, s.user_type, m.message
+                FROM messages m LEFT JOIN senders s ON s.id = m.sender_id
+                WHERE m.conversation_id IN ({placeholders})
+                ORDER BY m.conversation_id, m.position IS NULL, m.position, m.id
+            """, ids):
+                message = {'id': message_id, 'message': text}
+                if timestamp is not None:
+                    message['timestamp'] = timestamp
+                if sender is not None:
+                    message['sender'] = sender
+                if user_type:
+                    message['user_type'] = user_type
+                messages[conversation_id].append(message)
+
+            yield [(external_id, messages[conversation_id]) for conversation_id, external_id in page]
+            last_id = ids[-1]
+
+    def count(self):
+        """Mesaj sayısı"""
+        return self.conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Normalize SQLite deposu: yükleme ve bekleyenleri analiz")
+    parser.add_argument('db', help="SQLite veritabanı")
+    parser.add_argument('--load', nargs='+', default=None, help="Yüklenecek JSON/NDJSON dosyaları")
+    parser.add_argument('--analyze', action='store_true', help="Bekleyen mesajları analiz et")
+    parser.add_argument('--page-size', type=int, default=500, help="Sayfa başına konuşma sayısı")
+    parser.add_argument('--batch-size', type=int, default=10000, help="İşlem başına satır sayısı")
+    args = parser.parse_args()
+
+    with NormalizedChatStore(args.db) as store:
+        if args.load:
+            loaded = store.load_files(args.load, args.batch_size)
+            print(f"{loaded} mesaj yüklendi ({store.count()} toplam)")
+
+        if args.analyze:
+            from chat_analyzer import DugumBuketiChatAnalyzer
+
+            analyzer = DugumBuketiChatAnalyzer()
+            written = analyzer.analyze_pending(store, args.page_size)
+            print(f"{written} mesaj analiz edildi, {store.pending_count()} bekleyen")
@@ -0,0 +1,80 @@
+import cProfile
+import pstats
+import random
+from datetime import datetime, timedelta
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import SAMPLE_MESSAGES
+
+
+def build_messages(message_count, seed=42):
+    """Profil için örnek mesaj listesi oluştur"""
+    rng = random.Random(seed)
+    senders = ['müşteri_1', 'müşteri_2', 'müşteri_3', 'destek_1', 'destek_2']
+    base_time = datetime(2024, 1, 1)
+
+    messages = []
+    for i in range(message_count):
+        sender = rng.choice(senders)
+        messages.append({
+            "id": i + 1,
+            "timestamp": (base_time + timedelta(minutes=i)).isoformat(),
+            "sender": sender,
+            "user_type": 'customer' if 'müşteri' in sender else 'support',
+            "message": rng.choice(SAMPLE_MESSAGES)
+        })
+    return messages
+
+
+def per_classifier_pass(analyzer, messages):
+    """Eski akış: her sınıflandırıcı ham metni yeniden normalize eder"""
+    for i, message in enumerate(messages):
+        message_text = message['message']
+        analyzer.is_question_answered(messages, i)
+        analyzer.analyze_sentiment(message_text)
+        analyzer.classify_category(message_text)
+        analyzer.classify_intent(message_text)
+
+
+def profile_call(func, *args):
+    """Fonksiyonu profille; toplam süre ile preprocess_text çağrı sayısı ve süresini döndür"""
+    profiler = cProfile.Profile()
+    profiler.runcall(func, *args)
+    stats = pstats.Stats(profiler)
+
+    calls, total = 0, 0.0
+    for (filename, _, name), (_, ncalls, _, cumtime, _) in stats.stats.items():
+        if name == 'preprocess_text' and filename.endswith('chat_analyzer.py'):
+            calls += ncalls
+            total += cumtime
+
+    return stats.total_tt, calls, total
+
+
+def print_report(title, message_count, profile):
+    """Tek bir akışın normalizasyon payını yazdır"""
+    total_time, calls, normalize_time = profile
+    print(title)
+    print(f"  preprocess_text çağrısı: {calls} ({calls / message_count:.2f} / mesaj)")
+    print(f"  normalizasyon süresi:    {normalize_time:.3f} sn "
+          f"(toplamın %{normalize_time / total_time * 100:.1f}'i)")
+    print(f"  toplam süre:             {total_time:.3f} sn")
+
+
+def run_profile(message_count=20000):
+    """Normalizasyona harcanan süreyi önce/sonra karşılaştır"""
+    analyzer = DugumBuketiChatAnalyzer()
+    messages = build_messages(message_count)
+
+    before = profile_call(per_classifier_pass, analyzer, messages)
+    after = profile_call(analyzer.analyze_conversation, messages)
+
+    print(f"Mesaj sayısı: {message_count}")
+    print_report("Önce (sınıflandırıcı başına normalizasyon):", message_count, before)
+    print_report("Sonra (analyze_message, tek normalizasyon):", message_count, after)
+
+    return before, after
+
+
+if __name__ == "__main__":
+    run_profile()
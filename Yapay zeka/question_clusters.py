@@ -0,0 +1,251 @@
+import argparse
+import sqlite3
+import zlib
+from collections import Counter
+from datetime import datetime
+
+# 2^32'den büyük asal: x < 2^32 ve a < 2^31 için (a * x + b) uint64'te taşmaz
+PRIME = 4294967311
+
+CLUSTER_TABLE = 'unanswered_question_clusters'
+MEMBER_TABLE = 'unanswered_question_cluster_messages'
+
+
+class MinHashLSH:
+    def __init__(self, num_perm=64, bands=16, shingle_size=4, threshold=0.6, seed=1):
+        """
+        Karakter n-gram kümeleri üzerinde MinHash imzaları ve bant tabanlı LSH.
+        İmza num_perm hash fonksiyonunun minimumlarıdır; iki imzanın eşit konum oranı
+        Jaccard benzerliğinin tahminidir. İmzalar bands banda bölünür, aynı bant değerine
+        sahip metinler aday çifttir ve tahmini benzerliği threshold üzerindeyse birleştirilir.
+        Yalnızca kova başına aday arandığından süre metin sayısıyla neredeyse doğrusal artar.
+        """
+        import numpy as np
+
+        if num_perm % bands:
+            raise ValueError("num_perm, bands ile tam bölünmeli")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        """Metnin karakter n-gramlarının kararlı (süreçten bağımsız) 32 bit hash değerleri"""
+        size = self.shingle_size
+        if len(text) <= size:
+            return {zlib.crc32(text.encode('utf-8'))}
+        return {zlib.crc32(text[i:i + size].encode('utf-8')) for i in range(len(text) - size + 1)}
+
+    def signatures(self, texts, chunk_shingles=65536):
+        """Metin x num_perm MinHash imza matrisi; hash işlemleri parça parça NumPy'da yapılır"""
+        import numpy as np
+
+        texts = list(texts)
+        result = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        start = 0
+        while start < len(texts):
+            hashes = []
+            starts = []
+            end = start
+            while end < len(texts) and len(hashes) < chunk_shingles:
+                starts.append(len(hashes))
+                hashes.extend(self.shingles(texts[end]))
+                end += 1
+
+            values = np.array(hashes, dtype=np.uint64)[:, None]
+            permuted = (values * self._a + self._b) % PRIME
+            result[start:end] = np.minimum.reduceat(permuted, np.array(starts), axis=0)
+            start = end
+        return result
+
+    def cluster(self, texts):
+        """Her metnin küme numarası (0'dan başlar, ilk görülme sırasıyla)"""
+        import numpy as np
+
+        signatures = self.signatures(texts)
+        count = len(signatures)
+        if not count:
+            return []
+        parent = list(range(count))
+
+        def find(index):
+            root = index
+            while parent[root] != root:
+                root = parent[root]
+            while parent[index] != root:
+                parent[index], index = root, parent[index]
+            return root
+
+        positions = np.arange(count)
+        for band in range(self.bands):
+            keys = np.ascontiguousarray(signatures[:, band * self.rows:(band + 1) * self.rows])
+            keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * self.rows))).ravel()
+            # Aynı bant değerine sahip metinler kovanın ilk metniyle karşılaştırılır
+            _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+            heads = first[inverse.ravel()]
+            candidates = positions[heads != positions]
+            if not len(candidates):
+                continue
+
+            similarity = (signatures[candidates] == signatures[heads[candidates]]).mean(axis=1)
+            candidates = candidates[similarity >= self.threshold]
+            for index, head in zip(candidates.tolist(), heads[candidates].tolist()):
+                root, head_root = find(index), find(head)
+                if root != head_root:
+                    parent[max(root, head_root)] = min(root, head_root)
+
+        labels = {}
+        return [labels.setdefault(find(index), len(labels)) for index in range(count)]
+
+
+class QuestionClusterer:
+    def __init__(self, analyzer=None, questions_only=True, **lsh_options):
+        """
+        Yanıtlanmamış soruları benzerliğe göre kümeler.
+        Aynı metinler önce SQL'de (GROUP BY message), aynı normalize metinler bellekte
+        birleştirilir; yalnızca farklı normalize metinler MinHash/LSH ile kümelenir.
+        analyzer: normalize etme ve soru tespiti için analiz sistemi (varsayılan ayarlarla oluşturulur)
+        questions_only: 'Hayır' etiketi soru olmayan mesajlara da verilir; True ise bunlar atlanır
+        lsh_options: MinHashLSH ayarları (num_perm, bands, shingle_size, threshold, seed)
+        """
+        if analyzer is None:
+            from chat_analyzer import DugumBuketiChatAnalyzer
+            analyzer = DugumBuketiChatAnalyzer()
+        self.analyzer = analyzer
+        self.questions_only = questions_only
+        self.lsh = MinHashLSH(**lsh_options)
+
+    def cluster(self, entries):
+        """
+        entries: (mesaj, kategori, intent, satır sayısı) demetleri (mesaj metinleri farklı)
+        Dönüş: (kümeler, {mesaj: küme numarası}); kümeler satır sayısına göre çoktan aza sıralı,
+        numaralar 1'den başlar.
+        """
+        analyzer = self.analyzer
+        groups = {}
+        for message, category, intent, count in entries:
+            prepared = analyzer.prepare_message(message)
+            if self.questions_only and not analyzer.is_question(prepared):
+                continue
+            groups.setdefault(prepared.text, []).append((message, category, intent, count))
+
+        texts = list(groups)
+        labels = self.lsh.cluster(texts)
+
+        members = {}
+        for text, label in zip(texts, labels):
+            members.setdefault(label, []).extend(groups[text])
+
+        clusters = []
+        for label, messages in members.items():
+            categories = Counter()
+            intents = Counter()
+            for _, category, intent, count in messages:
+                categories[category] += count
+                intents[intent] += count
+            # En sık metin temsilcidir; eşitlikte kısa olan seçilir
+            representative = min(messages, key=lambda item: (-item[3], len(item[0])))[0]
+            clusters.append({
+                'representative': representative,
+                'message_count': sum(item[3] for item in messages),
+                'distinct_messages': len(messages),
+                'kategori': categories.most_common(1)[0][0],
+                'intent': intents.most_common(1)[0][0],
+                '_messages': messages
+            })
+
+        clusters.sort(key=lambda cluster: -cluster['message_count'])
+        assignments = {}
+        for cluster_id, cluster in enumerate(clusters, 1):
+            cluster['cluster_id'] = cluster_id
+            for message, _, _, _ in cluster.pop('_messages'):
+                assignments[message] = cluster_id
+        return clusters, assignments
+
+    def cluster_database(self, db_path, table='chat_analysis'):
+        """
+        Veritabanındaki 'Hayır' etiketli mesajları kümele ve sonuçları aynı veritabanına yaz
+        table: düz tablo veya normalize şemanın `chat_analysis` görünümü
+        Her çalıştırma küme tablolarını baştan yazar.
+        """
+        conn = sqlite3.connect(db_path)
+        try:
+            entries = conn.execute(f"""
+                SELECT message, kategori, intent, COUNT(*)
+                FROM "{table}"
+                WHERE "yanıtlanmış_mı" = 'Hayır' AND message IS NOT NULL
+                GROUP BY message
+            """).fetchall()
+            clusters, assignments = self.cluster(entries)
+            save_clusters(conn, clusters, assignments, entries)
+        finally:
+            conn.close()
+        return clusters
+
+
+def save_clusters(conn, clusters, assignments, entries):
+    """Küme özetlerini ve mesaj -> küme eşlemesini tek işlemde yeniden yaz"""
+    counts = {message: count for message, _, _, count in entries}
+    created_at = datetime.now().isoformat()
+
+    with conn:
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CLUSTER_TABLE} (
+                cluster_id INTEGER PRIMARY KEY,
+                representative TEXT NOT NULL,
+                message_count INTEGER NOT NULL,
+                distinct_messages INTEGER NOT NULL,
+                kategori TEXT,
+                intent TEXT,
+                created_at TEXT
+            )
+        """)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {MEMBER_TABLE} (
+                message TEXT PRIMARY KEY,
+                cluster_id INTEGER NOT NULL REFERENCES {CLUSTER_TABLE} (cluster_id),
+                message_count INTEGER NOT NULL
+            )
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{MEMBER_TABLE}_cluster "
+                     f"ON {MEMBER_TABLE} (cluster_id)")
+        conn.execute(f"DELETE FROM {MEMBER_TABLE}")
+        conn.execute(f"DELETE FROM {CLUSTER_TABLE}")
+
+        conn.executemany(
+            f"INSERT INTO {CLUSTER_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+            ((cluster['cluster_id'], cluster['representative'], cluster['message_count'],
+              cluster['distinct_messages'], cluster['kategori'], cluster['intent'], created_at)
+             for cluster in clusters))
+        conn.executemany(
+            f"INSERT INTO {MEMBER_TABLE} VALUES (?, ?, ?)",
+            ((message, cluster_id, counts[message]) for message, cluster_id in assignments.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yanıtlanmamış soruları benzerliğe göre kümele")
+    parser.add_argument('db', help="Analiz sonuçlarının SQLite veritabanı")
+    parser.add_argument('--threshold', type=float, default=0.6, help="Tahmini Jaccard eşiği")
+    parser.add_argument('--num-perm', type=int, default=64)
+    parser.add_argument('--bands', type=int, default=16)
+    parser.add_argument('--shingle-size', type=int, default=4, help="Karakter n-gram uzunluğu")
+    parser.add_argument('--all-messages', action='store_true',
+                        help="Soru belirtisi olmayan 'Hayır' mesajlarını da kümele")
+    parser.add_argument('--top', type=int, default=20, help="Yazdırılacak küme sayısı")
+    args = parser.parse_args()
+
+    clusterer = QuestionClusterer(questions_only=not args.all_messages, num_perm=args.num_perm,
+                                  bands=args.bands, shingle_size=args.shingle_size,
+                                  threshold=args.threshold)
+    clusters = clusterer.cluster_database(args.db)
+
+    total = sum(cluster['message_count'] for cluster in clusters)
+    print(f"{total} yanıtlanmamış soru, {len(clusters)} küme ({CLUSTER_TABLE} tablosuna yazıldı)")
+    for cluster in clusters[:args.top]:
+        print(f"{cluster['cluster_id']:>5} {cluster['message_count']:>8} "
+              f"{cluster['distinct_messages']:>6}  {cluster['representative'][:80]}")
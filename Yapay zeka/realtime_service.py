@@ -0,0 +1,261 @@
+import argparse
+import asyncio
+import json
+import sys
+from collections import deque
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+
+
+class PendingQuestion:
+    """Yanıt bekleyen soru ve son tarihi"""
+    __slots__ = ('conversation_id', 'prepared', 'asked_at', 'deadline', 'done')
+
+    def __init__(self, conversation_id, prepared, asked_at, deadline):
+        self.conversation_id = conversation_id
+        self.prepared = prepared
+        self.asked_at = asked_at
+        self.deadline = deadline
+        self.done = False
+
+
+class UnansweredQuestionService:
+    def __init__(self, analyzer=None, deadline=300.0, max_pending=100000, max_alerts=10000):
+        """
+        Canlı konuşmalarda yanıtlanmamış soruları tespit eden asyncio servisi.
+        Her konuşma için yalnızca yanıt bekleyen sorular tutulur; başka bir göndericiden
+        `is_answer_to` koşulunu sağlayan mesaj gelince soru 'answered' olarak kapanır,
+        deadline saniye içinde yanıt gelmezse 'unanswered' uyarısı üretilir.
+        max_pending: bellekte tutulan en fazla soru; aşılırsa en eski soru süresi
+                     dolmadan 'unanswered' (reason='overflow') olarak kapatılır
+        max_alerts: uyarı kuyruğunun kapasitesi; tüketici yetişemezse yeni uyarılar kuyruğa
+                    eklenmez ve `dropped_alerts` sayacında sayılır
+        """
+        self.analyzer = analyzer or DugumBuketiChatAnalyzer()
+        self.deadline = deadline
+        self.max_pending = max_pending
+
+        # conversation_id -> yanıt bekleyen sorular (geliş sırasıyla)
+        self.pending = {}
+        # Sabit süre nedeniyle son tarih sırası geliş sırasıdır; kapanan sorular tembel silinir
+        self._deadlines = deque()
+        self._wakeup = None
+
+        self.alerts = asyncio.Queue(maxsize=max_alerts)
+        self.dropped_alerts = 0
+        self.processed = 0
+        self.answered = 0
+        self.unanswered = 0
+
+    def _loop_time(self):
+        return asyncio.get_running_loop().time()
+
+    def _emit(self, status, question, now, reply=None, reason='deadline'):
+        """Soruyu kapat ve uyarı kuyruğuna olay ekle"""
+        question.done = True
+        questions = self.pending.get(question.conversation_id)
+        if questions is not None:
+            questions.remove(question)
+            if not questions:
+                del self.pending[question.conversation_id]
+
+        source = question.prepared.source
+        alert = {
+            'status': status,
+            'conversation_id': question.conversation_id,
+            'message_id': source.get('id'),
+            'sender': source.get('sender'),
+            'message': question.prepared.message,
+            'asked_at': question.asked_at,
+            'deadline': question.deadline,
+            'emitted_at': now
+        }
+        if reply is not None:
+            alert['reply_id'] = reply.source.get('id')
+            alert['replied_by'] = reply.sender
+        if status == 'unanswered':
+            alert['reason'] = reason
+            self.unanswered += 1
+        else:
+            self.answered += 1
+
+        try:
+            self.alerts.put_nowait(alert)
+        except asyncio.QueueFull:
+            self.dropped_alerts += 1
+        return alert
+
+    def process(self, event, now=None):
+        """
+        Tek mesaj olayını işle ve bu olayla üretilen uyarıları döndür
+        event: mesaj sözlüğü (conversation_id, sender, user_type, message, id, ...);
+               'received_at' (döngü saati) varsa sorunun süresi o andan başlar
+        """
+        if now is None:
+            now = self._loop_time()
+        received_at = event.get('received_at', now)
+        self.processed += 1
+
+        text = event.get('message', '')
+        if not isinstance(text, str) or not text.strip():
+            return []
+
+        conversation_id = str(event.get('conversation_id', 'unknown'))
+        prepared = self.analyzer.prepare_message(event)
+        alerts = []
+
+        # Bu mesaj, konuşmada bekleyen soruları yanıtlıyor mu
+        for question in list(self.pending.get(conversation_id, ())):
+            if self.analyzer.is_answer_to(question.prepared, prepared):
+                alerts.append(self._emit('answered', question, now, reply=prepared))
+
+        if self.analyzer.is_question(prepared):
+            question = PendingQuestion(conversation_id, prepared, received_at,
+                                       received_at + self.deadline)
+            self.pending.setdefault(conversation_id, []).append(question)
+            self._deadlines.append(question)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+            # Bellek sınırı: en eski kayıtlar kuyruktan atılır
+            while len(self._deadlines) > self.max_pending:
+                oldest = self._deadlines.popleft()
+                if not oldest.done:
+                    alerts.append(self._emit('unanswered', oldest, now, reason='overflow'))
+
+        return alerts
+
+    def expire(self, now=None):
+        """Son tarihi geçmiş soruları 'unanswered' olarak kapat"""
+        if now is None:
+            now = self._loop_time()
+
+        alerts = []
+        while self._deadlines and self._deadlines[0].deadline <= now:
+            question = self._deadlines.popleft()
+            if not question.done:
+                alerts.append(self._emit('unanswered', question, now))
+        return alerts
+
+    async def _expire_loop(self):
+        """Sıradaki son tarihe kadar uyu, süresi dolan soruları kapat"""
+        while True:
+            self._wakeup.clear()
+            if not self._deadlines:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._deadlines[0].deadline - self._loop_time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.expire()
+
+    async def run(self, events):
+        """
+        asyncio.Queue'dan olayları tüket; None geldiğinde bekleyen soruların süresini
+        bekleyip durur ve uyarı kuyruğuna None koyar.
+        """
+        self._wakeup = asyncio.Event()
+        expirer = asyncio.create_task(self._expire_loop())
+
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                self.process(event)
+
+            # Akış bitti: kalan sorular son tarihlerinde kapanır
+            while self._deadlines:
+                delay = self._deadlines[0].deadline - self._loop_time()
+                await asyncio.sleep(max(0.0, delay))
+                self.expire()
+        finally:
+            expirer.cancel()
+            # Bitiş işareti her durumda iletilir; kuyruk doluysa en eski uyarı yer açar
+            if self.alerts.full():
+                self.alerts.get_nowait()
+                self.dropped_alerts += 1
+            self.alerts.put_nowait(None)
+
+    async def serve(self, host='127.0.0.1', port=8765, max_events=10000):
+        """
+        Her satırı bir JSON mesaj olayı olan TCP bağlantılarını dinle
+        max_events: olay kuyruğunun kapasitesi; kuyruk doluyken bağlantılardan okuma
+                    bekletilir ve yavaş tüketici göndericileri TCP üzerinden yavaşlatır
+        """
+        events = asyncio.Queue(maxsize=max_events)
+
+        async def handle(reader, writer):
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if not isinstance(event, dict):
+                        continue
+                    # Kuyrukta bekleme süresi sorunun süresine dahil edilir
+                    event['received_at'] = self._loop_time()
+                    # Kuyruk doluysa yer açılana kadar bu bağlantıdan okunmaz
+                    await events.put(event)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_server(handle, host, port)
+        async with server:
+            await self.run(events)
+
+    def stats(self):
+        """Servis sayaçları"""
+        return {
+            'işlenen': self.processed,
+            'yanıtlanan': self.answered,
+            'yanıtlanmayan': self.unanswered,
+            'bekleyen_soru': sum(len(questions) for questions in self.pending.values()),
+            'açık_konuşma': len(self.pending),
+            'takipteki_kayıt': len(self._deadlines),
+            'düşen_uyarı': self.dropped_alerts
+        }
+
+
+async def _print_alerts(service):
+    """Uyarıları NDJSON olarak standart çıktıya yaz"""
+    while True:
+        alert = await service.alerts.get()
+        if alert is None:
+            return
+        print(json.dumps(alert, ensure_ascii=False), flush=True)
+
+
+async def _serve_forever(args):
+    service = UnansweredQuestionService(deadline=args.deadline, max_pending=args.max_pending,
+                                        max_alerts=args.max_alerts)
+    printer = asyncio.create_task(_print_alerts(service))
+    print(f"Dinleniyor: {args.host}:{args.port} (süre: {args.deadline} sn)", file=sys.stderr)
+    await service.serve(args.host, args.port, max_events=args.max_events)
+    await printer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerçek zamanlı yanıtlanmamış soru servisi")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--deadline', type=float, default=300.0, help="Yanıt için süre (sn)")
+    parser.add_argument('--max-pending', type=int, default=100000, help="En fazla bekleyen soru")
+    parser.add_argument('--max-alerts', type=int, default=10000,
+                        help="Uyarı kuyruğu kapasitesi (dolunca yeni uyarılar düşürülür)")
+    parser.add_argument('--max-events', type=int, default=10000,
+                        help="Olay kuyruğu kapasitesi (dolunca bağlantılardan okuma bekletilir)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve_forever(args))
+    except KeyboardInterrupt:
+        pass
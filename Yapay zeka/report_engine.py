@@ -0,0 +1,147 @@
+import sqlite3
+from collections import Counter
+from pathlib import Path
+
+# Raporların kullandığı etiket sütunları
+REPORT_COLUMNS = ('yanıtlanmış_mı', 'sentiment', 'kategori', 'intent')
+
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _mode(counts):
+    """En sık değer; eşitlikte pandas `mode()` gibi en küçük değer"""
+    if not counts:
+        return None
+    return min(counts, key=lambda value: (-counts[value], value))
+
+
+def _build_statistics(total, counts):
+    """Sayımlardan ChatAnalysisVisualizer.generate_statistics ile aynı sözlüğü oluştur"""
+    answered = counts['yanıtlanmış_mı']
+    rate = answered.get('Evet', 0) / total * 100 if total else 0.0
+    return {
+        'Toplam Mesaj': total,
+        'Yanıtlanmamış Soru': answered.get('Hayır', 0),
+        'Yanıtlanma Oranı': f"{rate:.1f}%",
+        'En Çok Sorulan Kategori': _mode(counts['kategori']),
+        'En Yaygın Duygu': _mode(counts['sentiment']),
+        'En Yaygın Amaç': _mode(counts['intent'])
+    }
+
+
+def _build_report(total, counts):
+    """Sayımlardan DugumBuketiChatAnalyzer.generate_report ile aynı sözlüğü oluştur"""
+    return {
+        'toplam_mesaj': total,
+        'yanıtlanmamış_soru': counts['yanıtlanmış_mı'].get('Hayır', 0),
+        'sentiment_dağılımı': dict(Counter(counts['sentiment']).most_common()),
+        'kategori_dağılımı': dict(Counter(counts['kategori']).most_common()),
+        'intent_dağılımı': dict(Counter(counts['intent']).most_common())
+    }
+
+
+class SQLiteReportEngine:
+    def __init__(self, db_path, table='chat_analysis'):
+        """
+        Rapor ve istatistikleri indeksli GROUP BY sorgularıyla veritabanında hesaplar;
+        bellek kullanımı satır sayısıyla büyümez.
+        """
+        self.db_path = db_path
+        self.table = table
+
+    def _connect(self):
+        # Salt okunur bağlantı: rapor veritabanını değiştirmez
+        return sqlite3.connect(Path(self.db_path).absolute().as_uri() + "?mode=ro", uri=True)
+
+    def total(self, conn):
+        """Toplam satır sayısı"""
+        return conn.execute(f"SELECT COUNT(*) FROM {_quote(self.table)}").fetchone()[0]
+
+    def value_counts(self, column, conn=None):
+        """Sütundaki değerlerin sayıları (çoktan aza, NULL hariç)"""
+        own_connection = conn is None
+        if own_connection:
+            conn = self._connect()
+
+        try:
+            rows = conn.execute(
+                f"SELECT {_quote(column)}, COUNT(*) AS n FROM {_quote(self.table)} "
+                f"WHERE {_quote(column)} IS NOT NULL "
+                f"GROUP BY {_quote(column)} ORDER BY n DESC, {_quote(column)}").fetchall()
+        finally:
+            if own_connection:
+                conn.close()
+
+        return dict(rows)
+
+    def _counts(self):
+        conn = self._connect()
+        try:
+            total = self.total(conn)
+            counts = {column: self.value_counts(column, conn) for column in REPORT_COLUMNS}
+        finally:
+            conn.close()
+        return total, counts
+
+    def generate_report(self):
+        """DugumBuketiChatAnalyzer.generate_report ile aynı anahtarlara sahip rapor"""
+        return _build_report(*self._counts())
+
+    def generate_statistics(self):
+        """ChatAnalysisVisualizer.generate_statistics ile aynı anahtarlara sahip özet"""
+        return _build_statistics(*self._counts())
+
+
+class ReportAccumulator:
+    def __init__(self):
+        """Satır veya parça geldikçe sayaçları güncelleyen tek geçişli rapor toplayıcı"""
+        self.total = 0
+        self.counts = {column: Counter() for column in REPORT_COLUMNS}
+
+    def add_row(self, row):
+        """Tek analiz satırını say"""
+        self.total += 1
+        for column in REPORT_COLUMNS:
+            value = row.get(column)
+            if value is not None:
+                self.counts[column][value] += 1
+
+    def add_chunk(self, df):
+        """DataFrame parçasını say"""
+        self.total += len(df)
+        for column in REPORT_COLUMNS:
+            self.counts[column].update(df[column].value_counts().to_dict())
+
+    def add_table(self, table):
+        """AnalysisResultTable'ı etiket kodlarını sayarak ekle"""
+        self.total += len(table)
+        for column in REPORT_COLUMNS:
+            self.counts[column].update(table.value_counts(column))
+
+    def generate_report(self):
+        return _build_report(self.total, self.counts)
+
+    def generate_statistics(self):
+        return _build_statistics(self.total, self.counts)
+
+
+def accumulate_file(path, chunksize=100000):
+    """CSV veya Parquet dosyasını yalnızca etiket sütunlarını parça parça okuyarak say"""
+    accumulator = ReportAccumulator()
+
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize,
+                                                        columns=list(REPORT_COLUMNS)):
+            accumulator.add_chunk(batch.to_pandas())
+    else:
+        import pandas as pd
+
+        for chunk in pd.read_csv(path, encoding='utf-8-sig', usecols=list(REPORT_COLUMNS),
+                                 chunksize=chunksize):
+            accumulator.add_chunk(chunk)
+
+    return accumulator
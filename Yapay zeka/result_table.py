@@ -0,0 +1,221 @@
+from array import array
+from collections import Counter
+from datetime import datetime
+
+
+class AnalysisRecord:
+    """Tablodaki tek satırın sözlük benzeri, kopyasız görünümü"""
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, column):
+        return self._table.value(column, self._index)
+
+    def get(self, column, default=None):
+        if column not in self._table.columns:
+            return default
+        return self._table.value(column, self._index)
+
+    def keys(self):
+        return self._table.columns
+
+    def to_dict(self):
+        return {column: self._table.value(column, self._index) for column in self._table.columns}
+
+    def __repr__(self):
+        return f"AnalysisRecord({self.to_dict()!r})"
+
+
+class AnalysisResultTable:
+    COLUMNS = (
+        'conversation_id', 'message_id', 'timestamp', 'sender', 'message',
+        'yanıtlanmış_mı', 'sentiment', 'kategori', 'intent'
+    )
+
+    # Tekrarlanan değerler tamsayı kodlarıyla saklanır: (sütun, dizi türü)
+    CODED_COLUMNS = {
+        'conversation_id': 'I',
+        'sender': 'I',
+        'yanıtlanmış_mı': 'B',
+        'sentiment': 'B',
+        'kategori': 'H',
+        'intent': 'H'
+    }
+
+    def __init__(self, categories=(), intents=()):
+        """
+        Analiz sonuçları için sütunlu, satır başına sözlük oluşturmayan tablo.
+        Etiketler, gönderen ve conversation_id `array` içinde tamsayı kodu olarak tutulur;
+        kodlar sözlük listelerine (kategori/intent için analiz sisteminin listeleri) işaret eder.
+        message_id, timestamp ve message kaynak mesajdaki nesnelere başvurudur.
+        """
+        self.vocabularies = {column: [] for column in self.CODED_COLUMNS}
+        self._lookup = {column: {} for column in self.CODED_COLUMNS}
+        self._codes = {column: array(typecode) for column, typecode in self.CODED_COLUMNS.items()}
+        self.message_ids = []
+        self.timestamps = []
+        self.messages = []
+
+        for column, labels in (('yanıtlanmış_mı', ('Hayır', 'Evet')),
+                               ('sentiment', ('Pozitif', 'Negatif', 'Nötr')),
+                               ('kategori', categories), ('intent', intents)):
+            for label in labels:
+                self._encode(column, label)
+
+    @classmethod
+    def for_analyzer(cls, analyzer):
+        """Kodları analiz sisteminin kategori ve intent listelerine eşlenen boş tablo"""
+        return cls(analyzer.categories, analyzer.intents)
+
+    def _encode(self, column, value):
+        """Değerin kodu (yeni değerler sözlüğe eklenir)"""
+        lookup = self._lookup[column]
+        code = lookup.get(value)
+        if code is None:
+            code = lookup[value] = len(self.vocabularies[column])
+            self.vocabularies[column].append(value)
+        return code
+
+    def append(self, message, message_text, position, labels, conversation_id=None):
+        """`_result_row` ile aynı alanlara sahip satırı ekle"""
+        answered, sentiment, category, intent = labels
+        codes = self._codes
+        encode = self._encode
+
+        codes['conversation_id'].append(encode('conversation_id', conversation_id))
+        self.message_ids.append(message.get('id', position))
+        self.timestamps.append(message.get('timestamp', datetime.now().isoformat()))
+        codes['sender'].append(encode('sender', message.get('sender', 'unknown')))
+        self.messages.append(message_text)
+        codes['yanıtlanmış_mı'].append(encode('yanıtlanmış_mı', answered))
+        codes['sentiment'].append(encode('sentiment', sentiment))
+        codes['kategori'].append(encode('kategori', category))
+        codes['intent'].append(encode('intent', intent))
+
+    def extend(self, other):
+        """Başka bir tablonun satırlarını kodları yeniden eşleyerek ekle"""
+        for column in self.CODED_COLUMNS:
+            mapping = [self._encode(column, value) for value in other.vocabularies[column]]
+            self._codes[column].extend(mapping[code] for code in other._codes[column])
+        self.message_ids.extend(other.message_ids)
+        self.timestamps.extend(other.timestamps)
+        self.messages.extend(other.messages)
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return AnalysisRecord(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield AnalysisRecord(self, index)
+
+    @property
+    def columns(self):
+        """Çıktı sütunları; conversation_id yalnızca en az bir satırda verilmişse yer alır"""
+        if self.vocabularies['conversation_id'] in ([], [None]):
+            return self.COLUMNS[1:]
+        return self.COLUMNS
+
+    def value(self, column, index):
+        """Tek hücrenin değeri"""
+        if column in self.CODED_COLUMNS:
+            return self.vocabularies[column][self._codes[column][index]]
+        if column == 'message_id':
+            return self.message_ids[index]
+        if column == 'timestamp':
+            return self.timestamps[index]
+        if column == 'message':
+            return self.messages[index]
+        raise KeyError(column)
+
+    def value_counts(self, column):
+        """Kodlu sütundaki değerlerin sayıları (çoktan aza, sayısı sıfır olanlar hariç)"""
+        vocabulary = self.vocabularies[column]
+        return {vocabulary[code]: count for code, count in Counter(self._codes[column]).most_common()}
+
+    def _numpy_codes(self, column):
+        """Kodları ve NULL olmayan kategorileri (None değerinin kodu -1) döndür"""
+        import numpy as np
+
+        codes = np.frombuffer(self._codes[column], dtype=self._codes[column].typecode).astype(np.int64)
+        vocabulary = self.vocabularies[column]
+        if None not in self._lookup[column]:
+            return codes, list(vocabulary)
+
+        none_code = self._lookup[column][None]
+        remap = np.arange(len(vocabulary))
+        remap[none_code + 1:] -= 1
+        remap[none_code] = -1
+        return remap[codes], [value for value in vocabulary if value is not None]
+
+    def to_dataframe(self):
+        """Sözlük listesi oluşturmadan DataFrame; kodlu sütunlar kategorik türdedir"""
+        import pandas as pd
+
+        data = {}
+        for column in self.columns:
+            if column in self.CODED_COLUMNS:
+                codes, categories = self._numpy_codes(column)
+                data[column] = pd.Categorical.from_codes(
+                    codes, categories=categories).remove_unused_categories()
+            else:
+                data[column] = self.value_list(column)
+        return pd.DataFrame(data)
+
+    def value_list(self, column):
+        """Kodlu olmayan sütunun değer listesi"""
+        return {'message_id': self.message_ids, 'timestamp': self.timestamps,
+                'message': self.messages}[column]
+
+    def to_arrow(self, dictionary_columns=()):
+        """
+        PyArrow tablosu: dictionary_columns sözlük kodlamalı, diğer sütunlar metin.
+        Kodlar doğrudan Arrow indekslerine dönüştürülür.
+        """
+        import pyarrow as pa
+
+        arrays = []
+        for column in self.columns:
+            if column in self.CODED_COLUMNS:
+                vocabulary = [None if value is None else str(value)
+                              for value in self.vocabularies[column]]
+                array_ = pa.DictionaryArray.from_arrays(
+                    pa.array(self._codes[column], type=pa.int32()), pa.array(vocabulary, type=pa.string()))
+                if column not in dictionary_columns:
+                    array_ = array_.dictionary_decode()
+            else:
+                array_ = pa.array([None if value is None else str(value)
+                                   for value in self.value_list(column)], type=pa.string())
+            arrays.append(array_)
+        return pa.Table.from_arrays(arrays, names=list(self.columns))
+
+    def iter_db_rows(self, default_conversation_id=None):
+        """ChatAnalysisStore.COLUMNS sırasında parametre demetleri"""
+        vocabularies = self.vocabularies
+        codes = self._codes
+        conversation_ids = vocabularies['conversation_id']
+
+        for index in range(len(self)):
+            conversation_id = conversation_ids[codes['conversation_id'][index]]
+            if conversation_id is None:
+                conversation_id = default_conversation_id
+            yield (
+                '' if conversation_id is None else str(conversation_id),
+                self.message_ids[index],
+                self.timestamps[index],
+                vocabularies['sender'][codes['sender'][index]],
+                self.messages[index],
+                vocabularies['yanıtlanmış_mı'][codes['yanıtlanmış_mı'][index]],
+                vocabularies['sentiment'][codes['sentiment'][index]],
+                vocabularies['kategori'][codes['kategori'][index]],
+                vocabularies['intent'][codes['intent'][index]]
+            )
@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime
+
+from answer_matcher import parse_timestamp
+from report_engine import REPORT_COLUMNS, _build_report, _build_statistics
+
+STATE_VERSION = 1
+
+
+class _Window:
+    """Tek pencerenin dahil ettiği ilk kova ve o kovalardan toplanan sayaçlar"""
+
+    def __init__(self, seconds, buckets):
+        self.seconds = seconds
+        self.buckets = buckets
+        self.start = None
+        self.total = 0
+        self.counts = {column: Counter() for column in REPORT_COLUMNS}
+
+
+class RollingMetrics:
+    def __init__(self, windows=(3600, 86400), bucket_seconds=60, state_path=None):
+        """
+        Mesaj zaman damgasına göre kayan pencereli pano metrikleri (son saat, son gün, ...).
+        Mesajlar bucket_seconds uzunluğunda kovalarda sayılır; her pencere kendi kovalarının
+        toplamını ayrıca tutar. Mesaj eklemek kova ve pencere sayaçlarını O(1) günceller;
+        zaman ilerledikçe pencereden çıkan kovalar pencere sayaçlarından bir kez çıkarılır
+        ve en uzun pencereden eski kovalar silinir.
+        Zaman, görülen en yeni mesajın zaman damgasıdır (olay zamanı); sessiz dönemlerde
+        `advance` ile ilerletilebilir. En uzun pencereden eski mesajlar sayılmaz (`late`).
+        state_path: durum dosyası; varsa yüklenir, `save` ile yazılır
+        """
+        windows = sorted(set(int(seconds) for seconds in windows))
+        if not windows or bucket_seconds <= 0 or any(seconds % bucket_seconds for seconds in windows):
+            raise ValueError("Pencere süreleri bucket_seconds'ın pozitif katları olmalı")
+
+        self.bucket_seconds = bucket_seconds
+        self.windows = {seconds: _Window(seconds, seconds // bucket_seconds) for seconds in windows}
+        self.state_path = state_path
+
+        # kova numarası -> [mesaj sayısı, {sütun: Counter}]
+        self._buckets = {}
+        self._current = None
+        self._max_buckets = max(window.buckets for window in self.windows.values())
+        self.late = 0
+        self.invalid = 0
+        # Kaynak -> son okunan konum (ör. SQLite rowid); yeniden başlatmada geçmiş taranmaz
+        self.positions = {}
+
+        if state_path and os.path.exists(state_path):
+            self._restore(state_path)
+
+    def _advance_to(self, index):
+        """Güncel kovayı ilerlet: pencereden çıkan kovaları çıkar, en eski kovaları sil"""
+        self._current = index
+        buckets = self._buckets
+
+        for window in self.windows.values():
+            start = index - window.buckets + 1
+            if window.start is None:
+                window.start = start
+                continue
+            if start <= window.start:
+                continue
+
+            # Uzun sessizliklerde boş kova aralığı yerine var olan kovalar dolaşılır
+            if start - window.start > len(buckets):
+                expired = [bucket for bucket in buckets if window.start <= bucket < start]
+            else:
+                expired = range(window.start, start)
+            for bucket in expired:
+                if bucket in buckets:
+                    self._subtract(window, buckets[bucket])
+            window.start = start
+
+        oldest = index - self._max_buckets + 1
+        if len(buckets) > self._max_buckets or (buckets and min(buckets) < oldest):
+            for bucket in [bucket for bucket in buckets if bucket < oldest]:
+                del buckets[bucket]
+
+    @staticmethod
+    def _subtract(window, bucket):
+        total, counts = bucket
+        window.total -= total
+        for column, bucket_counts in counts.items():
+            window_counts = window.counts[column]
+            for value, count in bucket_counts.items():
+                remaining = window_counts[value] - count
+                if remaining > 0:
+                    window_counts[value] = remaining
+                else:
+                    del window_counts[value]
+
+    def add(self, timestamp, labels):
+        """
+        Tek mesajı say; labels: REPORT_COLUMNS sırasıyla (yanıtlanmış_mı, sentiment, kategori, intent)
+        Mesaj sayıldıysa True döndürür.
+        """
+        seconds = parse_timestamp(timestamp)
+        if seconds is None:
+            self.invalid += 1
+            return False
+
+        index = int(seconds // self.bucket_seconds)
+        if self._current is None or index > self._current:
+            self._advance_to(index)
+        elif index <= self._current - self._max_buckets:
+            self.late += 1
+            return False
+
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = [0, {column: Counter() for column in REPORT_COLUMNS}]
+        bucket[0] += 1
+        for column, value in zip(REPORT_COLUMNS, labels):
+            if value is not None:
+                bucket[1][column][value] += 1
+
+        for window in self.windows.values():
+            if index >= window.start:
+                window.total += 1
+                for column, value in zip(REPORT_COLUMNS, labels):
+                    if value is not None:
+                        window.counts[column][value] += 1
+        return True
+
+    def add_row(self, row):
+        """Analiz satırını (sözlük veya AnalysisRecord) say"""
+        return self.add(row.get('timestamp'), [row.get(column) for column in REPORT_COLUMNS])
+
+    def add_rows(self, rows):
+        """Satırları say; sayılan satır sayısını döndürür"""
+        return sum(1 for row in rows if self.add_row(row))
+
+    def add_table(self, table):
+        """AnalysisResultTable satırlarını sözlük oluşturmadan say"""
+        vocabularies = table.vocabularies
+        codes = [(vocabularies[column], table._codes[column]) for column in REPORT_COLUMNS]
+        added = 0
+        for index, timestamp in enumerate(table.timestamps):
+            if self.add(timestamp, [vocabulary[column_codes[index]]
+                                    for vocabulary, column_codes in codes]):
+                added += 1
+        return added
+
+    def advance(self, now=None):
+        """Yeni mesaj gelmese de pencereleri verilen zamana (varsayılan: şimdi) ilerlet"""
+        # parse_timestamp ile aynı saat: Unix zamanı (saat dilimsiz değerler yerel saattir)
+        seconds = parse_timestamp(now) if now is not None else datetime.now().timestamp()
+        index = int(seconds // self.bucket_seconds)
+        if self._current is None or index > self._current:
+            self._advance_to(index)
+
+    def _window(self, seconds):
+        window = self.windows.get(seconds)
+        if window is None:
+            raise KeyError(f"Tanımlı olmayan pencere: {seconds} "
+                           f"(pencereler: {', '.join(str(key) for key in self.windows)})")
+        return window
+
+    def _bounds(self, window):
+        """Pencerenin [başlangıç, bitiş) zamanları (ISO 8601, yerel saat dilimi ofsetiyle)"""
+        if self._current is None:
+            return None, None
+        start = window.start * self.bucket_seconds
+        end = (self._current + 1) * self.bucket_seconds
+        return tuple(datetime.fromtimestamp(value).astimezone().isoformat() for value in (start, end))
+
+    def report(self, seconds, top=5):
+        """
+        Pencerenin `generate_report` biçimindeki dağılımları ile yanıtlanmamış oranı ve
+        en sık kategori/intent'ler
+        """
+        window = self._window(seconds)
+        report = _build_report(window.total, window.counts)
+        start, end = self._bounds(window)
+        unanswered = report['yanıtlanmamış_soru']
+        report.update({
+            'pencere_sn': seconds,
+            'başlangıç': start,
+            'bitiş': end,
+            'yanıtlanmamış_oranı': round(unanswered / window.total, 4) if window.total else 0.0,
+            'en_çok_kategori': window.counts['kategori'].most_common(top),
+            'en_çok_intent': window.counts['intent'].most_common(top)
+        })
+        return report
+
+    def statistics(self, seconds):
+        """Pencerenin `ChatAnalysisVisualizer.generate_statistics` biçimindeki özeti"""
+        window = self._window(seconds)
+        return _build_statistics(window.total, window.counts)
+
+    def reports(self, top=5):
+        """Tüm pencerelerin raporları {pencere_sn: rapor}"""
+        return {seconds: self.report(seconds, top) for seconds in self.windows}
+
+    def update_from_sqlite(self, db_path, table='chat_analysis', batch_size=10000):
+        """
+        Düz sonuç tablosuna (ChatAnalysisStore) son çalıştırmadan beri eklenen satırları
+        (rowid sırasıyla) say. Okunan son rowid durumla birlikte saklanır; yeniden başlatmada
+        geçmiş taranmaz.
+        Yalnızca eklemeler izlenir: upsert ile yerinde güncellenen satırların değişen
+        etiketleri yeniden sayılmaz. Normalize deponun `chat_analysis` görünümünde rowid
+        olmadığından desteklenmez (ValueError).
+        """
+        source = f"{os.path.abspath(db_path)}::{table}"
+        position = self.positions.get(source, 0)
+        columns = ', '.join('"' + column + '"' for column in ('timestamp',) + REPORT_COLUMNS)
+
+        conn = sqlite3.connect(db_path)
+        try:
+            kind = conn.execute("SELECT type FROM sqlite_master WHERE name = ?", (table,)).fetchone()
+            if kind is None or kind[0] != 'table':
+                raise ValueError(f"{table} bir tablo değil; artımlı okuma düz tablonun rowid'sini "
+                                 "gerektirir (normalize deponun görünümü desteklenmez)")
+
+            cursor = conn.execute(f'SELECT rowid, {columns} FROM "{table}" WHERE rowid > ? '
+                                  f'ORDER BY rowid', (position,))
+            added = 0
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for rowid, timestamp, *labels in rows:
+                    if self.add(timestamp, labels):
+                        added += 1
+                position = rows[-1][0]
+        finally:
+            conn.close()
+
+        self.positions[source] = position
+        return added
+
+    def to_state(self):
+        """Kovalar, güncel zaman ve kaynak konumları (pencere sayaçları kovalardan yeniden kurulur)"""
+        return {
+            'version': STATE_VERSION,
+            'bucket_seconds': self.bucket_seconds,
+            'current': self._current,
+            'late': self.late,
+            'invalid': self.invalid,
+            'positions': self.positions,
+            'buckets': {str(index): [total, {column: dict(counter) for column, counter in counts.items()}]
+                        for index, (total, counts) in sorted(self._buckets.items())}
+        }
+
+    def save(self, path=None):
+        """Durumu JSON olarak atomik yaz (geçici dosya + yeniden adlandırma)"""
+        path = path or self.state_path
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self.to_state(), file, ensure_ascii=False)
+        os.replace(temporary, path)
+        return path
+
+    def _restore(self, path):
+        with open(path, 'r', encoding='utf-8') as file:
+            state = json.load(file)
+
+        if state.get('version') != STATE_VERSION or state.get('bucket_seconds') != self.bucket_seconds:
+            raise ValueError(f"Durum dosyası uyumsuz: {path} (kova süresi veya sürüm farklı)")
+
+        self.late = state['late']
+        self.invalid = state['invalid']
+        self.positions = state['positions']
+        self._buckets = {
+            int(index): [total, {column: Counter(counts.get(column, {})) for column in REPORT_COLUMNS}]
+            for index, (total, counts) in state['buckets'].items()
+        }
+
+        if state['current'] is not None:
+            self._advance_to(state['current'])
+            # Pencere sayaçları yalnızca pencere içindeki kovalardan kurulur
+            for index, bucket in self._buckets.items():
+                for window in self.windows.values():
+                    if index >= window.start:
+                        window.total += bucket[0]
+                        for column, counter in bucket[1].items():
+                            window.counts[column].update(counter)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kayan pencereli pano metrikleri (artımlı)")
+    parser.add_argument('state', help="Durum dosyası (JSON); yoksa oluşturulur")
+    parser.add_argument('--db', default='dugum_buketi_analiz.db', help="Analiz sonuçları (düz SQLite tablosu; yalnızca yeni satırlar okunur)")
+    parser.add_argument('--windows', type=int, nargs='+', default=[3600, 86400],
+                        help="Pencere süreleri (saniye)")
+    parser.add_argument('--bucket', type=int, default=60, help="Kova süresi (saniye)")
+    parser.add_argument('--now', action='store_true',
+                        help="Pencereleri son mesaj yerine şimdiki zamana göre ilerlet")
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    metrics = RollingMetrics(args.windows, args.bucket, state_path=args.state)
+    added = metrics.update_from_sqlite(args.db)
+    if args.now:
+        metrics.advance()
+    metrics.save()
+
+    print(f"{added} yeni mesaj sayıldı (geç: {metrics.late}, geçersiz zaman: {metrics.invalid})")
+    print(json.dumps(metrics.reports(args.top), ensure_ascii=False, indent=2))
@@ -0,0 +1,137 @@
+from keyword_matcher import KeywordMatcher
+
+
+class KeywordSentimentBackend:
+    name = 'keyword'
+
+    def __init__(self, analyzer):
+        """Saf anahtar kelime puanlayıcı: eşitlikte 'Nötr' döner"""
+        self.analyzer = analyzer
+
+    def tie_label(self, prepared):
+        """Pozitif ve negatif sayıları eşit olduğunda dönecek etiket"""
+        return 'Nötr'
+
+    def score(self, prepared):
+        """Hazırlanmış tek mesajın duygusu"""
+        positive_count, negative_count = prepared.scores['sentiment']
+
+        if positive_count > negative_count:
+            return 'Pozitif'
+        elif negative_count > positive_count:
+            return 'Negatif'
+        return self.tie_label(prepared)
+
+    def score_batch(self, prepared_messages):
+        """Hazırlanmış mesaj listesinin duyguları"""
+        return [self.score(prepared) for prepared in prepared_messages]
+
+    def score_counts(self, counts, texts):
+        """
+        (n x 2) pozitif/negatif sayı matrisinden NumPy ile duygu etiketleri
+        texts: eşitlik durumları için normalize edilmiş metinler
+        """
+        import numpy as np
+
+        positive, negative = counts[:, 0], counts[:, 1]
+        return np.where(positive > negative, 'Pozitif',
+                        np.where(negative > positive, 'Negatif', 'Nötr')).astype(object)
+
+
+class TextBlobSentimentBackend(KeywordSentimentBackend):
+    name = 'textblob'
+
+    def __init__(self, analyzer):
+        """Anahtar kelime puanlayıcı; eşitlikte TextBlob'a (ilk kullanımda yüklenir) başvurur"""
+        super().__init__(analyzer)
+        self._textblob = None
+
+    def tie_label(self, prepared):
+        return self._polarity_label(prepared.text)
+
+    def score_counts(self, counts, texts):
+        labels = super().score_counts(counts, texts)
+        for index in (counts[:, 0] == counts[:, 1]).nonzero()[0]:
+            labels[index] = self._polarity_label(texts[index])
+        return labels
+
+    def _polarity_label(self, text):
+        """TextBlob kutupluluğundan etiket"""
+        try:
+            if self._textblob is None:
+                from textblob import TextBlob
+                self._textblob = TextBlob
+
+            polarity = self._textblob(text).sentiment.polarity
+            if polarity > 0.1:
+                return 'Pozitif'
+            elif polarity < -0.1:
+                return 'Negatif'
+            else:
+                return 'Nötr'
+        except Exception:
+            return 'Nötr'
+
+
+class LexiconSentimentBackend:
+    name = 'lexicon'
+
+    def __init__(self, analyzer, weights=None):
+        """
+        Ağırlıklı sözlük puanlayıcı. Partiler tek bir düzenli ifade geçişi ve
+        NumPy toplamalarıyla puanlanır.
+        weights: {kelime: ağırlık}; verilmezse pozitif kelimeler +1, negatifler -1
+        """
+        self.analyzer = analyzer
+        if weights is None:
+            weights = {word: 1.0 for word in analyzer.positive_words}
+            weights.update({word: -1.0 for word in analyzer.negative_words})
+        self.weights = dict(weights)
+
+        # Her konumda en uzun kelime eşleşir: 'memnun değil', 'memnun' olarak da sayılmaz
+        self.matcher = KeywordMatcher({'lexicon': {'Sözlük': list(self.weights)}})
+
+    def score(self, prepared):
+        return self.score_batch([prepared])[0]
+
+    def score_batch(self, prepared_messages):
+        import numpy as np
+
+        texts = [prepared.text for prepared in prepared_messages]
+        if not texts:
+            return []
+
+        # Normalize metinlerde satır sonu bulunmaz; mesajlar tek metinde birleştirilir
+        joined = '\n'.join(texts)
+        lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        ends = np.cumsum(lengths)
+
+        matches = list(self.matcher.iter_matches(joined))
+        polarity = np.zeros(len(texts))
+        if matches:
+            starts = np.fromiter((start for start, _ in matches), dtype=np.int64, count=len(matches))
+            weights = np.fromiter((self.weights[word] for _, word in matches),
+                                  dtype=np.float64, count=len(matches))
+            owners = np.searchsorted(ends, starts, side='right')
+            polarity = np.bincount(owners, weights=weights, minlength=len(texts))
+
+        labels = np.where(polarity > 0, 'Pozitif', np.where(polarity < 0, 'Negatif', 'Nötr'))
+        return labels.tolist()
+
+
+SENTIMENT_BACKENDS = {
+    'keyword': KeywordSentimentBackend,
+    'lexicon': LexiconSentimentBackend,
+    'textblob': TextBlobSentimentBackend
+}
+
+
+def create_sentiment_backend(backend, analyzer):
+    """İsimden (veya hazır nesneden) duygu analizi arka ucunu oluştur"""
+    if not isinstance(backend, str):
+        return backend
+
+    if backend not in SENTIMENT_BACKENDS:
+        raise ValueError(f"Bilinmeyen duygu analizi arka ucu: {backend} "
+                         f"(seçenekler: {', '.join(SENTIMENT_BACKENDS)})")
+    return SENTIMENT_BACKENDS[backend](analyzer)
@@ -0,0 +1,176 @@
+import sqlite3
+from itertools import islice
+
+
+class ChatAnalysisStore:
+    COLUMNS = (
+        'conversation_id', 'message_id', 'timestamp', 'sender', 'message',
+        'yanıtlanmış_mı', 'sentiment', 'kategori', 'intent'
+    )
+
+    # Değişip değişmediğine bakılan sütunlar (aynıysa satıra yazılmaz)
+    COMPARED_COLUMNS = ('sender', 'message', 'yanıtlanmış_mı', 'sentiment', 'kategori', 'intent')
+
+    INDEXED_COLUMNS = ('yanıtlanmış_mı', 'kategori', 'intent', 'timestamp')
+
+    def __init__(self, db_path, table='chat_analysis'):
+        """
+        Analiz sonuçları için kalıcı, yalnızca-ekleme SQLite deposu.
+        Satırlar (conversation_id, message_id) üzerinden tekilleştirilir.
+        """
+        self.db_path = db_path
+        self.table = table
+        self.conn = sqlite3.connect(db_path)
+
+        # Toplu yazma için ayarlar
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")
+
+        self._ensure_schema()
+        self._upsert_sql = self._build_upsert_sql()
+        self.skipped_duplicates = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _quote(self, name):
+        return '"' + name.replace('"', '""') + '"'
+
+    def _ensure_schema(self):
+        """Tabloyu ve indeksleri oluştur; eski `to_sql` tablolarını yerinde dönüştür"""
+        table = self._quote(self.table)
+        kind = self.conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = ?", (self.table,)).fetchone()
+        if kind is not None and kind[0] != 'table':
+            # Normalize şemanın `chat_analysis` görünümüne yazılamaz
+            self.conn.close()
+            raise ValueError(f"{self.db_path}: '{self.table}' bir tablo değil ({kind[0]}); normalize "
+                             "şema (NormalizedChatStore) için save_to_sqlite(..., normalized=True) "
+                             "kullanın veya başka bir dosya seçin")
+
+        unique_index = 'ux_' + self.table + '_message'
+        existing = [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+        has_unique_index = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (unique_index,)
+        ).fetchone() is not None
+
+        with self.conn:
+            if not existing:
+                self.conn.execute(f"""
+                    CREATE TABLE {table} (
+                        conversation_id TEXT NOT NULL DEFAULT '',
+                        message_id,
+                        timestamp TEXT,
+                        sender TEXT,
+                        message TEXT,
+                        "yanıtlanmış_mı" TEXT,
+                        sentiment TEXT,
+                        kategori TEXT,
+                        intent TEXT
+                    )
+                """)
+            elif not has_unique_index:
+                for column in self.COLUMNS:
+                    if column not in existing:
+                        default = " NOT NULL DEFAULT ''" if column == 'conversation_id' else ''
+                        self.conn.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {self._quote(column)}{default}")
+
+                # Eski tablolarda olası tekrarları benzersiz indeksten önce temizle
+                self.conn.execute(f"""
+                    DELETE FROM {table} WHERE rowid NOT IN (
+                        SELECT MAX(rowid) FROM {table} GROUP BY conversation_id, message_id
+                    )
+                """)
+
+            self.conn.execute(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS {self._quote(unique_index)} "
+                f"ON {table} (conversation_id, message_id)")
+
+            for column in self.INDEXED_COLUMNS:
+                index = self._quote(f"ix_{self.table}_{column}")
+                self.conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {table} ({self._quote(column)})")
+
+    def _build_upsert_sql(self):
+        """Yeni satırı ekleyen, yalnızca etiketler değiştiyse güncelleyen upsert sorgusu"""
+        table = self._quote(self.table)
+        columns = ', '.join(self._quote(column) for column in self.COLUMNS)
+        placeholders = ', '.join('?' for _ in self.COLUMNS)
+        updates = ', '.join(f"{self._quote(column)} = excluded.{self._quote(column)}"
+                            for column in self.COLUMNS[2:])
+        changed = ' OR '.join(f"{table}.{self._quote(column)} IS NOT excluded.{self._quote(column)}"
+                              for column in self.COMPARED_COLUMNS)
+
+        return (f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT (conversation_id, message_id) DO UPDATE SET {updates} "
+                f"WHERE {changed}")
+
+    def _to_params(self, row, conversation_id):
+        """Analiz satırını sorgu parametrelerine çevir"""
+        row_conversation_id = row.get('conversation_id', conversation_id)
+        return (
+            '' if row_conversation_id is None else str(row_conversation_id),
+            *(row.get(column) for column in self.COLUMNS[1:])
+        )
+
+    def write(self, rows, conversation_id=None, batch_size=5000):
+        """
+        Satırları parti parti, her parti tek işlemde olacak şekilde yaz.
+        Eklenen veya değişen satır sayısını döndürür.
+        """
+        return self.write_params((self._to_params(row, conversation_id) for row in rows), batch_size)
+
+    def write_table(self, table, conversation_id=None, batch_size=5000):
+        """AnalysisResultTable satırlarını sözlüğe çevirmeden yaz"""
+        return self.write_params(table.iter_db_rows(conversation_id), batch_size)
+
+    def write_params(self, params, batch_size=5000):
+        """
+        COLUMNS sırasındaki parametre demetlerini parti parti yaz
+        Aynı çağrıda (conversation_id, message_id) anahtarı tekrarlanan satırlar birbirinin
+        üzerine yazılmaz: ilk satır yazılır, tekrarlar atlanıp uyarı verilir ve
+        `skipped_duplicates` içinde sayılır.
+        """
+        changes_before = self.conn.total_changes
+        params = iter(params)
+        seen = set()
+        duplicates = []
+
+        while True:
+            batch = list(islice(params, batch_size))
+            if not batch:
+                break
+
+            unique = []
+            for row in batch:
+                key = (row[0], row[1])
+                if key in seen:
+                    duplicates.append(key)
+                    continue
+                seen.add(key)
+                unique.append(row)
+
+            with self.conn:
+                self.conn.executemany(self._upsert_sql, unique)
+
+        self.skipped_duplicates = len(duplicates)
+        if duplicates:
+            examples = ', '.join(repr(key) for key in list(dict.fromkeys(duplicates))[:3])
+            print(f"Uyarı: {len(duplicates)} satırın (conversation_id, message_id) anahtarı aynı "
+                  f"yazmada tekrarlandığı için yazılmadı (ör. {examples}). Birden çok konuşma "
+                  f"içeren veride mesajlara conversation_id ekleyin.")
+
+        return self.conn.total_changes - changes_before
+
+    def count(self):
+        """Tablodaki satır sayısı"""
+        return self.conn.execute(f"SELECT COUNT(*) FROM {self._quote(self.table)}").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,168 @@
+import json
+
+# Sayının devamı olabilecek karakterler ("1." + "5", "1e" + "3", "-" + "2")
+NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+class JsonStreamReader:
+    def __init__(self, file, chunk_size=65536):
+        """
+        Büyük JSON belgelerini parça parça okuyan artımlı ayrıştırıcı.
+        Yalnızca o an çözülen değer bellekte tutulur.
+        """
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        """Tampona yeni bir parça oku; dosya sonundaysa False döndür"""
+        if self.eof:
+            return False
+
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+
+        # Tüketilmiş kısmı at, tampon büyümesin
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Boşlukları atla ve sıradaki karakteri döndür ('' = dosya sonu)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        """Sıradaki karakterin beklenen karakter olduğunu doğrula ve tüket"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Geçersiz JSON: '{char}' beklenirken '{found}' bulundu")
+        self.pos += 1
+
+    def decode(self):
+        """Sıradaki tam JSON değerini çöz"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                # Değer henüz tamponda bitmedi
+                if not self._fill():
+                    raise
+                continue
+
+            # Tampon sonunda biten değer (ör. sayı) devam ediyor olabilir
+            if end == len(self.buffer) and self._fill():
+                continue
+
+            # Parça sınırı sayının ortasına düştüyse ("1." | "5") raw_decode sayının baş kısmını
+            # kabul eder; sayıdan sonra gerçek bir ayırıcı gelene kadar okumaya devam edilir
+            if (isinstance(value, (int, float)) and not isinstance(value, bool)
+                    and all(char in NUMBER_CHARS for char in self.buffer[end:])
+                    and self._fill()):
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """Sıradaki JSON dizisinin elemanlarını tek tek üret"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.decode()
+
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError(f"Geçersiz JSON: dizi içinde beklenmeyen '{char}'")
+
+    def iter_messages(self):
+        """{"messages": [...]}, mesaj dizisi veya tek mesaj belgesindeki mesajları üret"""
+        char = self.peek()
+
+        if char == '[':
+            yield from self.iter_array()
+            return
+
+        if char != '{':
+            yield self.decode()
+            return
+
+        # Üst düzey nesne: "messages" dizisi akış halinde, diğer alanlar normal okunur
+        self.expect('{')
+        fields = {}
+        found_messages = False
+
+        if self.peek() == '}':
+            self.pos += 1
+        else:
+            while True:
+                key = self.decode()
+                self.expect(':')
+
+                if key == 'messages' and self.peek() == '[':
+                    found_messages = True
+                    # Konuşma kimliği mesajlara taşınır (NDJSON konuşma kayıtlarıyla aynı);
+                    # akış bozulmasın diye yalnızca "messages" dizisinden önce geldiyse
+                    conversation_id = fields.get('conversation_id')
+                    for message in self.iter_array():
+                        if conversation_id is not None and isinstance(message, dict):
+                            message.setdefault('conversation_id', conversation_id)
+                        yield message
+                else:
+                    fields[key] = self.decode()
+
+                char = self.peek()
+                self.pos += 1
+                if char == '}':
+                    break
+                if char != ',':
+                    raise ValueError(f"Geçersiz JSON: nesne içinde beklenmeyen '{char}'")
+
+        # "messages" yoksa belge tek bir mesajdır
+        if not found_messages:
+            yield fields
+
+
+def iter_ndjson_messages(file):
+    """Her satırı bir mesaj (veya {"messages": [...]} konuşması) olan NDJSON dosyasını oku"""
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+
+        record = json.loads(line)
+        if isinstance(record, dict) and isinstance(record.get('messages'), list):
+            # Konuşma kaydının kimliği mesajlara taşınır (mesajda varsa korunur)
+            conversation_id = record.get('conversation_id')
+            for message in record['messages']:
+                if conversation_id is not None and isinstance(message, dict):
+                    message.setdefault('conversation_id', conversation_id)
+                yield message
+        else:
+            yield record
+
+
+def iter_messages(path, chunk_size=65536):
+    """Dosya uzantısına göre JSON veya NDJSON mesajlarını akış halinde oku"""
+    with open(path, 'r', encoding='utf-8-sig') as file:
+        if path.endswith(('.ndjson', '.jsonl')):
+            yield from iter_ndjson_messages(file)
+        else:
+            yield from JsonStreamReader(file, chunk_size).iter_messages()
@@ -1,57 +1,71 @@
+import argparse
+import heapq
 import json
 import random
 from datetime import datetime, timedelta
 
-def generate_sample_data():
-    """Test için örnek sohbet verisi oluştur"""
-    
-    sample_messages = [
-        # Düğün mekanı soruları
-        "Merhaba, düğün mekanı arıyorum. Bahçeli bir yer var mı?",
-        "İstanbul'da 200 kişilik düğün salonu önerebilir misiniz?",
-        "Düğün mekanı fiyatları nasıl? Bütçem 50.000 TL",
-        
-        # Gelinlik soruları  
-        "Gelinlik modelleri görebilir miyim?",
-        "Prenses model gelinlik var mı? Fiyatı ne kadar?",
-        "Gelinlik ölçü aldırma nasıl oluyor?",
-        
-        # Fotoğrafçı soruları
-        "Düğün fotoğrafçısı rezervasyonu nasıl yapabilirim?",
-        "Fotoğraf paketleriniz neler? Fiyat listesi var mı?",
-        "Düğün albümü kaç günde hazır oluyor?",
-        
-        # Pozitif yorumlar
-        "Çok güzel hizmet veriyorsunuz, teşekkür ederim!",
-        "Fotoğraflar harika olmuş, çok memnun kaldık",
-        "Personel çok ilgili ve profesyonel",
-        
-        # Şikayetler
-        "Randevuma geç kaldınız, memnun değilim",
-        "Fiyatlar çok pahalı, başka seçenek var mı?",
-        "Aradığım ürünü bulamadım, yardım edebilir misiniz?",
-        
-        # Genel sorular
-        "Çalışma saatleriniz nedir?",
-        "Hangi şehirlerde hizmet veriyorsunuz?",
-        "Online ödeme yapabilir miyim?",
-        
-        # Yanıtlar
-        "Tabii ki! Size uygun seçenekleri gösterebilirim",
-        "Elbette, detaylı bilgi için randevu alabilirsiniz",
-        "Maalesef o tarih dolu, başka tarih önerebilirim",
-        "Teşekkür ederiz! Memnuniyetiniz bizim için önemli",
-        "Özür dileriz, sorununuzu çözmek için elimizden geleni yapacağız"
-    ]
+SAMPLE_MESSAGES = [
+    # Düğün mekanı soruları
+    "Merhaba, düğün mekanı arıyorum. Bahçeli bir yer var mı?",
+    "İstanbul'da 200 kişilik düğün salonu önerebilir misiniz?",
+    "Düğün mekanı fiyatları nasıl? Bütçem 50.000 TL",
+
+    # Gelinlik soruları  
+    "Gelinlik modelleri görebilir miyim?",
+    "Prenses model gelinlik var mı? Fiyatı ne kadar?",
+    "Gelinlik ölçü aldırma nasıl oluyor?",
+
+    # Fotoğrafçı soruları
+    "Düğün fotoğrafçısı rezervasyonu nasıl yapabilirim?",
+    "Fotoğraf paketleriniz neler? Fiyat listesi var mı?",
+    "Düğün albümü kaç günde hazır oluyor?",
+
+    # Pozitif yorumlar
+    "Çok güzel hizmet veriyorsunuz, teşekkür ederim!",
+    "Fotoğraflar harika olmuş, çok memnun kaldık",
+    "Personel çok ilgili ve profesyonel",
+
+    # Şikayetler
+    "Randevuma geç kaldınız, memnun değilim",
+    "Fiyatlar çok pahalı, başka seçenek var mı?",
+    "Aradığım ürünü bulamadım, yardım edebilir misiniz?",
+
+    # Genel sorular
+    "Çalışma saatleriniz nedir?",
+    "Hangi şehirlerde hizmet veriyorsunuz?",
+    "Online ödeme yapabilir miyim?",
+
+    # Yanıtlar
+    "Tabii ki! Size uygun seçenekleri gösterebilirim",
+    "Elbette, detaylı bilgi için randevu alabilirsiniz",
+    "Maalesef o tarih dolu, başka tarih önerebilirim",
+    "Teşekkür ederiz! Memnuniyetiniz bizim için önemli",
+    "Özür dileriz, sorununuzu çözmek için elimizden geleni yapacağız"
+]
+
+# Sentetik konuşmalarda rollere göre mesaj havuzları (SAMPLE_MESSAGES gruplarından)
+CUSTOMER_QUESTIONS = SAMPLE_MESSAGES[0:9] + SAMPLE_MESSAGES[13:18]
+CUSTOMER_COMMENTS = SAMPLE_MESSAGES[9:13]
+SUPPORT_REPLIES = SAMPLE_MESSAGES[18:23]
+
+def generate_sample_data(num_messages=50, conversation_id="dugum_buketi_001",
+                         output_file='sample_chat_data.json', seed=None):
+    """
+    Test için örnek sohbet verisi oluştur
+    output_file=None ise dosyaya yazılmaz; seed verilirse çıktı tekrarlanabilir olur
+    (zaman damgaları da şimdiki zaman yerine sabit bir tarihten başlar).
+    """
+    rng = random.Random(seed)
     
     senders = ['müşteri_1', 'müşteri_2', 'müşteri_3', 'destek_1', 'destek_2']
     user_types = ['customer', 'support']
     
     messages = []
-    base_time = datetime.now() - timedelta(days=7)
+    now = datetime(2024, 1, 8, 9, 0, 0) if seed is not None else datetime.now()
+    base_time = now - timedelta(days=7)
     
-    for i in range(50):  # 50 mesaj oluştur
-        sender = random.choice(senders)
+    for i in range(num_messages):
+        sender = rng.choice(senders)
         user_type = 'customer' if 'müşteri' in sender else 'support'
         
         message = {
@@ -59,22 +73,141 @@ def generate_sample_data():
             "timestamp": (base_time + timedelta(minutes=i*10)).isoformat(),
             "sender": sender,
             "user_type": user_type,
-            "message": random.choice(sample_messages)
+            "message": rng.choice(SAMPLE_MESSAGES)
         }
         messages.append(message)
     
     conversation_data = {
-        "conversation_id": "dugum_buketi_001",
-        "date": datetime.now().isoformat(),
+        "conversation_id": conversation_id,
+        "date": now.isoformat(),
         "messages": messages
     }
     
     # JSON dosyasına kaydet
-    with open('sample_chat_data.json', 'w', encoding='utf-8') as f:
-        json.dump(conversation_data, f, ensure_ascii=False, indent=2)
+    if output_file:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(conversation_data, f, ensure_ascii=False, indent=2)
+        
+        print(f"Örnek veri oluşturuldu: {output_file}")
     
-    print("Örnek veri oluşturuldu: sample_chat_data.json")
     return conversation_data
 
+def iter_synthetic_messages(num_messages=1000, num_conversations=20, seed=None,
+                            concurrency=200, answer_rate=0.8, start_time=None):
+    """
+    Çok sayıda konuşmanın zaman sırasıyla iç içe geçtiği sentetik mesaj akışı (üretici)
+    Müşteriler soru veya yorum yazar; sorular answer_rate olasılıkla destek ekibinden
+    birkaç dakika içinde yanıt alır. Aynı anda en fazla concurrency konuşma açıktır,
+    bu yüzden bellek kullanımı mesaj sayısından bağımsızdır (10^7 mesaj akış halinde üretilir).
+    Her mesaj conversation_id alanı taşır; aynı seed ile çıktı aynıdır.
+    """
+    rng = random.Random(seed)
+    num_conversations = max(1, min(num_conversations, num_messages))
+    base, extra = divmod(num_messages, num_conversations)
+    start_time = start_time or datetime(2024, 1, 1, 9, 0, 0)
+    
+    # (zaman, sıra, konuşma, rol); yanıtlar ve sonraki müşteri mesajları zamanlanır
+    events = []
+    conversations = {}
+    sequence = 0
+    opened = 0
+    
+    def open_conversation(at):
+        nonlocal opened, sequence
+        quota = base + (1 if opened < extra else 0)
+        state = {
+            'id': f"dugum_buketi_{opened:07d}",
+            'quota': quota,
+            'sent': 0,
+            'customers': [f"müşteri_{rng.randint(1, 99999)}" for _ in range(rng.randint(1, 2))],
+            'agent': f"destek_{rng.randint(1, 50)}"
+        }
+        conversations[opened] = state
+        heapq.heappush(events, (at + rng.uniform(0, 600), sequence, opened, 'customer'))
+        sequence += 1
+        opened += 1
+    
+    # Zamanlar başlangıçtan itibaren saniye; saat diliminden bağımsız
+    while opened < min(concurrency, num_conversations):
+        open_conversation(0.0)
+    
+    while events:
+        at, _, index, role = heapq.heappop(events)
+        state = conversations.get(index)
+        if state is None:
+            continue  # Kotası dolmuş konuşmanın artık olayı
+        
+        if role == 'customer':
+            is_question = rng.random() < 0.6
+            text = rng.choice(CUSTOMER_QUESTIONS if is_question else CUSTOMER_COMMENTS)
+            sender = rng.choice(state['customers'])
+        else:
+            is_question = False
+            text = rng.choice(SUPPORT_REPLIES)
+            sender = state['agent']
+        
+        state['sent'] += 1
+        yield {
+            "id": state['sent'],
+            "conversation_id": state['id'],
+            "timestamp": (start_time + timedelta(seconds=at)).isoformat(timespec='seconds'),
+            "sender": sender,
+            "user_type": role,
+            "message": text
+        }
+        
+        if state['sent'] >= state['quota']:
+            del conversations[index]
+            if opened < num_conversations:
+                open_conversation(at)
+            continue
+        
+        if is_question and rng.random() < answer_rate:
+            heapq.heappush(events, (at + rng.uniform(30, 900), sequence, index, 'support'))
+            sequence += 1
+        heapq.heappush(events, (at + rng.expovariate(1 / 600), sequence, index, 'customer'))
+        sequence += 1
+
+def write_synthetic_data(output_file, num_messages=1000, num_conversations=20, seed=None, **options):
+    """
+    Sentetik mesajları akış halinde dosyaya yaz
+    .ndjson/.jsonl: satır başına bir mesaj; .json: {"messages": [...]} (conversation_id alanlı)
+    """
+    messages = iter_synthetic_messages(num_messages, num_conversations, seed, **options)
+    count = 0
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        if output_file.endswith(('.ndjson', '.jsonl')):
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False))
+                f.write('\n')
+                count += 1
+        else:
+            f.write('{"messages": [\n')
+            for message in messages:
+                if count:
+                    f.write(',\n')
+                f.write(json.dumps(message, ensure_ascii=False))
+                count += 1
+            f.write('\n]}\n')
+    
+    print(f"Sentetik veri oluşturuldu: {output_file} ({count} mesaj, {num_conversations} konuşma)")
+    return output_file
+
 if __name__ == "__main__":
-    generate_sample_data()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Örnek veya sentetik sohbet verisi oluştur")
+    parser.add_argument('--messages', type=int, default=None,
+                        help="Sentetik mesaj sayısı (verilmezse 50 mesajlık örnek veri)")
+    parser.add_argument('--conversations', type=int, default=None, help="Konuşma sayısı")
+    parser.add_argument('--concurrency', type=int, default=200, help="Aynı anda açık konuşma")
+    parser.add_argument('--answer-rate', type=float, default=0.8, help="Yanıtlanan soru oranı")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--output', default=None, help="Çıktı dosyası (.json veya .ndjson)")
+    args = parser.parse_args()
+    
+    if args.messages is None:
+        generate_sample_data(output_file=args.output or 'sample_chat_data.json', seed=args.seed)
+    else:
+        write_synthetic_data(args.output or 'synthetic_chat_data.ndjson', args.messages,
+                             args.conversations or max(1, args.messages // 50), args.seed,
+                             concurrency=args.concurrency, answer_rate=args.answer_rate)
\ No newline at end of file
@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import iter_synthetic_messages
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return DugumBuketiChatAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def document():
+    messages = []
+    for position, message in enumerate(iter_synthetic_messages(300, 1, seed=5)):
+        # Yalnızca bazı mesajların kendi conversation_id'si var
+        if position % 3:
+            del message['conversation_id']
+        messages.append(message)
+    return {'conversation_id': 'dugum_buketi_belge', 'messages': messages}
+
+
+def assert_same_rows(table, rows):
+    pd.testing.assert_frame_equal(table.to_dataframe().astype(object), pd.DataFrame(rows).astype(object))
+
+
+def test_table_matches_dict_rows(analyzer, document):
+    rows = analyzer.analyze_conversation(document)
+    table = analyzer.analyze_conversation(document, table=analyzer.new_result_table())
+
+    assert_same_rows(table, rows)
+    assert {row['conversation_id'] for row in rows} == {'dugum_buketi_belge', 'dugum_buketi_0000000'}
+
+
+def test_explicit_conversation_id(analyzer, document):
+    rows = analyzer.analyze_conversation(document, conversation_id='verilen')
+    table = analyzer.analyze_conversation(document, table=analyzer.new_result_table(),
+                                          conversation_id='verilen')
+
+    assert_same_rows(table, rows)
+    assert {row['conversation_id'] for row in rows} == {'verilen'}
@@ -0,0 +1,43 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from answer_matcher import parse_timestamp
+from rolling_metrics import RollingMetrics
+
+LABELS = ('Hayır', 'Nötr', 'Fiyat sorgusu', 'Bilgi talebi')
+
+
+@pytest.fixture
+def istanbul(monkeypatch):
+    """UTC dışı yerel saat dilimi (UTC+3)"""
+    monkeypatch.setenv('TZ', 'Etc/GMT-3')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_naive_timestamp_is_local_time(istanbul):
+    assert parse_timestamp('2024-06-01T12:00:00') == parse_timestamp('2024-06-01T12:00:00+03:00')
+
+
+def test_naive_now_stays_in_window_after_advance(istanbul):
+    metrics = RollingMetrics(windows=(3600,))
+    # Analiz sistemi ve veri üreteci saat dilimsiz yerel saat yazar
+    assert metrics.add((datetime.now() - timedelta(minutes=30)).isoformat(), LABELS)
+    metrics.advance()
+
+    report = metrics.report(3600)
+    assert report['toplam_mesaj'] == 1
+    assert report['yanıtlanmamış_soru'] == 1
+    # Mesaj gelecekteki bir kovaya düşmez
+    assert parse_timestamp(report['bitiş']) <= time.time() + metrics.bucket_seconds
+
+
+def test_advance_drops_naive_timestamp_outside_window(istanbul):
+    metrics = RollingMetrics(windows=(3600,))
+    metrics.add((datetime.now() - timedelta(hours=2)).isoformat(), LABELS)
+    metrics.advance()
+    assert metrics.report(3600)['toplam_mesaj'] == 0
@@ -0,0 +1,46 @@
+import io
+import json
+
+import pytest
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from stream_reader import JsonStreamReader, iter_messages
+from test_data_generator import iter_synthetic_messages
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return DugumBuketiChatAnalyzer()
+
+
+@pytest.fixture(scope='module')
+def conversation():
+    messages = []
+    for message in iter_synthetic_messages(200, 1, seed=3):
+        message.pop('conversation_id')
+        messages.append(message)
+    # Kendi kimliği olan mesaj korunur
+    messages[1]['conversation_id'] = 'başka'
+    return {'conversation_id': 'dugum_buketi_7', 'messages': messages}
+
+
+def test_json_and_ndjson_rows_match(analyzer, conversation, tmp_path):
+    json_path = tmp_path / 'export.json'
+    ndjson_path = tmp_path / 'export.ndjson'
+    json_path.write_text(json.dumps(conversation, ensure_ascii=False), encoding='utf-8')
+    ndjson_path.write_text(json.dumps(conversation, ensure_ascii=False) + '\n', encoding='utf-8')
+
+    json_rows = list(analyzer.analyze_stream(iter_messages(str(json_path))))
+    ndjson_rows = list(analyzer.analyze_stream(iter_messages(str(ndjson_path))))
+
+    assert json_rows == ndjson_rows
+    assert len(json_rows) == len(conversation['messages'])
+    assert json_rows[0]['conversation_id'] == 'dugum_buketi_7'
+    assert json_rows[1]['conversation_id'] == 'başka'
+
+
+def test_small_chunks_carry_conversation_id(conversation):
+    text = json.dumps(conversation, ensure_ascii=False)
+    messages = list(JsonStreamReader(io.StringIO(text), chunk_size=7).iter_messages())
+    assert [message['conversation_id'] for message in messages[:3]] == [
+        'dugum_buketi_7', 'başka', 'dugum_buketi_7']
@@ -0,0 +1,74 @@
+import pickle
+
+import pytest
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from turkish_text import TokenKeywordMatcher, TurkishStemmer, tokenize
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return DugumBuketiChatAnalyzer(matching='token')
+
+
+@pytest.fixture(scope='module')
+def matcher(analyzer):
+    return analyzer.keyword_matcher
+
+
+def test_tokenize_turkish_case():
+    assert tokenize('IŞIKLI SALONLARINIZ, HANGİ İLÇEDE?') == ['ışıklı', 'salonlarınız', 'hangi', 'ilçede']
+
+
+@pytest.mark.parametrize('token, lemma', [
+    ('salonlarınız', 'salon'),
+    ('çiçekleri', 'çiçek'),
+    ('paranız', 'para'),
+    ('bütçemiz', 'bütçe'),
+    ('sorum', 'soru'),
+    ('sorunu', 'sorun'),
+    ('gelinim', 'gelin'),
+    ('memnunum', 'memnun'),
+    ('değiştirebilir', 'değiştir'),
+])
+def test_inflected_forms_reach_keyword(matcher, token, lemma):
+    assert matcher.lemma(token) == lemma
+
+
+@pytest.mark.parametrize('token', ['gelinlik', 'gelin', 'memnun', 'sorun', 'soru', 'kimlik'])
+def test_keyword_is_not_shortened(matcher, token):
+    # Anahtar kelimenin kendisi (ya da yapım ekli kelime) başka bir köke inmez
+    assert matcher.lemma(token) == token
+
+
+def test_derivational_suffixes_are_kept():
+    stemmer = TurkishStemmer()
+    assert 'kim' not in stemmer.candidates('kimlik')
+    assert 'gelin' not in stemmer.candidates('gelinlik')
+    assert stemmer.stem('kimliğim') == 'kimlik'
+
+
+def test_question_not_read_as_problem(analyzer):
+    assert analyzer.analyze_sentiment('Bir sorum var') == 'Nötr'
+    assert analyzer.analyze_sentiment('Bir sorun var') == 'Negatif'
+
+
+def test_kimlik_is_not_question(analyzer):
+    assert not analyzer.is_question('Kimlik belgesi lazım')
+    assert analyzer.is_question('Kime ödeme yapacağız')
+
+
+def test_possessive_after_vowel(analyzer):
+    assert analyzer.classify_category('Paranız iade edilir mi') == 'Fiyat sorgusu'
+    assert analyzer.classify_category('Bütçemiz biraz kısıtlı') == 'Fiyat sorgusu'
+
+
+def test_multi_word_keyword():
+    matcher = TokenKeywordMatcher({'intent': {'Şikayet': ['memnun değil']}})
+    assert matcher.find_keywords('hiç memnun değilim') == {'memnun değil'}
+    assert matcher.find_keywords('çok memnunum') == set()
+
+
+def test_pickle_keeps_lemma_cache_usable(matcher):
+    restored = pickle.loads(pickle.dumps(matcher))
+    assert restored.lemma('sorum') == 'soru'
@@ -0,0 +1,50 @@
+import random
+
+import pandas as pd
+import pytest
+
+from chat_analyzer import DugumBuketiChatAnalyzer
+from test_data_generator import SAMPLE_MESSAGES
+
+# Normalizasyon ve eşleştirme sınırlarını zorlayan örnekler
+EDGE_CASES = [
+    '', '   ', None, 42, float('nan'),
+    'İSTANBUL DÜĞÜN SALONU?', 'IŞIK ŞÖLENİ ÇİÇEK', 'Memnun değil miyim?!',
+    'memnun değilim ama güzel', 'salon önerisi, mekan arıyorum...',
+    'fotoğraf/video çekim paketi', 'ne kadar? ne zaman? nasıl?', 'dj—canlı müzik\torkestra\n',
+    'ŞEKER nikah şekeri bonbon', 'snake_case\x1cayırıcı\u00a0boşluk', 'kaç lira kaç lira',
+    'teşekkürler, sağolun 🙏'
+]
+
+
+@pytest.fixture(scope='module')
+def analyzer():
+    return DugumBuketiChatAnalyzer()
+
+
+def assert_equivalent(analyzer, texts):
+    """classify_series çıktısı tek mesajlık yöntemlerle aynı olmalı"""
+    result = analyzer.classify_series(pd.Series(texts, dtype=object))
+    assert len(result) == len(texts)
+
+    for position, text in enumerate(texts):
+        expected = (analyzer.analyze_sentiment(text), analyzer.classify_category(text),
+                    analyzer.classify_intent(text))
+        actual = tuple(result.iloc[position][['sentiment', 'kategori', 'intent']])
+        assert actual == expected, f"Uyuşmazlık: {text!r}"
+
+
+def test_edge_cases(analyzer):
+    assert_equivalent(analyzer, EDGE_CASES + SAMPLE_MESSAGES)
+
+
+@pytest.mark.parametrize('seed', [1, 42])
+def test_random_sample(analyzer, seed):
+    rng = random.Random(seed)
+    texts = [f"{rng.choice(SAMPLE_MESSAGES)} #{index}" for index in range(2000)]
+    assert_equivalent(analyzer, texts)
+
+
+def test_repeated_texts(analyzer):
+    rng = random.Random(7)
+    assert_equivalent(analyzer, [rng.choice(EDGE_CASES[5:] + SAMPLE_MESSAGES) for _ in range(2000)])
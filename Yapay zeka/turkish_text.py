@@ -0,0 +1,224 @@
+import re
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher
+
+# str.lower() 'I' harfini 'i', 'İ' harfini 'i' + birleşik nokta (U+0307) yapar
+TURKISH_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+
+_NON_WORD = re.compile(r'\W+')
+
+VOWELS = frozenset('aeıioöuü')
+
+
+def turkish_lower(text):
+    """Türkçe kurallarıyla küçük harfe çevir ('I' -> 'ı', 'İ' -> 'i')"""
+    return text.translate(TURKISH_LOWER).lower()
+
+
+def tokenize(text):
+    """Türkçe küçük harfe çevrilmiş metnin kelimeleri (noktalama ayırıcıdır)"""
+    return _NON_WORD.sub(' ', turkish_lower(text)).split()
+
+
+class TurkishStemmer:
+    # Yalnızca çekim ekleri (yapım ekleri atılmaz: kimlik -> kim, gelinlik -> gelin olmaz);
+    # uzun ekler önce denenir
+    SUFFIXES = tuple(sorted({
+        # çoğul ve iyelik (ünsüzden sonra)
+        'larımız', 'lerimiz', 'larınız', 'leriniz', 'ları', 'leri', 'lar', 'ler',
+        'ımız', 'imiz', 'umuz', 'ümüz', 'ınız', 'iniz', 'unuz', 'ünüz',
+        'ım', 'im', 'um', 'üm', 'ın', 'in', 'un', 'ün',
+        # iyelik (ünlüden sonra: paranız, bütçemiz, fiyatı/bütçesi)
+        'mız', 'miz', 'muz', 'müz', 'nız', 'niz', 'nuz', 'nüz', 'm', 'n',
+        'sı', 'si', 'su', 'sü',
+        # hal ekleri
+        'ndan', 'nden', 'ında', 'inde', 'unda', 'ünde', 'nda', 'nde',
+        'dan', 'den', 'tan', 'ten', 'da', 'de', 'ta', 'te',
+        'nın', 'nin', 'nun', 'nün', 'yla', 'yle', 'la', 'le',
+        'ya', 'ye', 'yı', 'yi', 'yu', 'yü', 'nı', 'ni', 'nu', 'nü',
+        # soru ve ek-eylem
+        'mısınız', 'misiniz', 'musunuz', 'müsünüz', 'mıyım', 'miyim',
+        'mı', 'mi', 'mu', 'mü', 'dır', 'dir', 'dur', 'dür', 'tır', 'tir', 'tur', 'tür',
+        # yeterlilik (değiştirebilir, önerebilir)
+        'abilir', 'ebilir',
+        # tek ünlü (belirtme/yönelme)
+        'ı', 'i', 'u', 'ü', 'a', 'e'
+    }, key=lambda suffix: (-len(suffix), suffix)))
+
+    def __init__(self, min_stem=3, max_suffixes=3, cache_size=100000):
+        """
+        Sözlük gerektirmeyen hafif Türkçe kök bulucu: kelime sonundan en uzun çekim ekini,
+        kök en az min_stem harf kalacak şekilde en fazla max_suffixes kez atar.
+        Ünlüyle başlayan ek atıldığında yumuşayan 'ğ' geri 'k' yapılır (çiçeği -> çiçek).
+        Sonuçlar en sık kelimeler için cache_size boyutlu LRU önbellekte tutulur.
+        """
+        self.min_stem = min_stem
+        self.max_suffixes = max_suffixes
+        self.cache_size = cache_size
+        self.stem = lru_cache(maxsize=cache_size)(self._stem)
+
+        # Son harfe göre ekler: her adımda yalnızca kelimenin son harfiyle biten ekler denenir
+        self._suffixes_by_last = {}
+        for suffix in self.SUFFIXES:
+            self._suffixes_by_last.setdefault(suffix[-1], []).append(suffix)
+
+    def __getstate__(self):
+        # lru_cache sarmalayıcısı seçilemez (pickle); süreçlere ayarlar aktarılır
+        return {'min_stem': self.min_stem, 'max_suffixes': self.max_suffixes,
+                'cache_size': self.cache_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _strip(self, stem, suffix):
+        """Eki at; ünlüyle başlayan ekten önce yumuşayan 'ğ' -> 'k'"""
+        stem = stem[:-len(suffix)]
+        if suffix[0] in VOWELS and stem.endswith('ğ'):
+            stem = stem[:-1] + 'k'
+        return stem
+
+    def _stem(self, token):
+        stem = token
+        for _ in range(self.max_suffixes):
+            for suffix in self._suffixes_by_last.get(stem[-1:], ()):
+                if stem.endswith(suffix) and len(stem) - len(suffix) >= self.min_stem:
+                    stem = self._strip(stem, suffix)
+                    break
+            else:
+                break
+        return stem
+
+    def candidates(self, token):
+        """
+        Kelimenin kendisi ve en fazla max_suffixes çekim eki atılarak elde edilebilen tüm kökler
+        (yalnızca en uzun eki atan `stem`in aksine her ek ayrımı denenir: sorum -> soru, sor)
+        """
+        found = {token}
+        level = [token]
+        for _ in range(self.max_suffixes):
+            next_level = []
+            for stem in level:
+                for suffix in self._suffixes_by_last.get(stem[-1:], ()):
+                    if stem.endswith(suffix) and len(stem) - len(suffix) >= self.min_stem:
+                        shorter = self._strip(stem, suffix)
+                        if shorter not in found:
+                            found.add(shorter)
+                            next_level.append(shorter)
+            if not next_level:
+                break
+            level = next_level
+        return found
+
+    def stem_tokens(self, tokens):
+        stem = self.stem
+        return [stem(token) for token in tokens]
+
+    def cache_info(self):
+        """Kök önbelleğinin isabet istatistikleri"""
+        return self.stem.cache_info()
+
+
+class TokenKeywordMatcher(KeywordMatcher):
+    def __init__(self, groups, stemmer=None):
+        """
+        KeywordMatcher'ın kelime tabanlı karşılığı. Anahtar kelimeler kelimelerine ayrılır ve
+        (kelime dizisi -> anahtar kelimeler) ters dizinine eklenir; anahtar kelimeler sözlük
+        biçimi (lemma) sayılır ve kısaltılmaz. Metindeki her kelime, çekim ekleri atılarak
+        ulaşılabilen köklerden (`TurkishStemmer.candidates`) dizindeki en uzun kelimeye
+        eşlenir: 'yer' yalnızca 'yer', 'yeri', 'yerde' gibi kelimelerle eşleşir; 'sorum'
+        'soru' ile, 'sorunu' 'sorun' ile eşleşir. Kelime eşlemeleri LRU önbellekte tutulur;
+        arama, kelime ve anahtar kelime uzunluğu başına tek sözlük erişimidir.
+        Metinler `tokenize` ile aynı biçimde normalize edilmiş olmalıdır.
+        """
+        self.labels = {}
+        self._keyword_labels = {}
+        self._label_weights = None
+        self._prefixes = {}
+        self._pattern = None
+        self.stemmer = stemmer or TurkishStemmer()
+
+        for group, label_keywords in groups.items():
+            labels = tuple(label_keywords)
+            self.labels[group] = labels
+            for label_index, label in enumerate(labels):
+                for keyword in label_keywords[label]:
+                    self._keyword_labels.setdefault(keyword, []).append((group, label_index))
+
+        # Boş anahtar kelime her metinde eşleşir; yalnızca noktalamadan oluşanlar ('?') hiçbir zaman
+        self._always = {''} if '' in self._keyword_labels else set()
+
+        self._index = {}
+        for keyword in self._keyword_labels:
+            words = tuple(tokenize(keyword))
+            if words:
+                self._index.setdefault(words, []).append(keyword)
+        self._lengths = sorted({len(words) for words in self._index})
+        self._vocabulary = frozenset(word for words in self._index for word in words)
+        self.lemma = lru_cache(maxsize=self.stemmer.cache_size)(self._lemma)
+
+    def __getstate__(self):
+        # lru_cache sarmalayıcısı seçilemez (pickle); süreçte yeniden oluşturulur
+        state = dict(self.__dict__)
+        del state['lemma']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lemma = lru_cache(maxsize=self.stemmer.cache_size)(self._lemma)
+
+    def _lemma(self, token):
+        """Kelimenin dizindeki en uzun kökü; yoksa kelimenin kendisi"""
+        vocabulary = self._vocabulary
+        if token in vocabulary:
+            return token
+        matches = [stem for stem in self.stemmer.candidates(token) if stem in vocabulary]
+        return max(matches, key=lambda stem: (len(stem), stem)) if matches else token
+
+    def lemmas(self, tokens):
+        lemma = self.lemma
+        return [lemma(token) for token in tokens]
+
+    def cache_info(self):
+        """Kelime eşleme önbelleğinin isabet istatistikleri"""
+        return self.lemma.cache_info()
+
+    def iter_matches(self, text):
+        """Her başlangıç kelimesinde eşleşen anahtar kelimeleri (kelime sırası, kelime) olarak üret"""
+        stems = self.lemmas(text.split())
+        index = self._index
+        for position in range(len(stems)):
+            for length in self._lengths:
+                if position + length > len(stems):
+                    break
+                keywords = index.get(tuple(stems[position:position + length]))
+                if keywords is not None:
+                    for keyword in keywords:
+                        yield position, keyword
+
+    def find_keywords(self, text):
+        """Metinde geçen farklı anahtar kelimelerin kümesini döndür"""
+        found = set(self._always)
+        if not text:
+            return found
+
+        stems = self.lemmas(text.split())
+        index = self._index
+        for length in self._lengths:
+            for position in range(len(stems) - length + 1):
+                keywords = index.get(tuple(stems[position:position + length]))
+                if keywords is not None:
+                    found.update(keywords)
+        return found
+
+    def hit_matrix(self, texts):
+        """Metin x anahtar kelime isabet matrisi (bool); her metin kelime dizininden taranır"""
+        import numpy as np
+
+        columns = self._weights()[0]
+        texts = list(texts)
+        hits = np.zeros((len(texts), len(columns)), dtype=bool)
+        for row, text in enumerate(texts):
+            for keyword in self.find_keywords(text):
+                hits[row, columns[keyword]] = True
+        return hits
@@ -1,136 +1,266 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import os
 import sqlite3
-from matplotlib import rcParams
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-# Türkçe karakter desteği
-rcParams['font.family'] = 'DejaVu Sans'
-plt.rcParams['axes.unicode_minus'] = False
+from report_engine import SQLiteReportEngine
+
+# matplotlib ilk grafik çiziminde yüklenir
+_plt = None
+
+def _configure_matplotlib():
+    """Türkçe karakter desteği için yazı tipi ayarları"""
+    from matplotlib import rcParams
+    
+    rcParams['font.family'] = 'DejaVu Sans'
+    rcParams['axes.unicode_minus'] = False
+
+def _pyplot():
+    """matplotlib.pyplot'u ilk kullanımda yükle ve yapılandır"""
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+        
+        _configure_matplotlib()
+        _plt = plt
+    return _plt
+
+def _palette(name, n):
+    """seaborn `color_palette(name, n)` ile aynı renkler (seaborn yüklemeden)"""
+    from matplotlib import colormaps
+    
+    cmap = colormaps[name]
+    if hasattr(cmap, 'colors') and cmap.N < 256:
+        # Nitel renk haritaları (Set2 vb.) sırayla, gerekirse başa dönerek kullanılır
+        return [cmap.colors[i % len(cmap.colors)] for i in range(n)]
+    return [cmap((i + 1) / (n + 1)) for i in range(n)]
+
+def _bar_chart(figure, counts, palette, title, ylabel):
+    """Yatay çubuk grafiği; değerler çubukların yanına yazılır"""
+    labels, values = counts
+    ax = figure.add_subplot()
+    ax.barh(range(len(labels)), values, color=_palette(palette, len(labels)))
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels)
+    ax.invert_yaxis()  # En sık değer en üstte
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.set_xlabel('Mesaj Sayısı', fontsize=12)
+    ax.set_ylabel(ylabel, fontsize=12)
+    
+    # Değerleri çubukların üzerine yaz
+    for i, v in enumerate(values):
+        ax.text(v + 0.1, i, str(v), va='center', fontweight='bold')
+
+def _pie_chart(figure, counts, colors, title):
+    labels, values = counts
+    ax = figure.add_subplot()
+    ax.pie(values, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.axis('equal')
+
+def draw_sentiment_distribution(figure, aggregates):
+    """Duygu dağılımı grafiği"""
+    _pie_chart(figure, aggregates['sentiment'], ['#2ecc71', '#e74c3c', '#95a5a6'],  # Yeşil, Kırmızı, Gri
+               'Müşteri Mesajları Duygu Dağılımı')
+
+def draw_category_distribution(figure, aggregates):
+    """Kategori dağılımı grafiği"""
+    _bar_chart(figure, aggregates['kategori'], 'viridis',
+               'Müşteri Sorularının Kategori Dağılımı', 'Kategori')
+
+def draw_unanswered_questions(figure, aggregates):
+    """Yanıtlanmamış sorular analizi"""
+    _pie_chart(figure, aggregates['yanıtlanmış_mı'], ['#e74c3c', '#2ecc71'],  # Kırmızı (Hayır), Yeşil (Evet)
+               'Müşteri Sorularının Yanıtlanma Durumu')
+
+def draw_intent_analysis(figure, aggregates):
+    """Amaç (intent) analizi"""
+    _bar_chart(figure, aggregates['intent'], 'Set2',
+               'Müşteri Mesajlarının Amaç Dağılımı', 'Amaç (Intent)')
+
+def draw_comprehensive_report(figure, aggregates):
+    """Dört grafiği tek sayfada birleştiren kapsamlı rapor"""
+    axes = figure.subplots(2, 2)
+    figure.suptitle('DüğünBuketi Müşteri Konuşmaları Analiz Raporu', 
+                    fontsize=18, fontweight='bold')
+    
+    # 1. Duygu Dağılımı
+    labels, values = aggregates['sentiment']
+    axes[0, 0].pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    axes[0, 0].set_title('Duygu Dağılımı')
+    
+    # 2. Yanıtlanma Durumu
+    labels, values = aggregates['yanıtlanmış_mı']
+    axes[0, 1].pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+    axes[0, 1].set_title('Yanıtlanma Durumu')
+    
+    # 3-4. En Çok Sorulan Kategoriler ve En Çok Görülen Amaçlar (Top 5)
+    for ax, column, title in ((axes[1, 0], 'kategori', 'En Çok Sorulan Kategoriler (Top 5)'),
+                              (axes[1, 1], 'intent', 'En Çok Görülen Amaçlar (Top 5)')):
+        labels, values = aggregates[column]
+        labels, values = labels[:5], values[:5]
+        ax.bar(range(len(labels)), values)
+        ax.set_xticks(range(len(labels)))
+        ax.set_xticklabels(labels, rotation=45, ha='right')
+        ax.set_title(title)
+        ax.set_ylabel('Mesaj Sayısı')
+
+# Grafik adı (dosya adı) -> (çizim fonksiyonu, şekil boyutu)
+CHARTS = {
+    'sentiment_distribution': (draw_sentiment_distribution, (10, 6)),
+    'category_distribution': (draw_category_distribution, (12, 8)),
+    'unanswered_questions': (draw_unanswered_questions, (10, 6)),
+    'intent_analysis': (draw_intent_analysis, (12, 8)),
+    'comprehensive_report': (draw_comprehensive_report, (16, 12))
+}
+
+def render_chart(name, aggregates, path, dpi=150, fmt='png'):
+    """
+    Grafiği pyplot kullanmadan (ekransız, Agg ile) dosyaya çiz
+    Süreç havuzunda çalışabilmesi için yalnızca seçilebilir (picklable) veri alır.
+    """
+    from matplotlib.figure import Figure
+    
+    _configure_matplotlib()
+    draw, size = CHARTS[name]
+    figure = Figure(figsize=size)
+    draw(figure, aggregates)
+    figure.tight_layout()
+    figure.savefig(path, dpi=dpi, format=fmt, bbox_inches='tight')
+    return path
 
 class ChatAnalysisVisualizer:
+    # Grafiklerin ve istatistiklerin kullandığı sütunlar
+    COLUMNS = ['yanıtlanmış_mı', 'sentiment', 'kategori', 'intent']
+    
     def __init__(self, data_source):
         """
-        data_source: CSV dosya yolu, SQLite DB yolu veya DataFrame
+        data_source: CSV dosya yolu, Parquet dosya yolu, SQLite DB yolu veya DataFrame
         """
+        import pandas as pd
+        
+        self._df = None
+        self._aggregates = None
+        self.report_engine = None
+        
         if isinstance(data_source, str):
             if data_source.endswith('.csv'):
-                self.df = pd.read_csv(data_source, encoding='utf-8-sig')
+                self._df = pd.read_csv(data_source, encoding='utf-8-sig')
+            elif data_source.endswith('.parquet'):
+                # Sütunlu dosyadan yalnızca gereken sütunlar okunur
+                self._df = pd.read_parquet(data_source, columns=self.COLUMNS)
             elif data_source.endswith('.db'):
-                conn = sqlite3.connect(data_source)
-                self.df = pd.read_sql_query("SELECT * FROM chat_analysis", conn)
-                conn.close()
+                # Sayımlar ve istatistikler SQL'de hesaplanır; tablo belleğe alınmaz
+                self.db_path = data_source
+                self.report_engine = SQLiteReportEngine(data_source)
         elif isinstance(data_source, pd.DataFrame):
-            self.df = data_source
+            self._df = data_source
         else:
             raise ValueError("Desteklenmeyen veri formatı")
     
-    def plot_sentiment_distribution(self):
-        """Duygu dağılımı grafiği"""
-        plt.figure(figsize=(10, 6))
-        sentiment_counts = self.df['sentiment'].value_counts()
-        
-        colors = ['#2ecc71', '#e74c3c', '#95a5a6']  # Yeşil, Kırmızı, Gri
-        plt.pie(sentiment_counts.values, labels=sentiment_counts.index, 
-                autopct='%1.1f%%', colors=colors, startangle=90)
+    @property
+    def df(self):
+        """Veri çerçevesi; SQLite kaynağında ilk erişimde yalnızca gereken sütunlarla yüklenir"""
+        if self._df is None and self.report_engine is not None:
+            import pandas as pd
+            
+            columns = ', '.join(f'"{column}"' for column in self.COLUMNS)
+            conn = sqlite3.connect(self.db_path)
+            self._df = pd.read_sql_query(f"SELECT {columns} FROM chat_analysis", conn)
+            conn.close()
+        return self._df
+    
+    def _value_counts(self, column):
+        """Sütundaki değer sayıları (SQLite kaynağında GROUP BY ile)"""
+        if self.report_engine is not None:
+            import pandas as pd
+            
+            return pd.Series(self.report_engine.value_counts(column), dtype='int64')
+        return self.df[column].value_counts()
+    
+    def aggregates(self):
+        """
+        Tüm grafiklerin kullandığı sayımlar: {sütun: (değerler, sayılar)}
+        Her sütun bir kez sayılır; sonraki grafikler ve raporlar aynı sonucu kullanır.
+        """
+        if self._aggregates is None:
+            aggregates = {}
+            for column in self.COLUMNS:
+                counts = self._value_counts(column)
+                aggregates[column] = ([str(label) for label in counts.index],
+                                      [int(value) for value in counts.values])
+            self._aggregates = aggregates
+        return self._aggregates
+    
+    def _show_chart(self, name):
+        """Grafiği pyplot ile çiz, 300 dpi olarak kaydet ve göster"""
+        plt = _pyplot()
         
-        plt.title('Müşteri Mesajları Duygu Dağılımı', fontsize=16, fontweight='bold')
-        plt.axis('equal')
+        draw, size = CHARTS[name]
+        figure = plt.figure(figsize=size)
+        draw(figure, self.aggregates())
         plt.tight_layout()
-        plt.savefig('sentiment_distribution.png', dpi=300, bbox_inches='tight')
+        plt.savefig(f'{name}.png', dpi=300, bbox_inches='tight')
         plt.show()
     
+    def plot_sentiment_distribution(self):
+        """Duygu dağılımı grafiği"""
+        self._show_chart('sentiment_distribution')
+    
     def plot_category_distribution(self):
         """Kategori dağılımı grafiği"""
-        plt.figure(figsize=(12, 8))
-        category_counts = self.df['kategori'].value_counts()
-        
-        sns.barplot(x=category_counts.values, y=category_counts.index, palette='viridis')
-        plt.title('Müşteri Sorularının Kategori Dağılımı', fontsize=16, fontweight='bold')
-        plt.xlabel('Mesaj Sayısı', fontsize=12)
-        plt.ylabel('Kategori', fontsize=12)
-        
-        # Değerleri çubukların üzerine yaz
-        for i, v in enumerate(category_counts.values):
-            plt.text(v + 0.1, i, str(v), va='center', fontweight='bold')
-        
-        plt.tight_layout()
-        plt.savefig('category_distribution.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._show_chart('category_distribution')
     
     def plot_unanswered_questions(self):
         """Yanıtlanmamış sorular analizi"""
-        plt.figure(figsize=(10, 6))
-        
-        answered_counts = self.df['yanıtlanmış_mı'].value_counts()
-        colors = ['#e74c3c', '#2ecc71']  # Kırmızı (Hayır), Yeşil (Evet)
-        
-        plt.pie(answered_counts.values, labels=answered_counts.index, 
-                autopct='%1.1f%%', colors=colors, startangle=90)
-        
-        plt.title('Müşteri Sorularının Yanıtlanma Durumu', fontsize=16, fontweight='bold')
-        plt.axis('equal')
-        plt.tight_layout()
-        plt.savefig('unanswered_questions.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._show_chart('unanswered_questions')
     
     def plot_intent_analysis(self):
         """Amaç (intent) analizi"""
-        plt.figure(figsize=(12, 8))
-        intent_counts = self.df['intent'].value_counts()
-        
-        sns.barplot(x=intent_counts.values, y=intent_counts.index, palette='Set2')
-        plt.title('Müşteri Mesajlarının Amaç Dağılımı', fontsize=16, fontweight='bold')
-        plt.xlabel('Mesaj Sayısı', fontsize=12)
-        plt.ylabel('Amaç (Intent)', fontsize=12)
-        
-        for i, v in enumerate(intent_counts.values):
-            plt.text(v + 0.1, i, str(v), va='center', fontweight='bold')
-        
-        plt.tight_layout()
-        plt.savefig('intent_analysis.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        self._show_chart('intent_analysis')
     
     def create_comprehensive_report(self):
         """Kapsamlı görsel rapor oluştur"""
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('DüğünBuketi Müşteri Konuşmaları Analiz Raporu', 
-                     fontsize=18, fontweight='bold')
-        
-        # 1. Duygu Dağılımı
-        sentiment_counts = self.df['sentiment'].value_counts()
-        axes[0, 0].pie(sentiment_counts.values, labels=sentiment_counts.index, 
-                       autopct='%1.1f%%', startangle=90)
-        axes[0, 0].set_title('Duygu Dağılımı')
-        
-        # 2. Yanıtlanma Durumu
-        answered_counts = self.df['yanıtlanmış_mı'].value_counts()
-        axes[0, 1].pie(answered_counts.values, labels=answered_counts.index, 
-                       autopct='%1.1f%%', startangle=90)
-        axes[0, 1].set_title('Yanıtlanma Durumu')
+        self._show_chart('comprehensive_report')
+    
+    def render_report(self, output_dir='raporlar', dpi=150, fmt='png', workers=None, charts=None):
+        """
+        Ekransız toplu rapor: sayımlar bir kez hesaplanır, grafikler ayrı süreçlerde
+        Agg ile çizilip output_dir dizinine yazılır (`plt.show()` çağrılmaz).
+        fmt: matplotlib'in desteklediği biçim (png, svg, pdf...)
+        workers: süreç sayısı; 1 ise grafikler bu süreçte sırayla çizilir
+        charts: çizilecek grafik adları (varsayılan: CHARTS içindeki tümü)
+        """
+        charts = list(charts or CHARTS)
+        unknown = [name for name in charts if name not in CHARTS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen grafik: {', '.join(unknown)}")
         
-        # 3. En Çok Sorulan Kategoriler (Top 5)
-        top_categories = self.df['kategori'].value_counts().head(5)
-        axes[1, 0].bar(range(len(top_categories)), top_categories.values)
-        axes[1, 0].set_xticks(range(len(top_categories)))
-        axes[1, 0].set_xticklabels(top_categories.index, rotation=45, ha='right')
-        axes[1, 0].set_title('En Çok Sorulan Kategoriler (Top 5)')
-        axes[1, 0].set_ylabel('Mesaj Sayısı')
+        os.makedirs(output_dir, exist_ok=True)
+        aggregates = self.aggregates()
+        paths = [os.path.join(output_dir, f'{name}.{fmt}') for name in charts]
+        workers = workers or min(len(charts), os.cpu_count() or 1)
         
-        # 4. En Çok Görülen Amaçlar (Top 5)
-        top_intents = self.df['intent'].value_counts().head(5)
-        axes[1, 1].bar(range(len(top_intents)), top_intents.values)
-        axes[1, 1].set_xticks(range(len(top_intents)))
-        axes[1, 1].set_xticklabels(top_intents.index, rotation=45, ha='right')
-        axes[1, 1].set_title('En Çok Görülen Amaçlar (Top 5)')
-        axes[1, 1].set_ylabel('Mesaj Sayısı')
+        start = time.perf_counter()
+        if workers <= 1:
+            written = [render_chart(name, aggregates, path, dpi, fmt)
+                       for name, path in zip(charts, paths)]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(render_chart, name, aggregates, path, dpi, fmt)
+                           for name, path in zip(charts, paths)]
+                written = [future.result() for future in futures]
         
-        plt.tight_layout()
-        plt.savefig('comprehensive_report.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        print(f"{len(written)} grafik {output_dir} dizinine kaydedildi "
+              f"({time.perf_counter() - start:.2f} sn)")
+        return written
     
     def generate_statistics(self):
         """İstatistiksel özet oluştur"""
+        if self.report_engine is not None:
+            return self.report_engine.generate_statistics()
+        
         stats = {
             'Toplam Mesaj': len(self.df),
             'Yanıtlanmamış Soru': len(self.df[self.df['yanıtlanmış_mı'] == 'Hayır']),
@@ -144,19 +274,22 @@ class ChatAnalysisVisualizer:
 
 # Kullanım örneği
 if __name__ == "__main__":
-    # CSV dosyasından görselleştirme
-    # visualizer = ChatAnalysisVisualizer('dugum_buketi_analiz.csv')
-    
-    # SQLite'dan görselleştirme
-    # visualizer = ChatAnalysisVisualizer('dugum_buketi_analiz.db')
-    
-    # visualizer.plot_sentiment_distribution()
-    # visualizer.plot_category_distribution()
-    # visualizer.plot_unanswered_questions()
-    # visualizer.plot_intent_analysis()
-    # visualizer.create_comprehensive_report()
-    
-    # stats = visualizer.generate_statistics()
-    # print("İstatistiksel Özet:", stats)
+    parser = argparse.ArgumentParser(description="Analiz sonuçlarından ekransız grafik raporu")
+    parser.add_argument('source', nargs='?', help="CSV, Parquet veya SQLite (.db) analiz dosyası")
+    parser.add_argument('--output-dir', default='raporlar', help="Grafiklerin yazılacağı dizin")
+    parser.add_argument('--dpi', type=int, default=150)
+    parser.add_argument('--format', default='png', help="png, svg, pdf...")
+    parser.add_argument('--workers', type=int, default=None, help="Süreç sayısı (varsayılan: grafik/CPU sayısı)")
+    parser.add_argument('--charts', nargs='+', choices=list(CHARTS), default=None)
+    args = parser.parse_args()
     
-    print("Görselleştirme modülü hazır!")
\ No newline at end of file
+    if args.source is None:
+        # Etkileşimli kullanım:
+        # visualizer = ChatAnalysisVisualizer('dugum_buketi_analiz.db')
+        # visualizer.plot_sentiment_distribution()
+        # visualizer.create_comprehensive_report()
+        print("Görselleştirme modülü hazır!")
+    else:
+        visualizer = ChatAnalysisVisualizer(args.source)
+        visualizer.render_report(args.output_dir, args.dpi, args.format, args.workers, args.charts)
+        print("İstatistiksel Özet:", visualizer.generate_statistics())